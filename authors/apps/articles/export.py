@@ -0,0 +1,112 @@
+"""
+Module contains the export of articles as newline-delimited JSON, one
+article per line. Articles are read through a server-side cursor in chunks,
+each chunk loading its related rows with one query per relation, so memory
+use doesn't grow with the number of articles exported.
+"""
+from collections import defaultdict
+from itertools import islice
+
+from django.db.models import F
+from django.utils.dateparse import parse_datetime
+
+from authors.apps.core.renderers import get_encoder
+from .models import Article, Comment, Ratings
+
+# Relations that can be exported along with the articles
+RELATIONS = ('tags', 'ratings', 'comments')
+DEFAULT_CHUNK_SIZE = 1000
+
+ARTICLE_FIELDS = (
+    'id', 'slug', 'title', 'description', 'body', 'image_url',
+    'created_at', 'updated_at', 'likes_count', 'dislikes_count',
+    'favorites_count', 'comments_count', 'rating_sum', 'rating_count',
+)
+
+
+def parse_timestamp(value, name):
+    """
+    Returns the datetime written in `value`, raising ValueError naming the
+    `name` option when it isn't one
+    """
+    timestamp = parse_datetime(value) if value else None
+    if value and timestamp is None:
+        raise ValueError(
+            '{} must be an ISO 8601 date and time, such as '
+            '2018-09-20T14:12:00Z'.format(name))
+    return timestamp
+
+
+def articles_to_export(updated_since=None, updated_before=None):
+    """
+    Returns the articles updated from `updated_since` up to `updated_before`,
+    oldest update first so an incremental sync can resume from the last
+    `updated_at` it received
+    """
+    articles = Article.objects.order_by('updated_at', 'id')
+    if updated_since is not None:
+        articles = articles.filter(updated_at__gte=updated_since)
+    if updated_before is not None:
+        articles = articles.filter(updated_at__lt=updated_before)
+    return articles
+
+
+def export_articles(articles, include=(), chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields a dict for each article of `articles` with the `include`d
+    relations, reading `chunk_size` articles at a time
+    """
+    rows = articles.values(
+        *ARTICLE_FIELDS, author_username=F('author__user__username')
+    ).iterator(chunk_size=chunk_size)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        related = load_related([row['id'] for row in chunk], include)
+        for row in chunk:
+            for relation, values in related.items():
+                row[relation] = values.get(row['id'], [])
+            yield row
+
+
+def load_related(article_ids, include):
+    """
+    Returns the `include`d relations of the articles with `article_ids`, as
+    a dict of lists by article id for each relation
+    """
+    related = {}
+    if 'tags' in include:
+        related['tags'] = group(Article.tags.through.objects.filter(
+            article_id__in=article_ids).order_by('id').values(
+            'article_id', 'tag__tag'), 'tag__tag')
+    if 'ratings' in include:
+        related['ratings'] = group(Ratings.objects.filter(
+            article_id__in=article_ids).order_by('id').values(
+            'article_id', 'stars', rater_username=F('rater__user__username')))
+    if 'comments' in include:
+        related['comments'] = group(Comment.objects.filter(
+            article_id__in=article_ids).order_by('tree_id', 'lft').values(
+            'article_id', 'id', 'parent_id', 'body', 'created_at',
+            'updated_at', author_username=F('author__user__username')))
+    return related
+
+
+def group(rows, field=None):
+    """
+    Returns `rows` in lists by their `article_id`, each row reduced to its
+    `field` if given
+    """
+    grouped = defaultdict(list)
+    for row in rows:
+        article_id = row.pop('article_id')
+        grouped[article_id].append(row[field] if field else row)
+    return grouped
+
+
+def export_lines(rows):
+    """Yields each exported row as a line of JSON bytes"""
+    encode = get_encoder()
+    for row in rows:
+        yield encode(row) + b'\n'
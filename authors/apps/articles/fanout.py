@@ -0,0 +1,162 @@
+"""
+Module contains the fan out of new article and new comment notifications
+to their audience. The audience is resolved in one query and the
+notifications and emails are inserted in bulk. Audiences too large for the
+request are fanned out by the `fan_out_notifications` management command.
+"""
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+from notifications import settings as notifications_settings
+from notifications.models import Notification
+
+from authors.apps.authentication.models import User
+from .notification_emails import SendEmail
+
+DEFAULT_SETTINGS = {
+    # Number of notifications inserted per query
+    'CHUNK_SIZE': 1000,
+    # Audiences larger than this are fanned out off the request
+    'BACKGROUND_THRESHOLD': 500,
+}
+
+
+def get_setting(name):
+    options = dict(DEFAULT_SETTINGS)
+    options.update(getattr(settings, 'NOTIFICATION_FANOUT', {}))
+    return options[name]
+
+
+class NewArticle(object):
+    """Tells the followers of an author who get notified about an article"""
+    name = 'article'
+    model = 'articles.Article'
+    verb = 'was posted'
+
+    @staticmethod
+    def audience(article):
+        return User.objects.filter(
+            profile__follows=article.author_id, get_notified=True)
+
+    @staticmethod
+    def data(article):
+        return {
+            'slug': article.slug,
+            'title': article.title,
+            'author': article.author.user.get_full_name(),
+        }
+
+    @staticmethod
+    def queue_emails(article, users, data):
+        SendEmail().queue_article_notification_emails(
+            users, data['title'], data['author'])
+
+
+class NewComment(object):
+    """
+    Tells the users who favorited an article and get notified about a
+    comment on it
+    """
+    name = 'comment'
+    model = 'articles.Comment'
+    verb = 'was commented on'
+
+    @staticmethod
+    def audience(comment):
+        return User.objects.filter(
+            profile__favorites=comment.article_id, get_notified=True)
+
+    @staticmethod
+    def data(comment):
+        return {
+            'slug': comment.article.slug,
+            'title': comment.article.title,
+            'author': comment.article.author.user.get_full_name(),
+            'commenter': comment.author.user.get_full_name(),
+            'comment': comment.body,
+        }
+
+    @staticmethod
+    def queue_emails(comment, users, data):
+        SendEmail().queue_comment_notification_emails(
+            users, data['title'], data['author'], data['commenter'])
+
+
+EVENTS = {event.name: event for event in (NewArticle, NewComment)}
+
+
+def recipients(audience):
+    """Loads only the fields the notifications and emails need"""
+    return audience.only('id', 'username', 'email').order_by('id')
+
+
+def deliver(event, instance, users, data):
+    """
+    Inserts the notification of every user in `users` in chunks and queues
+    their emails
+    """
+    actor_type = ContentType.objects.get_for_model(instance)
+    timestamp = timezone.now()
+    extra_data = data if notifications_settings.get_config()[
+        'USE_JSONFIELD'] else None
+
+    notifications = [
+        Notification(
+            recipient_id=user.pk, actor_content_type=actor_type,
+            actor_object_id=instance.pk, verb=event.verb,
+            timestamp=timestamp, data=extra_data)
+        for user in users
+    ]
+    Notification.objects.bulk_create(
+        notifications, batch_size=get_setting('CHUNK_SIZE'))
+    event.queue_emails(instance, users, data)
+
+
+def fan_out(event, instance):
+    """
+    Notifies the audience of `event` about `instance`. An audience larger
+    than the background threshold is only queued, which costs one insert.
+    """
+    threshold = get_setting('BACKGROUND_THRESHOLD')
+    users = list(recipients(event.audience(instance))[:threshold + 1])
+    if len(users) > threshold:
+        apps.get_model('articles.NotificationFanout').objects.create(
+            event=event.name, object_id=instance.pk)
+    elif users:
+        deliver(event, instance, users, event.data(instance))
+
+
+def process_fanout(job_id):
+    """
+    Notifies the audience of a queued fan out one chunk at a time. Each chunk
+    locks the job and records its progress, so an interrupted fan out
+    resumes where it stopped and workers never notify a user twice.
+    Deletes the job once done and returns the number of users notified.
+    """
+    Fanout = apps.get_model('articles.NotificationFanout')
+    chunk_size = get_setting('CHUNK_SIZE')
+    notified = 0
+    while True:
+        with transaction.atomic():
+            job = Fanout.objects.select_for_update(
+                skip_locked=True).filter(pk=job_id).first()
+            if job is None:
+                # done, or another worker is on this chunk
+                return notified
+
+            event = EVENTS[job.event]
+            model = apps.get_model(event.model)
+            instance = model._default_manager.filter(pk=job.object_id).first()
+            users = [] if instance is None else list(
+                recipients(event.audience(instance)).filter(
+                    pk__gt=job.last_recipient_id)[:chunk_size])
+            if not users:
+                job.delete()
+                return notified
+
+            deliver(event, instance, users, event.data(instance))
+            job.last_recipient_id = users[-1].pk
+            job.save(update_fields=['last_recipient_id', 'updated_at'])
+        notified += len(users)
@@ -0,0 +1,193 @@
+"""
+Module contains the bulk import of articles from newline-delimited JSON or
+CSV. Records are read as a stream and imported in batches, each batch
+costing a fixed number of queries: one for the authors, one for the slugs,
+two for the tags, one insert of the articles, one of their tags and one
+update of the tags' statistics, plus one update of the articles' creation
+times when the records have them.
+
+Bulk inserts send no signals, so the work the article signals do on a save
+is done here for the whole batch instead.
+"""
+import csv
+import json
+from collections import Counter
+from itertools import islice
+
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from authors.apps.profiles.models import Profile
+from .fanout import NewArticle, fan_out
+from .models import Article, Tag
+from .response_cache import invalidate_lists
+from .search import update_search_vectors
+from .slugs import SLUG_RETRIES, unique_slugs
+from .tag_relations import resolve_tags, tag_slug
+from .tag_stats import record_taggings
+from .timeline import push_articles
+
+FORMATS = ('ndjson', 'csv')
+DEFAULT_BATCH_SIZE = 1000
+
+REQUIRED_FIELDS = ('title', 'description', 'body', 'author')
+
+
+def read_records(stream, format):
+    """Yields each record of `stream` as a dict"""
+    if format == 'csv':
+        return read_csv(stream)
+    return read_ndjson(stream)
+
+
+def read_ndjson(stream):
+    """Yields each line of `stream` decoded, None for the invalid ones"""
+    for line in stream:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def read_csv(stream):
+    """
+    Yields the rows of a CSV file with a header. The `tags` column holds the
+    tags separated by commas.
+    """
+    for row in csv.DictReader(stream):
+        tags = (row.get('tags') or '').split(',')
+        row['tags'] = [tag.strip() for tag in tags if tag.strip()]
+        yield row
+
+
+def batches(records, size):
+    """Yields lists of `size` records at most"""
+    records = iter(records)
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+def is_valid(record):
+    """
+    Returns True when `record` has its required fields, a list of tags the
+    API would accept if any and a valid `created_at` if any
+    """
+    if not isinstance(record, dict) or not all(
+            isinstance(record.get(field), str) and record[field]
+            for field in REQUIRED_FIELDS):
+        return False
+
+    tags = record.get('tags') or []
+    max_length = Tag._meta.get_field('slug').max_length
+    if not isinstance(tags, list) or not all(
+            isinstance(tag, str) and tag_slug(tag) and
+            len(tag_slug(tag)) <= max_length for tag in tags):
+        return False
+
+    created_at = record.get('created_at')
+    return not created_at or creation_time(record) is not None
+
+
+def creation_time(record):
+    """
+    Returns the time the archived `record` was created, None when it has
+    none or an invalid one. Times without a zone are in the current one.
+    """
+    created_at = record.get('created_at')
+    try:
+        value = parse_datetime(created_at) if created_at else None
+    except (TypeError, ValueError):
+        return None
+    if value is not None and timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def import_batch(records, notify=True):
+    """
+    Imports a batch of records in one transaction, retrying it when another
+    writer took one of its slugs. Returns the articles imported.
+    """
+    for attempt in range(SLUG_RETRIES):
+        try:
+            with transaction.atomic():
+                articles = insert_batch(records, notify)
+        except IntegrityError:
+            if attempt == SLUG_RETRIES - 1:
+                raise
+        else:
+            invalidate_lists()
+            return articles
+
+
+def insert_batch(records, notify):
+    authors = {
+        profile.user.username: profile
+        for profile in Profile.objects.filter(user__username__in={
+            record['author'] for record in records if is_valid(record)
+        }).select_related('user')
+    }
+    records = [record for record in records
+               if is_valid(record) and record['author'] in authors]
+    if not records:
+        return []
+
+    slugs = unique_slugs(Article, [
+        record.get('slug') or record['title'] for record in records])
+    tags = resolve_tags(
+        name for record in records for name in record.get('tags') or [])
+
+    articles = Article.objects.bulk_create([
+        Article(title=record['title'], slug=slug,
+                description=record['description'], body=record['body'],
+                image_url=record.get('image_url') or None,
+                author=authors[record['author']])
+        for record, slug in zip(records, slugs)
+    ])
+    keep_creation_times(articles, records)
+    links = Article.tags.through.objects.bulk_create([
+        Article.tags.through(article_id=article.pk, tag_id=tag_id)
+        for article, record in zip(articles, records)
+        for tag_id in {tags[tag_slug(name)].pk
+                       for name in record.get('tags') or [] if tag_slug(name)}
+    ])
+    record_taggings(Counter(link.tag_id for link in links))
+
+    update_search_vectors(
+        Article.objects.filter(pk__in=[article.pk for article in articles]))
+    push_articles(articles)
+    if notify:
+        for article in articles:
+            fan_out(NewArticle, article)
+    return articles
+
+
+def keep_creation_times(articles, records):
+    """
+    Gives the inserted `articles` the creation times of their archived
+    `records` in one statement, rather than the import time the insert
+    stamped, so the feeds keep their order
+    """
+    created = [(article, creation_time(record))
+               for article, record in zip(articles, records)
+               if creation_time(record) is not None]
+    if not created:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'UPDATE {table} SET created_at = archived.created_at FROM '
+            'unnest(%s::integer[], %s::timestamptz[]) '
+            'AS archived (id, created_at) '
+            'WHERE {table}.id = archived.id'.format(
+                table=Article._meta.db_table),
+            [[article.pk for article, _ in created],
+             [created_at for _, created_at in created]])
+    for article, created_at in created:
+        article.created_at = created_at
+
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from authors.apps.articles.export import (DEFAULT_CHUNK_SIZE, RELATIONS,
+                                          articles_to_export, export_articles,
+                                          export_lines, parse_timestamp)
+
+
+class Command(BaseCommand):
+    help = 'Writes the articles as newline-delimited JSON, one per line'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default='-',
+            help='File written to, the standard output by default')
+        parser.add_argument(
+            '--include', nargs='*', choices=RELATIONS, default=[],
+            help='Relations exported with each article')
+        parser.add_argument(
+            '--updated-since',
+            help='Only export the articles updated at or after this time')
+        parser.add_argument(
+            '--updated-before',
+            help='Only export the articles updated before this time')
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help='Number of articles read from the database at a time')
+
+    def handle(self, *args, **options):
+        try:
+            articles = articles_to_export(
+                parse_timestamp(options['updated_since'], '--updated-since'),
+                parse_timestamp(options['updated_before'],
+                                '--updated-before'))
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        lines = export_lines(export_articles(
+            articles, options['include'], options['chunk_size']))
+        if options['output'] == '-':
+            self.write(lines, getattr(self.stdout, 'buffer', None))
+        else:
+            with open(options['output'], 'wb') as output:
+                self.write(lines, output)
+
+    def write(self, lines, output):
+        count = 0
+        for line in lines:
+            if output is None:
+                self.stdout.write(line.decode('utf-8'), ending='')
+            else:
+                output.write(line)
+            count += 1
+        self.stderr.write('{} articles exported'.format(count))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.fanout import process_fanout
+from authors.apps.articles.models import NotificationFanout
+
+
+class Command(BaseCommand):
+    help = ('Notifies the audiences of new articles and comments that were '
+            'too large to notify during the request')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll', type=int, default=0,
+            help='Keep processing fan outs every POLL seconds instead of '
+                 'exiting once there are none left')
+
+    def handle(self, *args, **options):
+        while True:
+            jobs = NotificationFanout.objects.order_by(
+                'created_at').values_list('pk', flat=True)
+            for job_id in jobs:
+                notified = process_fanout(job_id)
+                self.stdout.write(
+                    'Fan out {}: {} user(s) notified'.format(job_id, notified))
+            if not options['poll']:
+                return
+            time.sleep(options['poll'])
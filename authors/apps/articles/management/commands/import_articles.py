@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authors.apps.articles.importer import (DEFAULT_BATCH_SIZE, FORMATS,
+                                            batches, import_batch,
+                                            read_records)
+
+
+class Command(BaseCommand):
+    help = ('Imports articles from newline-delimited JSON or CSV in '
+            'batches, reporting the throughput')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input', help='File read from, - for the standard input')
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='Format of the input, by default its file extension')
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Number of articles inserted per transaction')
+        parser.add_argument(
+            '--no-notify', action='store_false', dest='notify',
+            help="Don't notify the authors' followers of the articles")
+
+    def handle(self, *args, **options):
+        format = options['format']
+        if format is None:
+            format = os.path.splitext(options['input'])[1].lstrip('.')
+            if format not in FORMATS:
+                raise CommandError('Give the --format of the input')
+
+        if options['input'] == '-':
+            self.load(sys.stdin, format, options)
+        else:
+            with open(options['input'], newline='', encoding='utf-8') as input:
+                self.load(input, format, options)
+
+    def load(self, input, format, options):
+        start = time.monotonic()
+        read = imported = 0
+        for batch in batches(read_records(input, format),
+                             options['batch_size']):
+            read += len(batch)
+            imported += len(import_batch(batch, options['notify']))
+            self.report(read, imported, start)
+
+        self.stdout.write(self.style.SUCCESS(
+            '{} article(s) imported, {} skipped'.format(
+                imported, read - imported)))
+
+    def report(self, read, imported, start):
+        elapsed = time.monotonic() - start
+        self.stdout.write('{:>10} read {:>10} imported {:>10.1f} articles/s'
+                          .format(read, imported, imported / elapsed))
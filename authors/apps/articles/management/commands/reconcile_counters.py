@@ -0,0 +1,106 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from authors.apps.articles.models import (Article, Bookmarks, Comment,
+                                          Reaction, Tag, rating_aggregate)
+from authors.apps.articles.reactions import ARTICLE, COMMENT, DISLIKE, LIKE
+from authors.apps.core.counters import (VERSION_FIELD, count_subquery,
+                                        is_versioned)
+from authors.apps.profiles.models import Profile
+
+
+def reaction_counters(target_type):
+    """Returns the expressions recomputing the reaction counters"""
+    reactions = Reaction.objects.filter(target_type=target_type)
+    return {
+        'likes_count': count_subquery(
+            reactions.filter(value=LIKE), 'target_id'),
+        'dislikes_count': count_subquery(
+            reactions.filter(value=DISLIKE), 'target_id'),
+    }
+
+
+def article_counters():
+    """Returns the expressions recomputing each article counter"""
+    counters = reaction_counters(ARTICLE)
+    counters.update({
+        'favorites_count': count_subquery(
+            Profile.favorites.through.objects.all(), 'article'),
+        'comments_count': count_subquery(Comment.objects.all(), 'article'),
+        'bookmarks_count': count_subquery(Bookmarks.objects.all(), 'article'),
+    })
+    counters.update(rating_aggregate())
+    return counters
+
+
+def comment_counters():
+    """Returns the expressions recomputing each comment counter"""
+    counters = reaction_counters(COMMENT)
+    counters['replies_count'] = count_subquery(Comment.objects.all(), 'parent')
+    return counters
+
+
+def tag_counters():
+    """Returns the expressions recomputing each tag counter"""
+    return {
+        'articles_count': count_subquery(
+            Article.tags.through.objects.all(), 'tag'),
+    }
+
+
+def profile_counters():
+    """Returns the expressions recomputing each profile counter"""
+    return {
+        'followers_count': count_subquery(
+            Profile.follows.through.objects.all(), 'to_profile'),
+    }
+
+
+class Command(BaseCommand):
+    help = ('Rebuilds the engagement counters of articles, comments, tags '
+            'and profiles from the rows they count')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report the rows whose counters are out of step')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of rows rebuilt per UPDATE')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model, counters in ((Article, article_counters),
+                                (Comment, comment_counters),
+                                (Tag, tag_counters),
+                                (Profile, profile_counters)):
+            drifted = self.find_drifted(model, counters())
+            self.stdout.write('{}: {} row(s) out of step'.format(
+                model.__name__, len(drifted)))
+            if options['dry_run']:
+                continue
+
+            changes = counters()
+            if is_versioned(model):
+                changes[VERSION_FIELD] = F(VERSION_FIELD) + 1
+            for start in range(0, len(drifted), batch_size):
+                model._default_manager.filter(
+                    pk__in=drifted[start:start + batch_size]
+                ).update(**changes)
+
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS('Counters rebuilt'))
+
+    def find_drifted(self, model, counters):
+        """
+        Returns the primary keys of the `model` rows where any counter
+        differs from the value recomputed from the source tables
+        """
+        drift = Q()
+        for field in counters:
+            drift |= ~Q(**{field: F('expected_' + field)})
+
+        return list(model._default_manager.annotate(**{
+            'expected_' + field: expression
+            for field, expression in counters.items()
+        }).filter(drift).values_list('pk', flat=True))
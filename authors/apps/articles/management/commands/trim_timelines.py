@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.models import TimelineEntry
+from authors.apps.articles.timeline import trim
+
+
+class Command(BaseCommand):
+    help = ('Deletes the timeline entries beyond TIMELINE["MAX_LENGTH"] '
+            'from every feed')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of timelines trimmed per DELETE')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        owners = list(TimelineEntry.objects.order_by(
+            'owner').values_list('owner', flat=True).distinct())
+
+        deleted = 0
+        for start in range(0, len(owners), batch_size):
+            deleted += trim(owners[start:start + batch_size])
+        self.stdout.write('{} timeline entries deleted'.format(deleted))
@@ -0,0 +1,100 @@
+# Generated by Django 2.0.6 on 2026-10-17 17:46
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def aggregate(queryset, field, total=None):
+    values = queryset.filter(**{field: OuterRef('pk')}).order_by().values(
+        field).annotate(total=total or Count('*')).values('total')
+    return Coalesce(Subquery(values, output_field=models.IntegerField()), 0)
+
+
+def fill_counters(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    Bookmarks = apps.get_model('articles', 'Bookmarks')
+    Comment = apps.get_model('articles', 'Comment')
+    Ratings = apps.get_model('articles', 'Ratings')
+    Profile = apps.get_model('profiles', 'Profile')
+
+    Article.objects.update(
+        likes_count=aggregate(Article.likes.through.objects.all(), 'article'),
+        dislikes_count=aggregate(
+            Article.dislikes.through.objects.all(), 'article'),
+        favorites_count=aggregate(
+            Profile.favorites.through.objects.all(), 'article'),
+        comments_count=aggregate(Comment.objects.all(), 'article'),
+        bookmarks_count=aggregate(Bookmarks.objects.all(), 'article'),
+        rating_sum=aggregate(Ratings.objects.all(), 'article', Sum('stars')),
+        rating_count=aggregate(Ratings.objects.all(), 'article'),
+    )
+    Comment.objects.update(
+        likes_count=aggregate(
+            Comment.comment_likes.through.objects.all(), 'comment'),
+        dislikes_count=aggregate(
+            Comment.comment_dislikes.through.objects.all(), 'comment'),
+        replies_count=aggregate(Comment.objects.all(), 'parent'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_auto_20180920_1412'),
+        ('articles', '0002_auto_20180913_1010'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='bookmarks_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='comments_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='dislikes_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='favorites_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='likes_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='dislikes_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='likes_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='replies_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 2.0.6 on 2026-10-17 17:49
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_histogram(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    Ratings = apps.get_model('articles', 'Ratings')
+
+    histogram = {}
+    for stars in range(1, 6):
+        counts = Ratings.objects.filter(
+            article=OuterRef('pk'), stars=stars
+        ).order_by().values('article').annotate(
+            total=Count('*')).values('total')
+        histogram['rating_{}_count'.format(stars)] = Coalesce(
+            Subquery(counts, output_field=models.IntegerField()), 0)
+    Article.objects.update(**histogram)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0003_engagement_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='rating_1_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_2_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_3_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_4_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_5_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_histogram, migrations.RunPython.noop),
+    ]
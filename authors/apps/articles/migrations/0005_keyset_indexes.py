@@ -0,0 +1,29 @@
+# Generated by Django 2.0.6 on 2026-10-17 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0004_rating_histogram'),
+        ('notifications', '0006_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-created_at', '-id'], name='articles_ar_created_a3d32e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['article', '-created_at', '-id'], name='articles_co_article_54b8cf_idx'),
+        ),
+        # The notifications app is third party, so its index for the keyset
+        # pagination of a user's notifications is created here
+        migrations.RunSQL(
+            'CREATE INDEX notifications_recipient_keyset_idx ON '
+            'notifications_notification (recipient_id, timestamp DESC, id DESC)',
+            'DROP INDEX notifications_recipient_keyset_idx',
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 2.0.6 on 2026-10-17 18:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_followers_count'),
+        ('articles', '0006_notification_fanout'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['author', '-created_at', '-id'], name='articles_ar_author__1b5c2a_idx'),
+        ),
+        migrations.AddField(
+            model_name='timelineentry',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='articles.Article'),
+        ),
+        migrations.AddField(
+            model_name='timelineentry',
+            name='owner',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline', to='profiles.Profile'),
+        ),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['owner', '-created_at', '-article'], name='articles_ti_owner_i_fcb7f8_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='timelineentry',
+            unique_together={('owner', 'article')},
+        ),
+        # Fill the timelines from the existing follows, keeping the latest
+        # 500 articles of each feed
+        migrations.RunSQL(
+            'INSERT INTO articles_timelineentry '
+            '(owner_id, article_id, created_at) '
+            'SELECT follows.from_profile_id, article.id, article.created_at '
+            'FROM profiles_profile_follows AS follows '
+            'JOIN articles_article AS article '
+            'ON article.author_id = follows.to_profile_id',
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            'DELETE FROM articles_timelineentry WHERE id IN ('
+            'SELECT id FROM ('
+            'SELECT id, row_number() OVER ('
+            'PARTITION BY owner_id ORDER BY created_at DESC, article_id DESC'
+            ') AS position FROM articles_timelineentry'
+            ') AS ranked WHERE position > 500)',
+            migrations.RunSQL.noop,
+        ),
+    ]
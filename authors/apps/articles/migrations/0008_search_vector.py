@@ -0,0 +1,63 @@
+# Generated by Django 2.0.6 on 2026-10-17 18:13
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_search_vectors(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    config = getattr(settings, 'ARTICLE_SEARCH_SETTINGS', {}).get('config')
+    tags = Article.tags.through.objects.filter(
+        article=OuterRef('pk')
+    ).order_by().values('article').annotate(
+        text=StringAgg('tag__tag', ' ')).values('text')
+    tags = Subquery(tags, output_field=models.TextField())
+    Article.objects.update(search_vector=(
+        SearchVector('title', weight='A', config=config) +
+        SearchVector(tags, weight='B', config=config) +
+        SearchVector('description', weight='B', config=config) +
+        SearchVector('body', weight='C', config=config)
+    ))
+
+
+# Trigram indexes serving the fuzzy title, author and tag filters
+TRIGRAM_INDEXES = (
+    ('articles_article_title_trgm', 'articles_article', 'title'),
+    ('authentication_user_username_trgm', 'authentication_user', 'username'),
+    ('articles_tag_tag_trgm', 'articles_tag', 'tag'),
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_timeline'),
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='article',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='articles_ar_search__95c6c6_gin'),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ] + [
+        migrations.RunSQL(
+            'CREATE INDEX {} ON {} USING gin ({} gin_trgm_ops)'.format(
+                name, table, column),
+            'DROP INDEX {}'.format(name),
+        )
+        for name, table, column in TRIGRAM_INDEXES
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 2.0.6 on 2026-10-17 19:01
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_articles_count(apps, schema_editor):
+    Tag = apps.get_model('articles', 'Tag')
+    Article = apps.get_model('articles', 'Article')
+
+    counts = Article.tags.through.objects.filter(
+        tag=OuterRef('pk')
+    ).order_by().values('tag').annotate(total=Count('*')).values('total')
+    Tag.objects.update(articles_count=Coalesce(
+        Subquery(counts, output_field=models.IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0009_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='articles_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='trending_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-articles_count', 'slug'], name='articles_ta_article_0dc9ba_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-trending_score', 'slug'], name='articles_ta_trendin_b51309_idx'),
+        ),
+        migrations.RunPython(fill_articles_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 2.0.6 on 2026-10-17 19:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# The through tables of the former relations, with the column of the object
+# reacted to, its target type and the reaction's value
+RELATIONS = [
+    ('articles_article_likes', 'article_id', 1, 1),
+    ('articles_article_dislikes', 'article_id', 1, -1),
+    ('articles_comment_comment_likes', 'comment_id', 2, 1),
+    ('articles_comment_comment_dislikes', 'comment_id', 2, -1),
+]
+
+# A user who both liked and disliked an object keeps their like
+COPY_REACTIONS = [
+    'INSERT INTO articles_reaction '
+    '(target_type, target_id, user_id, value, created_at) '
+    'SELECT {}, {}, user_id, {}, now() FROM {} '
+    'ON CONFLICT (target_type, target_id, user_id) DO NOTHING'.format(
+        target_type, column, value, table)
+    for table, column, target_type, value in RELATIONS
+]
+
+COPY_RELATIONS = [
+    'INSERT INTO {} ({}, user_id) SELECT target_id, user_id '
+    'FROM articles_reaction WHERE target_type = {} AND value = {}'.format(
+        table, column, target_type, value)
+    for table, column, target_type, value in RELATIONS
+]
+
+# The tables of the objects reacted to, their target type and the columns
+# changed along with their counters
+TARGETS = [
+    ('articles_article', 1, ', version = version + 1'),
+    ('articles_comment', 2, ''),
+]
+
+# Counts the copied reactions again, since the users dropped above were
+# still counted twice by the objects they both liked and disliked
+RECOUNT_REACTIONS = [
+    'UPDATE {table} SET likes_count = counts.likes, '
+    'dislikes_count = counts.dislikes{version} FROM ('
+    'SELECT {table}.id, '
+    'count(reaction.id) FILTER (WHERE reaction.value = 1) AS likes, '
+    'count(reaction.id) FILTER (WHERE reaction.value = -1) AS dislikes '
+    'FROM {table} LEFT JOIN articles_reaction reaction '
+    'ON reaction.target_type = {target_type} '
+    'AND reaction.target_id = {table}.id '
+    'GROUP BY {table}.id) AS counts '
+    'WHERE {table}.id = counts.id '
+    'AND ({table}.likes_count, {table}.dislikes_count) '
+    'IS DISTINCT FROM (counts.likes, counts.dislikes)'.format(
+        table=table, target_type=target_type, version=version)
+    for table, target_type, version in TARGETS
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('articles', '0010_tag_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reaction',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_type', models.PositiveSmallIntegerField(choices=[(1, 'article'), (2, 'comment')])),
+                ('target_id', models.IntegerField()),
+                ('value', models.SmallIntegerField(choices=[(1, 'like'), (-1, 'dislike')])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reactions', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='reaction',
+            unique_together={('target_type', 'target_id', 'user')},
+        ),
+        migrations.RunSQL(COPY_REACTIONS, COPY_RELATIONS),
+        migrations.RunSQL(RECOUNT_REACTIONS, migrations.RunSQL.noop),
+        migrations.RemoveField(
+            model_name='article',
+            name='dislikes',
+        ),
+        migrations.RemoveField(
+            model_name='article',
+            name='likes',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='comment_dislikes',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='comment_likes',
+        ),
+        migrations.AddIndex(
+            model_name='reaction',
+            index=models.Index(fields=['target_type', 'target_id', 'value', 'user'], name='articles_re_target__0e36ee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reaction',
+            index=models.Index(fields=['user', 'target_type', 'value', 'target_id'], name='articles_re_user_id_80fa75_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 2.0.6 on 2026-10-17 19:35
+
+from django.db import migrations, models
+
+# Seeds the counters past the slugs already taken: every slug is the first
+# of its own base, and a slug numbered up to 9 digits counts for the base
+# before its number
+SEED_COUNTERS = (
+    'INSERT INTO articles_slugcounter (scope, base, next_number) '
+    "SELECT 'articles.article', base, max(number) + 1 FROM ("
+    'SELECT slug AS base, 0 AS number FROM articles_article '
+    'UNION ALL '
+    "SELECT substring(slug from '^(.+)-[1-9][0-9]{0,8}$'), "
+    "substring(slug from '-([1-9][0-9]{0,8})$')::integer "
+    'FROM articles_article '
+    "WHERE slug ~ '^.+-[1-9][0-9]{0,8}$'"
+    ') AS taken GROUP BY base'
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0011_reactions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlugCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=100)),
+                ('base', models.CharField(max_length=255)),
+                ('next_number', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='slugcounter',
+            unique_together={('scope', 'base')},
+        ),
+        migrations.RunSQL(SEED_COUNTERS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.0.6 on 2026-10-17 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0012_slug_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['updated_at', 'id'], name='articles_ar_updated_496f95_idx'),
+        ),
+    ]
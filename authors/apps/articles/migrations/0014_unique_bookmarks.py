@@ -0,0 +1,38 @@
+# Generated by Django 2.0.6 on 2026-10-17 19:47
+
+from django.db import migrations
+
+# Keeps the first bookmark of each article by a user and recounts the
+# bookmarks of the articles that had more. The statement's snapshot still
+# holds the deleted rows, which the recount takes off.
+DELETE_DUPLICATES = (
+    'WITH deleted AS ('
+    'DELETE FROM articles_bookmarks WHERE id IN ('
+    'SELECT id FROM ('
+    'SELECT id, row_number() OVER ('
+    'PARTITION BY user_id, article_id ORDER BY id) AS position '
+    'FROM articles_bookmarks) AS ranked WHERE position > 1) '
+    'RETURNING article_id) '
+    'UPDATE articles_article SET bookmarks_count = ('
+    'SELECT count(*) FROM articles_bookmarks '
+    'WHERE article_id = articles_article.id) - removed.count, '
+    'version = version + 1 '
+    'FROM (SELECT article_id, count(*) AS count FROM deleted '
+    'GROUP BY article_id) AS removed '
+    'WHERE articles_article.id = removed.article_id'
+)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0006_follow_keyset_indexes'),
+        ('articles', '0013_export_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(DELETE_DUPLICATES, migrations.RunSQL.noop),
+        migrations.AlterUniqueTogether(
+            name='bookmarks',
+            unique_together={('user', 'article')},
+        ),
+    ]
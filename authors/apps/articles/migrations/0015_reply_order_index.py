@@ -0,0 +1,17 @@
+# Generated by Django 2.0.6 on 2026-10-17 20:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0014_unique_bookmarks'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['parent', 'id'], name='articles_co_parent__ac13cb_idx'),
+        ),
+    ]
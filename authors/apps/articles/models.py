@@ -1,16 +1,93 @@
 """
 Module contains Models for article related tables
 """
+from collections import Counter
 from datetime import datetime
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.db.models.signals import post_save, pre_save
-from django.utils.text import slugify
+from django.db.models import Exists, F, OuterRef, Prefetch, Sum
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
 from mptt.models import MPTTModel, TreeForeignKey
-from notifications.signals import notify
 from authors.apps.authentication.models import User
 from authors.apps.profiles.models import Profile
+from authors.apps.profiles.signals import (followed as profile_followed,
+                                           unfollowed as profile_unfollowed)
+from authors.apps.core.counters import (adjust_counters, aggregate_subquery,
+                                        bump_version, count_subquery)
 from authors.apps.core.models import TimestampModel
-from authors.apps.articles.notification_emails import SendEmail
+from authors.apps.core.signals import counters_adjusted
+from authors.apps.articles.fanout import NewArticle, NewComment, fan_out
+from authors.apps.articles.reactions import (ARTICLE, COMMENT, DISLIKE, LIKE,
+                                             TARGET_TYPES, VALUES,
+                                             delete_reactions, reactor_ids)
+from authors.apps.articles.response_cache import invalidate_list_responses
+from authors.apps.articles.search import update_search_vectors
+from authors.apps.articles.slugs import save_with_unique_slug, unique_slug
+from authors.apps.articles.tag_stats import record_taggings
+from authors.apps.articles.timeline import (add_author, push_article,
+                                            remove_author)
+
+
+class ArticleQuerySet(models.QuerySet):
+    """
+    Query plans for serializing many articles at once
+    """
+
+    def with_counts(self, user=None):
+        """
+        Annotates the `user`'s favorite and bookmark flags that the article
+        serializers read, and prefetches the tags of every article. The
+        engagement counts and rating aggregate are columns of the article.
+
+        Evaluating the result costs two queries whatever the number of
+        articles: one for the articles and one for their tags.
+        """
+        favorites = Profile.favorites.through.objects.all()
+        queryset = self.select_related('author__user')
+
+        if user is not None and user.is_authenticated:
+            queryset = queryset.annotate(
+                viewer_favorited=Exists(favorites.filter(
+                    article=OuterRef('pk'), profile__user=user)),
+                viewer_bookmarked=Exists(Bookmarks.objects.filter(
+                    article=OuterRef('pk'), user__user=user)),
+            )
+        else:
+            queryset = queryset.annotate(
+                viewer_favorited=models.Value(
+                    False, output_field=models.BooleanField()),
+                viewer_bookmarked=models.Value(
+                    False, output_field=models.BooleanField()),
+            )
+
+        return queryset.prefetch_related('tags')
+
+    def with_engagement(self, user=None):
+        """
+        Extends `with_counts` with the likes, dislikes and comments that
+        `ArticleSerializer` embeds. The ids of the users who liked and
+        disliked each article are annotated from the reactions.
+
+        Evaluating the result costs three queries whatever the number of
+        articles: the two of `with_counts` and one for the comments.
+        """
+        comments = Comment.objects.select_related('author__user').order_by(
+            'tree_id', 'lft')
+
+        return self.with_counts(user).annotate(
+            like_ids=reactor_ids(ARTICLE, LIKE),
+            dislike_ids=reactor_ids(ARTICLE, DISLIKE),
+        ).prefetch_related(Prefetch('comments', queryset=comments))
+
+
+RATING_STARS = range(1, 6)
+
+
+def rating_histogram_field(stars):
+    """Returns the article column counting ratings with `stars`"""
+    return 'rating_{}_count'.format(stars)
 
 
 class Article(TimestampModel):
@@ -23,24 +100,80 @@ class Article(TimestampModel):
     description = models.TextField()
     image_url = models.URLField(blank=True, null=True)
     author = models.ForeignKey(Profile, on_delete=models.CASCADE)
-    likes = models.ManyToManyField(User, related_name='likes', blank=True)
-    dislikes = models.ManyToManyField(
-        User, related_name='dislikes', blank=True)
     tags = models.ManyToManyField(
         'articles.Tag', related_name='articles'
     )
+    # Denormalized engagement counters. They are updated with F() expressions
+    # together with the rows they count and can be rebuilt with the
+    # `reconcile_counters` management command.
+    likes_count = models.IntegerField(default=0)
+    dislikes_count = models.IntegerField(default=0)
+    favorites_count = models.IntegerField(default=0)
+    comments_count = models.IntegerField(default=0)
+    bookmarks_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+    # Number of ratings given with each number of stars
+    rating_1_count = models.IntegerField(default=0)
+    rating_2_count = models.IntegerField(default=0)
+    rating_3_count = models.IntegerField(default=0)
+    rating_4_count = models.IntegerField(default=0)
+    rating_5_count = models.IntegerField(default=0)
+    # Weighted words of the title, tags, description and body, updated by
+    # `update_article_search_vector`
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Incremented by every change to the article's representation that
+    # `updated_at` misses, such as its counters, tags and comments
+    version = models.IntegerField(default=0)
+
+    objects = ArticleQuerySet.as_manager()
+    # Slugs of the routes under `articles/` that would shadow the article
+    # with that slug, which are never allocated
+    reserved_slugs = ('feed', 'export')
+
+    class Meta(TimestampModel.Meta):
+        indexes = [
+            # Serves the newest-first keyset pagination of the article lists
+            models.Index(fields=['-created_at', '-id']),
+            # Serves the feeds reading the articles of popular authors
+            models.Index(fields=['author', '-created_at', '-id']),
+            GinIndex(fields=['search_vector']),
+            # Serves the exports, read oldest update first by ranges of
+            # updated_at
+            models.Index(fields=['updated_at', 'id']),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        if self.pk is not None or self.slug:
+            return super().save(*args, **kwargs)
+        # `pre_save_article_receiver` allocates the slug of each attempt
+        return save_with_unique_slug(
+            self, lambda: super(Article, self).save(*args, **kwargs))
+
+    @property
+    def average_rating(self):
+        """Returns the average stars of the article, None when unrated"""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @property
+    def rating_distribution(self):
+        """Returns the number of ratings given with each number of stars"""
+        return {
+            stars: getattr(self, rating_histogram_field(stars))
+            for stars in RATING_STARS
+        }
+
 
 class Comment(MPTTModel,TimestampModel):
     """
     Defines the comments table for an article
     """
     body = models.TextField()
-    comment_likes = models.ManyToManyField(User, related_name='comment_likes', blank=True)
-    comment_dislikes = models.ManyToManyField(User, related_name='comment_dislikes', blank=True)
     parent = TreeForeignKey('self',related_name='reply_set',null=True ,on_delete=models.CASCADE)
     article = models.ForeignKey(
         'articles.Article', related_name='comments', on_delete=models.CASCADE
@@ -49,6 +182,42 @@ class Comment(MPTTModel,TimestampModel):
     author = models.ForeignKey(
         'profiles.Profile', related_name='comments', on_delete=models.CASCADE
     )
+    likes_count = models.IntegerField(default=0)
+    dislikes_count = models.IntegerField(default=0)
+    replies_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Serves the newest-first keyset pagination of an article's
+            # comments
+            models.Index(fields=['article', '-created_at', '-id']),
+            # Serves the first replies of a comment in thread order
+            models.Index(fields=['parent', 'id']),
+        ]
+
+
+class Reaction(models.Model):
+    """
+    Defines the likes and dislikes of articles and comments, one row per
+    user and object reacted to. See `authors.apps.articles.reactions`.
+    """
+    target_type = models.PositiveSmallIntegerField(choices=TARGET_TYPES)
+    target_id = models.IntegerField()
+    user = models.ForeignKey(User, related_name='reactions', db_index=False,
+                             on_delete=models.CASCADE)
+    value = models.SmallIntegerField(choices=VALUES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('target_type', 'target_id', 'user')
+        indexes = [
+            # Cover the counts and reactor ids of a target and the
+            # reactions of a user, so both are read from the index alone
+            models.Index(fields=['target_type', 'target_id', 'value',
+                                 'user']),
+            models.Index(fields=['user', 'target_type', 'value',
+                                 'target_id']),
+        ]
 
 
 class CommentEditHistory(models.Model):
@@ -72,12 +241,31 @@ class Ratings(models.Model):
     counter = models.IntegerField(default=0)
     stars = models.IntegerField(null=False)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored stars so that changing them can be applied to
+        # the article's rating aggregate as a difference
+        instance.saved_stars = instance.__dict__.get('stars')
+        return instance
+
 
 class Tag(TimestampModel):
     """This class defines the tag model"""
 
     tag = models.CharField(max_length=255)
     slug = models.SlugField(db_index=True, unique=True)
+    # Number of articles with the tag and its decaying number of additions
+    # to articles, both updated by `record_taggings`
+    articles_count = models.IntegerField(default=0)
+    trending_score = models.FloatField(default=0)
+
+    class Meta(TimestampModel.Meta):
+        indexes = [
+            # Serve the top tags by count and by trending score
+            models.Index(fields=['-articles_count', 'slug']),
+            models.Index(fields=['-trending_score', 'slug']),
+        ]
 
     def __str__(self):
         return '{}'.format(self.tag)
@@ -91,6 +279,52 @@ class Bookmarks(models.Model):
     article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='bookmarked')
     date = models.DateTimeField(default=datetime.now, blank=True)        
 
+    class Meta:
+        # Lets concurrent bookmarks of an article by a user count it once
+        unique_together = ('user', 'article')
+
+
+class NotificationFanout(TimestampModel):
+    """
+    Defines the queue of notification fan outs whose audience is too large
+    to notify during the request
+    """
+    event = models.CharField(max_length=20)
+    object_id = models.IntegerField()
+    # the audience is notified in order of id, up to this one so far
+    last_recipient_id = models.IntegerField(default=0)
+
+
+class SlugCounter(models.Model):
+    """
+    Defines the number of slugs handed out to each base slug of a model.
+    See `authors.apps.articles.slugs`.
+    """
+    # the label of the model the slugs are unique in
+    scope = models.CharField(max_length=100)
+    base = models.CharField(max_length=255)
+    next_number = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('scope', 'base')
+
+
+class TimelineEntry(models.Model):
+    """
+    Defines the materialized feed of each profile: the articles of the
+    authors they follow, newest first
+    """
+    owner = models.ForeignKey(
+        Profile, related_name='timeline', on_delete=models.CASCADE)
+    article = models.ForeignKey(
+        Article, related_name='+', on_delete=models.CASCADE)
+    # the article's creation time, so a feed is read from this table alone
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('owner', 'article')
+        indexes = [models.Index(fields=['owner', '-created_at', '-article'])]
+
 
 def pre_save_article_receiver(sender, instance, *args, **kwargs):
     """
@@ -99,15 +333,7 @@ def pre_save_article_receiver(sender, instance, *args, **kwargs):
     """
     if instance.slug:
         return instance
-    slug = slugify(instance.title)
-    num = 1
-    unique_slug = slug
-    # loops until a unique slug is generated
-    while Article.objects.filter(slug=unique_slug).exists():
-        unique_slug = "%s-%s" % (slug, num)
-        num += 1
-
-    instance.slug = unique_slug
+    instance.slug = unique_slug(Article, instance.title)
 
 
 # Called just before a save is made in the db
@@ -118,40 +344,257 @@ def notify_followers_new_article(sender, instance, created, **kwargs):
     """
     Notify followers of new article posted.
     """
-    user = User.objects.get(pk=instance.author.id)
-    title = instance.title
-    author = instance.author.user.get_full_name()
-    recipients = []
-    for follower in user.profile.follower.all():
-        if follower.user.get_notified:
-            recipients.append(follower.user)
-        SendEmail().send_article_notification_email(
-            follower.user.email, title, author)
-    notify.send(instance, recipient=recipients, verb='was posted', slug=instance.slug,
-                title=instance.title, author=instance.author.user.get_full_name())
+    if created:
+        fan_out(NewArticle, instance)
+
 
 post_save.connect(notify_followers_new_article, sender=Article)
 
 
+def update_article_search_vector(sender, instance, **kwargs):
+    """
+    Recomputes the search vector of an article when it is saved
+    """
+    update_search_vectors(Article.objects.filter(pk=instance.pk))
+
+
+post_save.connect(update_article_search_vector, sender=Article)
+
+
+def update_tagged_search_vector(sender, instance, action, reverse, pk_set,
+                                **kwargs):
+    """
+    Recomputes the search vector and the version of the articles whose tags
+    changed
+    """
+    if reverse and action == 'pre_clear':
+        # the articles losing a cleared tag are unknown once it is cleared
+        instance.cleared_article_ids = list(
+            instance.articles.values_list('pk', flat=True))
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        article_ids = [instance.pk]
+    elif action == 'post_clear':
+        article_ids = instance.cleared_article_ids
+    else:
+        article_ids = pk_set
+    articles = Article.objects.filter(pk__in=article_ids)
+    update_search_vectors(articles)
+    articles.update(version=F('version') + 1)
+
+
+m2m_changed.connect(update_tagged_search_vector, sender=Article.tags.through)
+
+
+def count_tagged_articles(sender, instance, action, reverse, pk_set,
+                          **kwargs):
+    """
+    Updates the article counts and trending scores of the tags added to or
+    removed from articles
+    """
+    links = Article.tags.through.objects.filter(
+        **{'tag' if reverse else 'article': instance})
+    if action == 'pre_remove':
+        # the objects removed may include some that weren't linked
+        instance.unlinked_tag_ids = list(links.filter(**{
+            'article__in' if reverse else 'tag__in': pk_set
+        }).values_list('tag_id', flat=True))
+    elif action == 'pre_clear':
+        instance.unlinked_tag_ids = list(
+            links.values_list('tag_id', flat=True))
+    elif action == 'post_add' and reverse:
+        record_taggings({instance.pk: len(pk_set)})
+    elif action == 'post_add':
+        record_taggings({tag_id: 1 for tag_id in pk_set})
+    elif action in ('post_remove', 'post_clear'):
+        record_taggings({tag_id: -count for tag_id, count in
+                         Counter(instance.unlinked_tag_ids).items()})
+
+
+m2m_changed.connect(count_tagged_articles, sender=Article.tags.through)
+
+
+def uncount_deleted_article_tags(sender, instance, **kwargs):
+    """
+    Uncounts a deleted article from its tags, whose links are deleted
+    without m2m_changed signals
+    """
+    record_taggings({
+        tag_id: -1 for tag_id in Article.tags.through.objects.filter(
+            article=instance).values_list('tag_id', flat=True)})
+
+
+pre_delete.connect(uncount_deleted_article_tags, sender=Article)
+
+
+def delete_article_reactions(sender, instance, **kwargs):
+    """
+    Deletes the reactions to a deleted article, which reference it without
+    a foreign key
+    """
+    delete_reactions(ARTICLE, [instance.pk])
+
+
+post_delete.connect(delete_article_reactions, sender=Article)
+
+
+def push_new_article(sender, instance, created, **kwargs):
+    """
+    Pushes a new article to the timelines of its author's followers
+    """
+    if created:
+        push_article(instance)
+
+
+post_save.connect(push_new_article, sender=Article)
+
+
+def follow_timeline(sender, follower, followed, **kwargs):
+    """
+    Fills the timeline of a new follower with the followed author's articles
+    """
+    add_author(follower.pk, followed)
+
+
+def unfollow_timeline(sender, follower, followed, **kwargs):
+    """
+    Removes an unfollowed author's articles from the follower's timeline
+    """
+    remove_author(follower.pk, followed.pk)
+
+
+profile_followed.connect(follow_timeline, sender=Profile)
+profile_unfollowed.connect(unfollow_timeline, sender=Profile)
+
 
 def notify_comments_favorited_articles(sender, instance, created, **kwargs):
     """
     Signal that notifies users on comments on favorited items
     """
-    users = instance.article.users_fav_articles.all()
-    title = instance.article.title
-    slug = instance.article.slug
-    author = instance.article.author.user.get_full_name()
-    commenter = instance.author.user.get_full_name()
-    comment = instance.body
-    recipients = []
-    for user in users:
-        if user.user.get_notified:
-            recipients.append(user.user)
-        SendEmail().send_comment_notification_email(
-            user.user.email, title, author, commenter)
-    notify.send(instance, recipient=recipients,
-                verb='was commented on', slug=slug, title=title, author=author, commenter=commenter, comment=comment)
+    if created:
+        fan_out(NewComment, instance)
 
 
 post_save.connect(notify_comments_favorited_articles, sender=Comment)
+
+
+def count_new_comment(sender, instance, created, **kwargs):
+    """
+    Counts a new comment on its article and, for a reply, on its parent
+    """
+    if not created:
+        return
+    adjust_counters(Article, instance.article_id, comments_count=1)
+    if instance.parent_id is not None:
+        adjust_counters(Comment, instance.parent_id, replies_count=1)
+
+
+post_save.connect(count_new_comment, sender=Comment)
+
+
+def uncount_deleted_comment(sender, instance, **kwargs):
+    """
+    Removes a deleted comment, or a reply deleted with its thread, from the
+    counts of its article and parent
+    """
+    adjust_counters(Article, instance.article_id, comments_count=-1)
+    if instance.parent_id is not None:
+        adjust_counters(Comment, instance.parent_id, replies_count=-1)
+
+
+post_delete.connect(uncount_deleted_comment, sender=Comment)
+
+
+def delete_comment_reactions(sender, instance, **kwargs):
+    """Deletes the reactions to a deleted comment"""
+    delete_reactions(COMMENT, [instance.pk])
+
+
+post_delete.connect(delete_comment_reactions, sender=Comment)
+
+
+def version_edited_comment(sender, instance, created, **kwargs):
+    """
+    Bumps the version of the article of an edited comment. New comments
+    bump it by being counted.
+    """
+    if not created:
+        bump_version(Article, instance.article_id)
+
+
+post_save.connect(version_edited_comment, sender=Comment)
+
+
+def rating_deltas(previous, stars):
+    """
+    Returns the changes to an article's rating aggregate when a rating goes
+    from `previous` stars (None for a new rating) to `stars`
+    """
+    if previous == stars:
+        return {}
+
+    deltas = {'rating_sum': stars - (previous or 0),
+              rating_histogram_field(stars): 1}
+    if previous is None:
+        deltas['rating_count'] = 1
+    else:
+        deltas[rating_histogram_field(previous)] = -1
+    return deltas
+
+
+def count_rating(sender, instance, created, **kwargs):
+    """
+    Applies a new or changed rating to its article's rating aggregate
+    """
+    previous = None if created else getattr(instance, 'saved_stars', None)
+    if not created and previous is None:
+        # The stars this rating had are unknown, so recount the article
+        Article.objects.filter(pk=instance.article_id).update(
+            **rating_aggregate())
+    else:
+        adjust_counters(Article, instance.article_id,
+                        **rating_deltas(previous, instance.stars))
+    instance.saved_stars = instance.stars
+
+
+post_save.connect(count_rating, sender=Ratings)
+
+
+def uncount_deleted_rating(sender, instance, **kwargs):
+    """
+    Removes a deleted rating from its article's rating aggregate
+    """
+    stars = getattr(instance, 'saved_stars', None) or instance.stars
+    adjust_counters(Article, instance.article_id, rating_sum=-stars,
+                    rating_count=-1, **{rating_histogram_field(stars): -1})
+
+
+post_delete.connect(uncount_deleted_rating, sender=Ratings)
+
+
+def rating_aggregate():
+    """
+    Returns the expressions recomputing the rating aggregate of an article
+    from its ratings
+    """
+    ratings = Ratings.objects.all()
+    aggregate = {
+        'rating_sum': aggregate_subquery(ratings, 'article', Sum('stars')),
+        'rating_count': count_subquery(ratings, 'article'),
+    }
+    for stars in RATING_STARS:
+        aggregate[rating_histogram_field(stars)] = count_subquery(
+            ratings.filter(stars=stars), 'article')
+    return aggregate
+
+
+# Any change to what an article list shows makes the cached lists stale.
+# The comments, ratings, reactions and favorites of an article are shown
+# through its counters and version, which are adjusted along with them.
+for model in (Article, Tag, Profile, User):
+    post_save.connect(invalidate_list_responses, sender=model)
+    post_delete.connect(invalidate_list_responses, sender=model)
+m2m_changed.connect(invalidate_list_responses, sender=Article.tags.through)
+counters_adjusted.connect(invalidate_list_responses, sender=Article)
@@ -1,12 +1,17 @@
-from django.core.mail import send_mail, EmailMessage
-from authors import settings
 from django.template.loader import render_to_string
+
 from authors.apps.authentication.models import User
+from authors.apps.core.mail import build_email, queue_emails
 
 
 class SendEmail():
-    def send_article_notification_email(self, email, title, author):
-        user = User.objects.filter(email=email).first()
+    """
+    Queues the notification emails, which the `send_queued_mail`
+    management command sends
+    """
+
+    def article_notification_email(self, user, title, author):
+        """Returns the unsaved email telling `user` about a new article"""
         subject = "Notifications"
 
         # render template
@@ -17,17 +22,11 @@ class SendEmail():
             'author': author
         })
 
-        # set mail to email content with subject, body ,sender and recepient
-        # with html content type
-        mail = EmailMessage(
-            subject, body, "authorshaven@gmail.com", to=[email])
-        mail.content_subtype = 'html'
+        return build_email(subject, body, "authorshaven@gmail.com",
+                           [user.email])
 
-        # send email
-        mail.send()
-
-    def send_comment_notification_email(self, email, title, author, commenter):
-        user = User.objects.filter(email=email).first()
+    def comment_notification_email(self, user, title, author, commenter):
+        """Returns the unsaved email telling `user` about a new comment"""
         subject = "Notifications"
 
         # render template
@@ -39,11 +38,27 @@ class SendEmail():
             'commenter': commenter
         })
 
-        # set mail to email content with subject, body ,sender and recepient
-        # with html content type
-        mail = EmailMessage(
-            subject, body, "authorshaven@gmail.com", to=[email])
-        mail.content_subtype = 'html'
+        return build_email(subject, body, "authorshaven@gmail.com",
+                           [user.email])
+
+    def send_article_notification_email(self, email, title, author):
+        user = User.objects.filter(email=email).first()
+        self.article_notification_email(user, title, author).save()
+
+    def send_comment_notification_email(self, email, title, author, commenter):
+        user = User.objects.filter(email=email).first()
+        self.comment_notification_email(
+            user, title, author, commenter).save()
+
+    def queue_article_notification_emails(self, users, title, author):
+        """Queues the new article email of every user in one insert"""
+        queue_emails([self.article_notification_email(user, title, author)
+                      for user in users])
 
-        # send email
-        mail.send()
+    def queue_comment_notification_emails(self, users, title, author,
+                                          commenter):
+        """Queues the new comment email of every user in one insert"""
+        queue_emails([
+            self.comment_notification_email(user, title, author, commenter)
+            for user in users
+        ])
@@ -0,0 +1,128 @@
+"""
+Module contains the likes and dislikes of articles and comments.
+
+Every reaction is a row of one table, keyed by the type and id of its target
+and the user reacting, so switching from a like to a dislike rewrites a
+single row. A toggle is one statement: it removes the reaction if the user
+had it, or upserts it otherwise, and adjusts the target's counters by what
+actually changed. Toggles by the same user on the same target are
+serialized by an advisory lock, so concurrent clicks can't miscount.
+"""
+from django.apps import apps
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.fields import ArrayField
+from django.db import connection, models, transaction
+from django.db.models import OuterRef, Subquery
+from rest_framework.exceptions import NotFound
+
+from authors.apps.core.counters import is_versioned
+from authors.apps.core.signals import counters_adjusted
+
+# Values of a reaction
+LIKE = 1
+DISLIKE = -1
+VALUES = ((LIKE, 'like'), (DISLIKE, 'dislike'))
+
+# Types of the objects reacted to, and their models
+ARTICLE = 1
+COMMENT = 2
+TARGET_TYPES = ((ARTICLE, 'article'), (COMMENT, 'comment'))
+TARGET_MODELS = {
+    ARTICLE: 'articles.Article',
+    COMMENT: 'articles.Comment',
+}
+
+
+def target_model(target_type):
+    return apps.get_model(TARGET_MODELS[target_type])
+
+
+def reactor_ids(target_type, value):
+    """
+    Returns an expression of the ids of the users who reacted with `value`
+    to the outer row, None when nobody did. The reactions' covering index
+    serves it without reading the table.
+    """
+    Reaction = apps.get_model('articles.Reaction')
+    ids = Reaction.objects.filter(
+        target_type=target_type, target_id=OuterRef('pk'), value=value
+    ).order_by().values('target_id').annotate(
+        ids=ArrayAgg('user_id')).values('ids')
+    return Subquery(ids, output_field=ArrayField(models.IntegerField()))
+
+
+def toggle_reaction(target_type, target_id, user_id, value):
+    """
+    Toggles the reaction with `value` of the user with `user_id` to the
+    object of `target_type` with `target_id`. Returns the object's counters
+    and the user's reactions once toggled, raises NotFound when the object
+    doesn't exist.
+    """
+    Reaction = apps.get_model('articles.Reaction')
+    model = target_model(target_type)
+    version = ', version = version + 1' if is_versioned(model) else ''
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # the target's type and id are hashed into the first key, so an
+        # article and a comment sharing an id have locks of their own. A
+        # collision of hashes only serializes more toggles.
+        cursor.execute(
+            'SELECT pg_advisory_xact_lock(hashtext(%s), %s)',
+            ['reaction:{}:{}'.format(target_type, target_id), user_id])
+        # every change is joined to the target, locked against deletion,
+        # so nothing is written for a deleted one
+        cursor.execute(
+            'WITH target AS ('
+            'SELECT id FROM {targets} WHERE id = %(target)s '
+            'FOR KEY SHARE), '
+            'previous AS ('
+            'SELECT value FROM {reactions} WHERE {reaction}), '
+            'undone AS ('
+            'DELETE FROM {reactions} WHERE {reaction} '
+            'AND value = %(value)s AND EXISTS (SELECT 1 FROM target) '
+            'RETURNING value), '
+            'done AS ('
+            'INSERT INTO {reactions} '
+            '(target_type, target_id, user_id, value, created_at) '
+            'SELECT %(type)s, id, %(user)s, %(value)s, now() FROM target '
+            'WHERE NOT EXISTS (SELECT 1 FROM undone) '
+            'ON CONFLICT (target_type, target_id, user_id) '
+            'DO UPDATE SET value = EXCLUDED.value RETURNING value) '
+            'UPDATE {targets} SET '
+            'likes_count = likes_count '
+            '+ (SELECT count(*) FROM done WHERE value = {like}) '
+            '- (SELECT count(*) FROM previous WHERE value = {like}), '
+            'dislikes_count = dislikes_count '
+            '+ (SELECT count(*) FROM done WHERE value = {dislike}) '
+            '- (SELECT count(*) FROM previous WHERE value = {dislike})'
+            '{version} '
+            'WHERE id = (SELECT id FROM target) '
+            'RETURNING likes_count, dislikes_count, '
+            '(SELECT value FROM done)'.format(
+                reactions=Reaction._meta.db_table,
+                reaction='target_type = %(type)s AND target_id = %(target)s '
+                         'AND user_id = %(user)s',
+                targets=model._meta.db_table, like=LIKE, dislike=DISLIKE,
+                version=version),
+            {'type': target_type, 'target': target_id, 'user': user_id,
+             'value': value})
+        row = cursor.fetchone()
+    if row is None:
+        raise NotFound('This {} does not exist.'.format(
+            dict(TARGET_TYPES)[target_type]))
+    likes_count, dislikes_count, reaction = row
+    counters_adjusted.send(sender=model, pk=target_id)
+
+    return {
+        'likes_count': likes_count,
+        'dislikes_count': dislikes_count,
+        'liked': reaction == LIKE,
+        'disliked': reaction == DISLIKE,
+    }
+
+
+def delete_reactions(target_type, target_ids):
+    """Deletes the reactions to the objects of `target_type` with the ids"""
+    Reaction = apps.get_model('articles.Reaction')
+    Reaction.objects.filter(
+        target_type=target_type, target_id__in=target_ids).delete()
@@ -1,121 +1,62 @@
-import json
+from authors.apps.core.renderers import EnvelopeJSONRenderer
 
-from rest_framework.renderers import JSONRenderer
 
-
-class ArticleJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
-
-    def render(self, data, media_type=None, renderer_context=None):
-        """
-        Render the articles in a structured manner for the end user.
-        """
-        if data is not None:
-            if len(data) <= 1:
-                return json.dumps({
-                    'article': data
-                })
-            return json.dumps({
-                'articles': data
-            })
-        return json.dumps({
-            'article': 'No article found.'
-        })
-
-
-class RatingJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
-
-    def render(self, data, media_type=None, renderer_context=None):
-        """
-        Render the ratings in a structured manner for the end user.
-        """
-        return json.dumps({
-            'rate': data,
-        })
-
-
-class CommentJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
-
-    def render(self, data, media_type=None, renderer_context=None):
-        """
-        Render the articles in a structured manner for the end user.
-        """
-        if data is not None:
-            if len(data) <= 1:
-                return json.dumps({
-                    'article': data
-                })
-            return json.dumps({
-                'articles': data
-            })
-        return json.dumps({
-            'comment': 'No article found.'
-        })
+class ArticleJSONRenderer(EnvelopeJSONRenderer):
+    """
+    Render the articles in a structured manner for the end user.
+    """
+    envelope = 'article'
+    plural_envelope = 'articles'
+    empty = {'article': 'No article found.'}
 
 
-class FavoriteJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
+class RatingJSONRenderer(EnvelopeJSONRenderer):
     """
-        Render the favorited articles in a structured manner for the user.
+    Render the ratings in a structured manner for the end user.
     """
+    envelope = 'rate'
 
-    def render(self, data, media_type=None, renderer_context=None):
-
-        return json.dumps({
-            'articles': data
-        })
 
+class CommentJSONRenderer(EnvelopeJSONRenderer):
+    """
+    Render the comments in a structured manner for the end user.
+    """
+    envelope = 'article'
+    plural_envelope = 'articles'
+    empty = {'comment': 'No article found.'}
 
-class NotificationJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
 
-    def render(self, data, media_type=None, renderer_context=None):
-        """
-        Render the articles in a structured manner for the end user.
-        """
-        if data is not None:
-            return json.dumps({
-                'notifications': data
-            })
-        return json.dumps({
-            'notifications': 'No notifications found.'
-        })
+class FavoriteJSONRenderer(EnvelopeJSONRenderer):
+    """
+    Render the favorited articles in a structured manner for the user.
+    """
+    envelope = 'articles'
 
 
-class CommentEditHistoryJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
+class NotificationJSONRenderer(EnvelopeJSONRenderer):
     """
-        Render the comment edit history in a structured manner for the user.
+    Render the notifications in a structured manner for the end user.
     """
-
-    def render(self, data, media_type=None, renderer_context=None):
-        return json.dumps({
-            'comment_history': data
-        })
+    envelope = 'notifications'
+    empty = {'notifications': 'No notifications found.'}
 
 
-class CommentLikeJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
+class CommentEditHistoryJSONRenderer(EnvelopeJSONRenderer):
     """
-        Render the favorited articles in a structured manner for the user.
+    Render the comment edit history in a structured manner for the user.
     """
+    envelope = 'comment_history'
 
-    def render(self, data, media_type=None, renderer_context=None):
-
-        return json.dumps({
-            'comment': data
-        })
 
+class CommentLikeJSONRenderer(EnvelopeJSONRenderer):
+    """
+    Render the liked comments in a structured manner for the user.
+    """
+    envelope = 'comment'
 
-class BookmarkJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
 
-    def render(self, data, media_type=None, renderer_context=None):
-        """
-        Render the ratings in a structured manner for the end user.
-        """
-        return json.dumps({
-            'bookmark': data,
-        })
+class BookmarkJSONRenderer(EnvelopeJSONRenderer):
+    """
+    Render the bookmarks in a structured manner for the end user.
+    """
+    envelope = 'bookmark'
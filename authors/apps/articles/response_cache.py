@@ -0,0 +1,155 @@
+"""
+Module contains the cache of the article responses served to anonymous
+users.
+
+An article is cached under the validators of its ETag, which change with
+the article and the profiles it embeds, so a change to one article leaves
+the others cached. The lists are keyed by a generation of the lists, which
+only the changes shown by a list increment: making all of them stale is a
+single increment, and the responses of older generations expire unused.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import urlencode
+from rest_framework import status
+from rest_framework.response import Response
+
+from authors.apps.core.conditional import not_modified
+
+DEFAULT_SETTINGS = {
+    # Alias of the Django cache holding the responses
+    'CACHE_ALIAS': 'default',
+    # Seconds a response is cached for, 0 disabling the cache
+    'TIMEOUT': 300,
+    # Seconds other requests wait for the one rebuilding a missing response
+    # before building it themselves
+    'LOCK_TIMEOUT': 5,
+    # Seconds between two looks at the cache while waiting
+    'WAIT_INTERVAL': 0.05,
+}
+LIST_GENERATION_KEY = 'articles:response:list-generation'
+# Headers of a cached response restored along with its data
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Vary')
+
+
+def get_setting(name):
+    options = dict(DEFAULT_SETTINGS)
+    options.update(getattr(settings, 'ARTICLE_RESPONSE_CACHE', {}))
+    return options[name]
+
+
+def get_cache():
+    return caches[get_setting('CACHE_ALIAS')]
+
+
+def is_cacheable(request):
+    """Returns True when the response to `request` may come from the cache"""
+    return (get_setting('TIMEOUT') > 0 and request.method == 'GET' and
+            not request.user.is_authenticated)
+
+
+def list_generation():
+    """
+    Returns the current generation of the article lists. A generation lost
+    from the cache restarts from the clock, so it can't go back to one whose
+    responses are still cached.
+    """
+    cache = get_cache()
+    value = cache.get(LIST_GENERATION_KEY)
+    if value is None:
+        cache.add(LIST_GENERATION_KEY, int(time.time() * 1000), None)
+        value = cache.get(LIST_GENERATION_KEY)
+    return value
+
+
+def invalidate_lists():
+    """Makes every cached article list stale"""
+    try:
+        get_cache().incr(LIST_GENERATION_KEY)
+    except ValueError:
+        # no generation is cached, so no list is either
+        pass
+
+
+def invalidate_list_responses(sender, **kwargs):
+    """
+    Signal receiver making the cached article lists stale. It is repeated
+    on commit so a request can't cache the old rows while the transaction
+    is still open.
+    """
+    invalidate_lists()
+    transaction.on_commit(invalidate_lists)
+
+
+def response_key(request, version):
+    """
+    Returns the cache key of the response to `request` at `version`, from
+    its host, path and query parameters in any order
+    """
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    url = '{}{}?{}'.format(request.get_host(), request.path, query)
+    digest = hashlib.md5(url.encode('utf-8')).hexdigest()
+    return 'articles:response:{}:{}'.format(version, digest)
+
+
+def cached_response(request, build, version):
+    """
+    Returns the response to the anonymous `request` from the cache, where
+    it is kept for `version` of what it shows. On a miss one request calls
+    `build` to make the response and caches it when successful, while the
+    others wait for it instead of all rebuilding it.
+    """
+    cache = get_cache()
+    key = response_key(request, version)
+    entry = cache.get(key)
+    if entry is not None:
+        return restore(request, entry)
+
+    lock_key = key + ':lock'
+    if not cache.add(lock_key, True, get_setting('LOCK_TIMEOUT')):
+        entry = wait_for(cache, key)
+        if entry is not None:
+            return restore(request, entry)
+        return build()
+
+    try:
+        response = build()
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, {
+                'data': response.data,
+                'headers': {header: response[header]
+                            for header in CACHED_HEADERS
+                            if response.has_header(header)},
+            }, get_setting('TIMEOUT'))
+        return response
+    finally:
+        cache.delete(lock_key)
+
+
+def wait_for(cache, key):
+    """
+    Returns the response cached under `key` once another request has built
+    it, None if it didn't within the lock timeout
+    """
+    deadline = time.monotonic() + get_setting('LOCK_TIMEOUT')
+    while time.monotonic() < deadline:
+        time.sleep(get_setting('WAIT_INTERVAL'))
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def restore(request, entry):
+    """Returns the response of a cache entry, or 304 when it is current"""
+    etag = entry['headers'].get('ETag')
+    if etag is not None:
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+    return Response(entry['data'], status=status.HTTP_200_OK,
+                    headers=entry['headers'])
@@ -0,0 +1,63 @@
+"""
+Module contains the full-text search of articles. Each article stores a
+weighted search vector of its title, tags, description and body, which is
+kept up to date by signals and matched through a GIN index.
+"""
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import models
+from django.db.models import F, Func, OuterRef, Subquery, Value
+
+# Options of the highlighted snippet of the body matching a search
+HEADLINE_OPTIONS = ('StartSel=<mark>, StopSel=</mark>, '
+                    'MaxFragments=2, MaxWords=30, MinWords=10')
+
+
+def search_config():
+    """Returns the configured text search configuration, if any"""
+    return getattr(settings, 'ARTICLE_SEARCH_SETTINGS', {}).get('config')
+
+
+def search_document(tags_through):
+    """
+    Returns the expression computing the search vector of an article, the
+    title weighing most and the body least. `tags_through` is the table
+    linking articles to their tags.
+    """
+    config = search_config()
+    tags = tags_through.objects.filter(
+        article=OuterRef('pk')
+    ).order_by().values('article').annotate(
+        text=StringAgg('tag__tag', ' ')).values('text')
+    tags = Subquery(tags, output_field=models.TextField())
+
+    return (
+        SearchVector('title', weight='A', config=config) +
+        SearchVector(tags, weight='B', config=config) +
+        SearchVector('description', weight='B', config=config) +
+        SearchVector('body', weight='C', config=config)
+    )
+
+
+def update_search_vectors(queryset):
+    """Recomputes the search vector of the articles in `queryset`"""
+    queryset.update(
+        search_vector=search_document(queryset.model.tags.through))
+
+
+def search_query(text):
+    """Returns the query matching the words of `text`"""
+    return SearchQuery(text, config=search_config())
+
+
+def headline(field, query):
+    """
+    Returns the fragments of `field` matching `query`, the matched words
+    wrapped in <mark> tags
+    """
+    expressions = [F(field), query, Value(HEADLINE_OPTIONS)]
+    if search_config():
+        expressions.insert(0, Value(search_config()))
+    return Func(*expressions, function='ts_headline',
+                output_field=models.TextField())
@@ -1,10 +1,13 @@
 import re
 
-from authors.apps.profiles.serializers import ProfileSerializer
+from authors.apps.profiles.serializers import (ProfileSerializer,
+                                               ProfileSummarySerializer)
 from notifications.models import Notification
 from rest_framework import serializers
-from .models import Article, Bookmarks, Comment, Ratings, Tag, CommentEditHistory
-from .tag_relations import TagRelatedField
+from .models import (Article, Bookmarks, Comment, CommentEditHistory,
+                     Ratings, Reaction, Tag)
+from .reactions import ARTICLE, DISLIKE, LIKE
+from .tag_relations import TagRelatedField, resolve_tags
 
 
 class RecursiveSerializer(serializers.Serializer):
@@ -18,8 +21,12 @@ class CommentSerializer(serializers.ModelSerializer):
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
     reply_set = RecursiveSerializer(many=True, read_only=True)
-    comment_likes = serializers.SerializerMethodField()
-    comment_dislikes = serializers.SerializerMethodField()
+    comment_likes = serializers.IntegerField(
+        source='likes_count', read_only=True)
+    comment_dislikes = serializers.IntegerField(
+        source='dislikes_count', read_only=True)
+    replies_count = serializers.IntegerField(read_only=True)
+    next_replies_cursor = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
@@ -30,10 +37,17 @@ class CommentSerializer(serializers.ModelSerializer):
             'comment_dislikes',
             'body',
             'reply_set',
+            'replies_count',
+            'next_replies_cursor',
             'created_at',
             'updated_at',
         ]
 
+    def get_next_replies_cursor(self, instance):
+        # Only set on comments loaded through `load_threads` with replies
+        # left to load
+        return getattr(instance, 'next_replies_cursor', None)
+
     def create(self, validated_data):
         article = self.context['article']
         author = self.context['author']
@@ -42,12 +56,6 @@ class CommentSerializer(serializers.ModelSerializer):
             author=author, article=article, parent=parent, **validated_data
         )
 
-    def get_comment_likes(self, obj):
-        return obj.comment_likes.count()
-
-    def get_comment_dislikes(self, obj):
-        return obj.comment_dislikes.count()
-
     def is_edited(self):
         return False
 
@@ -64,18 +72,19 @@ class ArticleSerializer(serializers.ModelSerializer):
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
     author = ProfileSerializer(read_only=True)
-    likes = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
-    dislikes = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
-    likes_count = serializers.SerializerMethodField()
-    dislikes_count = serializers.SerializerMethodField()
+    likes = serializers.SerializerMethodField()
+    dislikes = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(read_only=True)
+    dislikes_count = serializers.IntegerField(read_only=True)
     average_rating = serializers.FloatField(required=False, read_only=True)
     comments = CommentSerializer(read_only=True, many=True)
     tagList = TagRelatedField(many=True, required=False, source='tags')
     favorited = serializers.SerializerMethodField(method_name="is_favorited")
-    favoriteCount = serializers.SerializerMethodField(
-        method_name='get_favorite_count'
-    )
+    favoriteCount = serializers.IntegerField(
+        source='favorites_count', read_only=True)
     bookmarked = serializers.SerializerMethodField(method_name="is_bookmarked")
+    # only present in search results
+    snippet = serializers.CharField(source='search_snippet', read_only=True)
 
     class Meta:
         model = Article
@@ -84,30 +93,51 @@ class ArticleSerializer(serializers.ModelSerializer):
                   'updated_at', 'author', 'average_rating',
                   'likes', 'dislikes', 'dislikes_count',
                   'likes_count', 'tagList',
-                  'favorited', 'favoriteCount', 'bookmarked']
-
-    def get_favorite_count(self, instance):
-
-        return instance.users_fav_articles.count()
+                  'favorited', 'favoriteCount', 'bookmarked', 'snippet']
 
     def is_favorited(self, instance):
         request = self.context.get('request')
         if request is None:
             return False
 
+        if hasattr(instance, 'viewer_favorited'):
+            return instance.viewer_favorited
+
         username = request.user.username
         if instance.users_fav_articles.filter(user__username=username).count() == 0:
             return False
 
         return True
 
+    def reactor_ids(self, instance, annotation, value):
+        # Annotated on articles loaded through `with_engagement`, None when
+        # nobody reacted
+        if hasattr(instance, annotation):
+            return getattr(instance, annotation) or []
+        return list(Reaction.objects.filter(
+            target_type=ARTICLE, target_id=instance.pk, value=value
+        ).values_list('user_id', flat=True))
+
+    def get_likes(self, instance):
+        return self.reactor_ids(instance, 'like_ids', LIKE)
+
+    def get_dislikes(self, instance):
+        return self.reactor_ids(instance, 'dislike_ids', DISLIKE)
+
     def create(self, validated_data):
-        tags = validated_data.pop('tags', [])
+        tags = resolve_tags(validated_data.pop('tags', []))
 
         article = Article.objects.create(**validated_data)
+        article.tags.add(*tags.values())
+
+        return article
+
+    def update(self, instance, validated_data):
+        tags = validated_data.pop('tags', None)
 
-        for tag in tags:
-            article.tags.add(tag)
+        article = super().update(instance, validated_data)
+        if tags is not None:
+            article.tags.set(resolve_tags(tags).values())
 
         return article
 
@@ -131,19 +161,39 @@ class ArticleSerializer(serializers.ModelSerializer):
             )
         return data
 
-    def get_likes_count(self, obj):
-        return obj.likes.count()
-
-    def get_dislikes_count(self, obj):
-        return obj.dislikes.count()
-
     def is_bookmarked(self, instance):
         request = self.context.get('request')
-        if request is None:
+        if request is None or not request.user.is_authenticated:
             return False
-        if Bookmarks.objects.filter(article_id=instance.id, user_id=instance.author.user_id):
-            return True
-        return False
+        if hasattr(instance, 'viewer_bookmarked'):
+            return instance.viewer_bookmarked
+        return Bookmarks.objects.filter(
+            article_id=instance.id, user__user=request.user).exists()
+
+
+class ArticleSummarySerializer(serializers.ModelSerializer):
+    """
+    Defines a compact, read-only article representation for feeds.
+
+    It leaves out the body, comments and like/dislike user lists so the size
+    of an entry does not grow with engagement. It expects the articles to be
+    loaded through `Article.objects.with_counts`.
+    """
+    author = ProfileSummarySerializer(read_only=True)
+    tagList = TagRelatedField(many=True, read_only=True, source='tags')
+    favoriteCount = serializers.IntegerField(
+        source='favorites_count', read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
+    # only present in search results
+    snippet = serializers.CharField(source='search_snippet', read_only=True)
+
+    class Meta:
+        model = Article
+        fields = ['title', 'slug', 'description', 'author', 'likes_count',
+                  'dislikes_count', 'favoriteCount', 'comments_count',
+                  'tagList', 'average_rating', 'snippet']
+        read_only_fields = ['title', 'slug', 'description', 'likes_count',
+                            'dislikes_count', 'comments_count']
 
 
 class RatingSerializer(serializers.Serializer):
@@ -0,0 +1,106 @@
+"""
+Module contains the allocation of unique slugs. Each base slug has a
+counter of the numbers handed out to it, so the n-th row sharing a title
+gets the base numbered n - 1 whatever other slugs look like: a title that
+itself ends in a number has its own base and never drives another's
+numbering. A counter is advanced and its numbers checked against the taken
+slugs in one statement, which holds the counter's row lock until the
+transaction ends, so concurrent allocations of a base can't collide.
+"""
+from django.apps import apps
+from django.db import IntegrityError, connection, transaction
+from django.utils.text import slugify
+
+# Number of times a save is retried when a concurrent save took its slug
+SLUG_RETRIES = 3
+
+
+def reserve_slugs(model, wanted):
+    """
+    Advances the counter of each base slug by the number of slugs `wanted`
+    for it and returns the reserved slugs by base, with whether each is
+    already taken by a row of `model`
+    """
+    SlugCounter = apps.get_model('articles.SlugCounter')
+    bases = sorted(wanted)
+    with connection.cursor() as cursor:
+        # the counters are locked in the order of their bases, so that
+        # concurrent batches can't deadlock
+        cursor.execute(
+            'WITH wanted AS ('
+            'SELECT * FROM unnest(%(bases)s::text[], %(counts)s::integer[]) '
+            'AS wanted (base, count)), '
+            'reserved AS ('
+            'INSERT INTO {counters} (scope, base, next_number) '
+            'SELECT %(scope)s, base, count FROM wanted ORDER BY base '
+            'ON CONFLICT (scope, base) DO UPDATE SET '
+            'next_number = {counters}.next_number + EXCLUDED.next_number '
+            'RETURNING base, next_number), '
+            'candidates AS ('
+            'SELECT base, number, CASE WHEN number = 0 THEN base '
+            "ELSE base || '-' || number END AS slug "
+            'FROM reserved JOIN wanted USING (base), generate_series('
+            'reserved.next_number - wanted.count, '
+            'reserved.next_number - 1) AS number) '
+            'SELECT base, slug, EXISTS ('
+            'SELECT 1 FROM {table} WHERE {table}.slug = candidates.slug) '
+            'FROM candidates ORDER BY base, number'.format(
+                counters=SlugCounter._meta.db_table,
+                table=model._meta.db_table),
+            {'scope': model._meta.label_lower, 'bases': bases,
+             'counts': [wanted[base] for base in bases]})
+        rows = cursor.fetchall()
+
+    reserved = {base: [] for base in bases}
+    for base, slug, taken in rows:
+        reserved[base].append((slug, taken))
+    return reserved
+
+
+def unique_slugs(model, texts):
+    """
+    Returns a slug of each of `texts` that is taken by no row of `model`
+    nor by another of the returned slugs, nor is one of the model's
+    `reserved_slugs`. Allocating any number of slugs costs one query unless
+    some of the numbers reserved were taken by rows given their slug
+    explicitly, which are skipped.
+    """
+    bases = [slugify(text) for text in texts]
+    free = {base: [] for base in bases}
+    wanted = {base: bases.count(base) for base in free}
+    # a numbered slug of one base may be another base of the batch
+    allocated = set(getattr(model, 'reserved_slugs', ()))
+
+    while wanted:
+        for base, slugs in reserve_slugs(model, wanted).items():
+            for slug, taken in slugs:
+                if not taken and slug not in allocated:
+                    free[base].append(slug)
+                    allocated.add(slug)
+        wanted = {base: bases.count(base) - len(free[base])
+                  for base in free if len(free[base]) < bases.count(base)}
+
+    return [free[base].pop(0) for base in bases]
+
+
+def unique_slug(model, text):
+    """Returns a slug of `text` taken by no row of `model`"""
+    return unique_slugs(model, [text])[0]
+
+
+def save_with_unique_slug(instance, save):
+    """
+    Calls `save` to insert `instance` in a savepoint, leaving its slug to be
+    allocated. The save is retried with a new slug when another row took
+    the slug between its allocation and the insert.
+    """
+    queryset = type(instance)._default_manager.all()
+    for attempt in range(SLUG_RETRIES):
+        instance.slug = ''
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            if attempt == SLUG_RETRIES - 1 or \
+                    not queryset.filter(slug=instance.slug).exists():
+                raise
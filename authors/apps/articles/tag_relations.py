@@ -1,19 +1,109 @@
+from django.db import connection
 from rest_framework import serializers
 
 from .models import Tag
 
+
+def normalise_tag(name):
+    """Returns the tag `name` stripped, its inner whitespace collapsed"""
+    return ' '.join(name.split())
+
+
+def tag_slug(name):
+    """Returns the slug identifying the tag `name`, whatever its case"""
+    return normalise_tag(name).lower()
+
+
+def insert_tags(tags):
+    """
+    Inserts the tags given as (slug, name) pairs in one statement, skipping
+    the ones created concurrently. Returns the inserted tags by slug.
+
+    The columns other than the name and slug take the values a new tag
+    would be saved with, such as their defaults.
+    """
+    fields = Tag._meta.concrete_fields
+    given = {'tag': [name for slug, name in tags],
+             'slug': [slug for slug, name in tags]}
+    template = Tag()
+    columns, values, params = [], [], []
+    for field in fields:
+        if field.primary_key:
+            continue
+        columns.append(field.column)
+        if field.attname in given:
+            values.append('new.' + field.attname)
+        else:
+            values.append('%s')
+            params.append(field.get_db_prep_save(
+                field.pre_save(template, True), connection))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO {table} ({columns}) SELECT {values} '
+            'FROM unnest(%s::text[], %s::text[]) AS new (tag, slug) '
+            'ON CONFLICT (slug) DO NOTHING RETURNING {returned}'.format(
+                table=Tag._meta.db_table, columns=', '.join(columns),
+                values=', '.join(values),
+                returned=', '.join(field.column for field in fields)),
+            params + [given['tag'], given['slug']])
+        inserted = [
+            Tag.from_db(connection.alias,
+                        [field.attname for field in fields], row)
+            for row in cursor.fetchall()]
+    return {tag.slug: tag for tag in inserted}
+
+
+def resolve_tags(names):
+    """
+    Returns a dict of the tags named `names` by their slug, creating the
+    missing ones and ignoring blank names. Resolving any number of tags
+    costs one query when they all exist and two when some are new.
+    """
+    wanted = {}
+    for name in names:
+        if tag_slug(name):
+            wanted.setdefault(tag_slug(name), normalise_tag(name))
+    tags = {tag.slug: tag for tag in Tag.objects.filter(slug__in=wanted)}
+
+    missing = [(slug, name) for slug, name in wanted.items()
+               if slug not in tags]
+    if missing:
+        tags.update(insert_tags(missing))
+        # created by a concurrent request between the select and the insert
+        raced = [slug for slug, name in missing if slug not in tags]
+        if raced:
+            tags.update((tag.slug, tag)
+                        for tag in Tag.objects.filter(slug__in=raced))
+    return tags
+
+
 class TagRelatedField(serializers.RelatedField):
-    """Defines a TagRealatedField for the article model"""
-    
+    """
+    Defines a TagRealatedField for the article model. Tags are validated one
+    at a time but resolved together by `resolve_tags`, so the field's
+    internal value is the normalised tag name.
+    """
+    default_error_messages = {
+        'invalid': 'A tag must be a string.',
+        'blank': 'A tag may not be blank.',
+        'max_length': 'A tag may not be longer than {max_length} characters.',
+    }
+
     def get_queryset(self):
         result = Tag.objects.all()
         return result
 
     def to_internal_value(self, data):
-        tag, created = Tag.objects.get_or_create(
-            tag=data, slug=data.lower()
-        )
-        return tag
+        if not isinstance(data, str):
+            self.fail('invalid')
+        name = normalise_tag(data)
+        if not name:
+            self.fail('blank')
+        max_length = Tag._meta.get_field('slug').max_length
+        if len(name) > max_length:
+            self.fail('max_length', max_length=max_length)
+        return name
 
     def to_representation(self, value):
         return value.tag
@@ -0,0 +1,164 @@
+"""
+Module contains the popularity statistics of tags.
+
+Each tag counts the articles it is on and keeps a trending score, the
+number of times it was added to an article with each addition weighing half
+as much every `HALF_LIFE` seconds. The score is stored as the base 2
+logarithm of the weights scaled to a fixed epoch, so it never has to be
+decayed in place: ordering by the stored score is ordering by the decayed
+one. Both are updated together by `record_taggings` in one statement.
+
+The most popular tags and the tags completing a prefix are cached for a
+short while, so the editor's tag picker costs a cache read per keystroke.
+"""
+import hashlib
+from datetime import datetime
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.utils import timezone
+
+DEFAULT_SETTINGS = {
+    # Seconds after which a tag's addition to an article counts half as
+    # much towards its trending score
+    'HALF_LIFE': 7 * 24 * 3600,
+    # Alias of the Django cache holding the top and autocomplete lists
+    'CACHE_ALIAS': 'default',
+    # Seconds a list is cached for, 0 disabling the cache
+    'CACHE_TIMEOUT': 60,
+    # Default and maximum number of tags in the top list
+    'TOP_LIMIT': 20,
+    'MAX_TOP_LIMIT': 100,
+    # Number of tags completing a prefix
+    'AUTOCOMPLETE_LIMIT': 10,
+}
+# The time from which the trending scores are measured
+EPOCH = datetime(2018, 1, 1, tzinfo=timezone.utc)
+# Orders of the top list, by the field they sort on
+ORDERINGS = {
+    'count': 'articles_count',
+    'trending': 'trending_score',
+}
+
+
+def get_setting(name):
+    options = dict(DEFAULT_SETTINGS)
+    options.update(getattr(settings, 'TAG_STATS', {}))
+    return options[name]
+
+
+def get_cache():
+    return caches[get_setting('CACHE_ALIAS')]
+
+
+def decay_exponent(when=None):
+    """Returns the number of half lives between the epoch and `when`"""
+    when = when or timezone.now()
+    return (when - EPOCH).total_seconds() / get_setting('HALF_LIFE')
+
+
+def trending(score, when=None):
+    """
+    Returns the number of additions a stored trending `score` amounts to at
+    `when`, once decayed
+    """
+    return 2 ** (score - decay_exponent(when))
+
+
+def record_taggings(changes, when=None):
+    """
+    Applies the number of articles each tag was added to, or removed from
+    if negative, given as a dict by tag id. Additions also raise the tags'
+    trending scores by their weight at `when`.
+    """
+    changes = {tag_id: delta for tag_id, delta in changes.items() if delta}
+    if not changes:
+        return
+    Tag = apps.get_model('articles.Tag')
+
+    with connection.cursor() as cursor:
+        # the new score is log2(2 ** score + delta * 2 ** exponent), written
+        # so that no power overflows nor underflows
+        cursor.execute(
+            'UPDATE {tags} SET '
+            'articles_count = {tags}.articles_count + changes.delta, '
+            'trending_score = CASE WHEN changes.delta > 0 THEN '
+            'GREATEST({tags}.trending_score, changes.added) + LN(1 + POWER('
+            '2.0, GREATEST(-ABS({tags}.trending_score - changes.added), '
+            '-1000))) / LN(2) '
+            'ELSE {tags}.trending_score END '
+            'FROM (SELECT id, delta, '
+            '%s::double precision + LN(GREATEST(delta, 1)) / LN(2) '
+            'AS added FROM unnest(%s::integer[], %s::integer[]) '
+            'AS deltas (id, delta)) AS changes '
+            'WHERE {tags}.id = changes.id'.format(tags=Tag._meta.db_table),
+            [decay_exponent(when), list(changes), list(changes.values())])
+
+
+def cached(key, load):
+    """Returns the list cached under `key`, loading it on a miss"""
+    timeout = get_setting('CACHE_TIMEOUT')
+    if timeout <= 0:
+        return load()
+    cache = get_cache()
+    tags = cache.get(key)
+    if tags is None:
+        tags = load()
+        cache.set(key, tags, timeout)
+    return tags
+
+
+def summary(tag, when):
+    return {
+        'tag': tag.tag,
+        'slug': tag.slug,
+        'articles_count': tag.articles_count,
+        'trending': round(trending(tag.trending_score, when), 3),
+    }
+
+
+def top_limit(value=None):
+    """
+    Returns the number of top tags asked for by the query parameter
+    `value`, at most the maximum. Raises ValueError when it isn't a number.
+    """
+    if not value:
+        return get_setting('TOP_LIMIT')
+    return max(1, min(int(value), get_setting('MAX_TOP_LIMIT')))
+
+
+def top_tags(order='count', limit=None):
+    """
+    Returns the summaries of the `limit` tags with the most articles, or
+    with the highest trending score
+    """
+    Tag = apps.get_model('articles.Tag')
+    limit = limit or get_setting('TOP_LIMIT')
+
+    def load():
+        now = timezone.now()
+        tags = Tag.objects.filter(articles_count__gt=0).order_by(
+            '-' + ORDERINGS[order], 'slug')[:limit]
+        return [summary(tag, now) for tag in tags]
+
+    return cached('tags:top:{}:{}'.format(order, limit), load)
+
+
+def complete_tag(prefix, limit=None):
+    """
+    Returns the summaries of the tags whose slug starts with the slug
+    `prefix`, most used first. The slug's pattern index serves the match.
+    """
+    Tag = apps.get_model('articles.Tag')
+    limit = limit or get_setting('AUTOCOMPLETE_LIMIT')
+
+    def load():
+        now = timezone.now()
+        tags = Tag.objects.filter(slug__startswith=prefix).order_by(
+            '-articles_count', 'slug')[:limit]
+        return [summary(tag, now) for tag in tags]
+
+    digest = hashlib.md5(prefix.encode('utf-8')).hexdigest()
+    return cached('tags:complete:{}:{}'.format(digest, limit), load)
@@ -0,0 +1,140 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import (Article, Bookmarks, Comment,
+                                          Ratings, Reaction, Tag)
+from authors.apps.articles.reactions import ARTICLE, COMMENT, DISLIKE, LIKE
+from authors.apps.authentication.models import User
+
+# count + page with the reactors + tags and comments prefetches
+ANONYMOUS_LIST_QUERIES = 4
+# the above + token user with their profile + followed authors
+AUTHENTICATED_LIST_QUERIES = 6
+# count + page + tags prefetch
+SUMMARY_LIST_QUERIES = 3
+
+
+class ArticleListQueriesTestCase(TestCase):
+    """
+    This class defines the test suite for the number of queries
+    the article list costs.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.reader = self.create_user('reader')
+        self.authors = [self.create_user('author%d' % i) for i in range(3)]
+        self.reader.profile.follow(self.authors[0].profile)
+        self.tag = Tag.objects.create(tag='django', slug='django')
+
+    def create_user(self, username):
+        """Creates a verified user"""
+        user = User.objects.create_user(
+            username, '{}@authors.haven'.format(username), 'Secret123456')
+        user.is_verified = True
+        user.save()
+        return user
+
+    def create_engaged_article(self, number):
+        """
+        Creates an article that has been tagged, liked, disliked, favorited,
+        bookmarked, rated and commented on with a thread of replies
+        """
+        author = self.authors[number % len(self.authors)]
+        article = Article.objects.create(
+            title='Article {}'.format(number), body='body',
+            description='description', author=author.profile)
+        article.tags.add(self.tag)
+        Reaction.objects.create(target_type=ARTICLE, target_id=article.pk,
+                                user=self.reader, value=LIKE)
+        Reaction.objects.create(target_type=ARTICLE, target_id=article.pk,
+                                user=author, value=DISLIKE)
+        self.reader.profile.favorite(article)
+        Bookmarks.objects.create(user=self.reader.profile, article=article)
+        Ratings.objects.create(
+            article=article, rater=self.reader.profile, stars=4)
+
+        parent = None
+        for commenter in [self.reader] + self.authors:
+            parent = Comment.objects.create(
+                body='reply', article=article, author=commenter.profile,
+                parent=parent)
+            Reaction.objects.create(target_type=COMMENT, target_id=parent.pk,
+                                    user=self.reader, value=LIKE)
+
+        # the rows above were added directly, so count them on the article
+        call_command('reconcile_counters', stdout=StringIO())
+        return article
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        """Test a page of many articles costs as many queries as one"""
+        self.create_engaged_article(0)
+        with self.assertNumQueries(ANONYMOUS_LIST_QUERIES):
+            response = self.client.get('/api/articles/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        for number in range(1, 10):
+            self.create_engaged_article(number)
+        with self.assertNumQueries(ANONYMOUS_LIST_QUERIES):
+            response = self.client.get('/api/articles/')
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_authenticated_list_query_count(self):
+        """Test an authenticated user's page costs a fixed number of queries"""
+        for number in range(10):
+            self.create_engaged_article(number)
+
+        with self.assertNumQueries(AUTHENTICATED_LIST_QUERIES):
+            response = self.client.get(
+                '/api/articles/',
+                HTTP_AUTHORIZATION='Token ' + self.reader.token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_serializes_engagement(self):
+        """Test the annotated values match the engagement on an article"""
+        self.create_engaged_article(0)
+
+        response = self.client.get(
+            '/api/articles/', HTTP_AUTHORIZATION='Token ' + self.reader.token)
+        article = response.data['results'][0]
+
+        self.assertEqual(article['likes'], [self.reader.pk])
+        self.assertEqual(article['likes_count'], 1)
+        self.assertEqual(article['dislikes_count'], 1)
+        self.assertEqual(article['favoriteCount'], 1)
+        self.assertEqual(article['average_rating'], 4)
+        self.assertEqual(article['tagList'], ['django'])
+        self.assertTrue(article['favorited'])
+        self.assertTrue(article['bookmarked'])
+        self.assertTrue(article['author']['following'])
+
+        root = [comment for comment in article['comments']
+                if comment['author']['username'] == 'reader'][0]
+        self.assertEqual(root['comment_likes'], 1)
+        self.assertEqual(
+            root['reply_set'][0]['author']['username'], 'author0')
+        self.assertEqual(
+            len(root['reply_set'][0]['reply_set'][0]['reply_set']), 1)
+
+    def test_summary_list_leaves_out_heavy_fields(self):
+        """Test the summary view has counts but no body, comments or likers"""
+        for number in range(5):
+            self.create_engaged_article(number)
+
+        with self.assertNumQueries(SUMMARY_LIST_QUERIES):
+            response = self.client.get('/api/articles/?view=summary')
+        article = response.data['results'][0]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(article), {
+            'title', 'slug', 'description', 'author', 'likes_count',
+            'dislikes_count', 'favoriteCount', 'comments_count', 'tagList',
+            'average_rating'})
+        self.assertEqual(set(article['author']), {'username', 'image'})
+        self.assertEqual(article['likes_count'], 1)
+        self.assertEqual(article['comments_count'], 4)
+        self.assertEqual(article['tagList'], ['django'])
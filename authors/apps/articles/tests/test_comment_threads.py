@@ -0,0 +1,167 @@
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, Comment
+from authors.apps.articles.threads import load_threads, thread_ids
+from authors.apps.authentication.models import User
+
+# token user with their profile + count + page + replies + followed authors
+THREAD_LIST_QUERIES = 5
+
+
+class CommentThreadsTestCase(TestCase):
+    """
+    This class defines the test suite for loading whole comment threads.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'commenter', 'commenter@authors.haven', 'Secret123456')
+        self.user.is_verified = True
+        self.user.save()
+        self.article = Article.objects.create(
+            title='Threads', body='body', description='description',
+            author=self.user.profile)
+
+    def comment(self, body, parent=None):
+        return Comment.objects.create(
+            body=body, article=self.article, author=self.user.profile,
+            parent=parent)
+
+    def create_thread(self, body, width, depth):
+        """Creates a root comment with `width` replies on `depth` levels"""
+        root = self.comment(body)
+        parents = [root]
+        for level in range(depth):
+            parents = [self.comment('{} {}'.format(body, level), parent)
+                       for parent in parents for _ in range(width)]
+        return root
+
+    def bodies(self, comment):
+        return [reply.body for reply in comment.reply_set.all()]
+
+    def test_list_query_count_is_independent_of_thread_size(self):
+        """Test listing threads costs the same however many replies"""
+        for number in range(3):
+            self.create_thread('thread {}'.format(number), 2, 4)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user.token)
+        url = '/api/articles/{}/comments/'.format(self.article.slug)
+        with self.assertNumQueries(THREAD_LIST_QUERIES):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        root = response.data['results'][0]
+        leaf = root['reply_set'][1]['reply_set'][0]['reply_set'][1]
+        self.assertEqual(len(leaf['reply_set']), 2)
+        self.assertEqual(leaf['reply_set'][0]['reply_set'], [])
+
+    def test_retrieve_loads_the_subtree_of_a_reply(self):
+        """Test retrieving a reply nests its own replies only"""
+        root = self.create_thread('thread', 2, 2)
+        reply = root.reply_set.first()
+
+        url = '/api/articles/{}/comments/{}/'.format(
+            self.article.slug, reply.pk)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [comment['body'] for comment in response.data['reply_set']],
+            ['thread 1', 'thread 1'])
+
+    def test_max_depth_cuts_off_deep_replies(self):
+        """Test replies below the maximum depth are left out"""
+        root = self.create_thread('thread', 1, 3)
+
+        root, = load_threads([Comment.objects.get(pk=root.pk)], max_depth=2)
+        reply = root.reply_set.all()[0]
+        self.assertEqual(self.bodies(reply), ['thread 1'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.bodies(reply.reply_set.all()[0]), [])
+
+    def test_reply_limits_apply_per_level(self):
+        """Test each level keeps its own number of the first replies"""
+        root = self.comment('root')
+        for number in range(3):
+            reply = self.comment('reply {}'.format(number), root)
+            for inner in range(3):
+                self.comment('inner {}.{}'.format(number, inner), reply)
+
+        root, = load_threads([Comment.objects.get(pk=root.pk)],
+                             reply_limit=[2, 1])
+        self.assertEqual(self.bodies(root), ['reply 0', 'reply 1'])
+        self.assertEqual(
+            [self.bodies(reply) for reply in root.reply_set.all()],
+            [['inner 0.0'], ['inner 1.0']])
+        self.assertEqual(root.replies_count, 3)
+
+    def test_replies_left_out_are_not_read(self):
+        """Test the reply limits apply in the database"""
+        root = self.create_thread('thread', 3, 3)
+
+        ids = thread_ids(Comment, [root], max_depth=None, reply_limit=1)
+        self.assertEqual(Comment.objects.filter(pk__in=ids).count(), 3)
+
+    @override_settings(COMMENT_THREADS={'REPLY_LIMIT': 1})
+    def test_reply_limit_setting(self):
+        """Test the configured reply limit applies by default"""
+        root = self.create_thread('thread', 2, 2)
+
+        root, = load_threads([Comment.objects.get(pk=root.pk)])
+        self.assertEqual(len(self.bodies(root)), 1)
+        self.assertEqual(len(self.bodies(root.reply_set.all()[0])), 1)
+
+    def test_depth_cut_off_sets_a_replies_cursor(self):
+        """Test comments cut off by depth can load their replies"""
+        self.create_thread('thread', 1, 2)
+
+        url = '/api/articles/{}/comments/'.format(self.article.slug)
+        response = self.client.get(url + '?depth=1')
+        reply = response.data['results'][0]['reply_set'][0]
+        self.assertEqual(reply['reply_set'], [])
+        self.assertEqual(reply['replies_count'], 1)
+        self.assertIsNotNone(reply['next_replies_cursor'])
+        self.assertIsNone(response.data['results'][0]['next_replies_cursor'])
+
+        response = self.client.get(
+            '/api/articles/{}/comments/{}/replies/'.format(
+                self.article.slug, reply['id']),
+            {'cursor': reply['next_replies_cursor']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [comment['body'] for comment in response.data['results']],
+            ['thread 1'])
+
+    @override_settings(COMMENT_THREADS={'REPLY_LIMIT': 2})
+    def test_more_replies_are_paged_in_thread_order(self):
+        """Test the replies cursor continues after the loaded replies"""
+        root = self.comment('root')
+        for number in range(5):
+            self.comment('reply {}'.format(number), root)
+
+        url = '/api/articles/{}/comments/{}/'.format(
+            self.article.slug, root.pk)
+        cursor = self.client.get(url).data['next_replies_cursor']
+
+        bodies = []
+        url += 'replies/?page_size=2&cursor=' + cursor
+        while url:
+            response = self.client.get(url)
+            bodies.extend(comment['body']
+                          for comment in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(bodies, ['reply 2', 'reply 3', 'reply 4'])
+
+    def test_replies_of_unknown_comment(self):
+        """Test replies of a comment of another article are not found"""
+        root = self.comment('root')
+        response = self.client.get(
+            '/api/articles/other/comments/{}/replies/'.format(root.pk))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(
+            '/api/articles/{}/comments/{}/replies/?cursor=bad'.format(
+                self.article.slug, root.pk))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
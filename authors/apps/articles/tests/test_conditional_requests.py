@@ -0,0 +1,127 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, Comment, Tag
+from authors.apps.authentication.models import User
+
+
+class ConditionalRequestsTestCase(TestCase):
+    """
+    This class defines the test suite for conditional GETs of articles,
+    profiles and tags.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = self.create_user('author')
+        self.reader = self.create_user('reader')
+        self.article = Article.objects.create(
+            title='Cached', body='body', description='description',
+            author=self.author.profile)
+        self.url = '/api/articles/{}/'.format(self.article.slug)
+
+    def create_user(self, username):
+        """Creates a verified user"""
+        user = User.objects.create_user(
+            username, '{}@authors.haven'.format(username), 'Secret123456')
+        user.is_verified = True
+        user.save()
+        return user
+
+    def get(self, url, etag=None):
+        if etag is None:
+            return self.client.get(url)
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def assertNotModified(self, url, etag):
+        self.assertEqual(self.get(url, etag).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+    def assertModified(self, url, etag):
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        return response['ETag']
+
+    def test_unchanged_article_is_not_sent_again(self):
+        """Test a matching ETag is answered before the article is loaded"""
+        response = self.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('Authorization', response['Vary'])
+
+        with self.assertNumQueries(1):
+            response = self.get(self.url, response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_engagement_changes_the_article_etag(self):
+        """Test comments, favorites and tags change the ETag"""
+        etag = self.get(self.url)['ETag']
+
+        comment = Comment.objects.create(
+            body='first', article=self.article, author=self.reader.profile)
+        etag = self.assertModified(self.url, etag)
+
+        comment.body = 'edited'
+        comment.save()
+        etag = self.assertModified(self.url, etag)
+
+        self.reader.profile.favorite(self.article)
+        etag = self.assertModified(self.url, etag)
+
+        self.article.tags.add(Tag.objects.create(tag='cache', slug='cache'))
+        etag = self.assertModified(self.url, etag)
+        self.assertNotModified(self.url, etag)
+
+    def test_commenter_changes_the_article_etag(self):
+        """Test the profiles of commenters, embedded, change the ETag"""
+        Comment.objects.create(
+            body='first', article=self.article, author=self.reader.profile)
+        etag = self.get(self.url)['ETag']
+
+        self.reader.profile.bio = 'Reads a lot'
+        self.reader.profile.save()
+        etag = self.assertModified(self.url, etag)
+
+        self.reader.username = 'renamed'
+        self.reader.save()
+        response = self.get(self.url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['comments'][0]['author']['username'], 'renamed')
+
+    def test_article_etag_is_personalized(self):
+        """Test users get their own ETags, changing with whom they follow"""
+        anonymous = self.get(self.url)['ETag']
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token ' + self.reader.token)
+        etag = self.assertModified(self.url, anonymous)
+
+        self.reader.profile.follow(self.author.profile)
+        response = self.get(self.url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['author']['following'])
+
+    def test_profile_conditional_get(self):
+        """Test a profile is sent again once it changes"""
+        url = '/api/profiles/author/'
+        etag = self.get(url)['ETag']
+        self.assertNotModified(url, etag)
+
+        self.author.profile.bio = 'Writes about caching'
+        self.author.profile.save()
+        etag = self.assertModified(url, etag)
+
+        self.reader.profile.follow(self.author.profile)
+        self.assertModified(url, etag)
+
+    def test_tags_conditional_get(self):
+        """Test the tag list is sent again once a tag is added"""
+        response = self.get('/api/tags/')
+        self.assertNotIn('Authorization', response.get('Vary', ''))
+        self.assertNotModified('/api/tags/', response['ETag'])
+
+        Tag.objects.create(tag='new', slug='new')
+        self.assertModified('/api/tags/', response['ETag'])
@@ -0,0 +1,139 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import (Article, Bookmarks, Comment,
+                                          Reaction)
+from authors.apps.articles.reactions import ARTICLE, LIKE
+from authors.apps.authentication.models import User
+
+
+class CountersTestCase(TestCase):
+    """
+    This class defines the test suite for the denormalized engagement
+    counters of articles and comments.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'counter', 'counter@authors.haven', 'Secret123456')
+        self.user.is_verified = True
+        self.user.save()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user.token)
+        self.article = Article.objects.create(
+            title='Counting', body='body', description='description',
+            author=self.user.profile)
+
+    def refresh(self):
+        self.article.refresh_from_db()
+        return self.article
+
+    def test_like_toggles_update_counters(self):
+        """Test liking, disliking and undoing move the counters"""
+        url = '/api/articles/counting/'
+        self.client.put(url + 'like/')
+        self.assertEqual(self.refresh().likes_count, 1)
+
+        self.client.put(url + 'dislike/')
+        self.assertEqual(self.refresh().likes_count, 0)
+        self.assertEqual(self.article.dislikes_count, 1)
+
+        self.client.put(url + 'dislike/')
+        self.assertEqual(self.refresh().dislikes_count, 0)
+
+    def test_favorite_bookmark_and_rating_update_counters(self):
+        """Test favorites, bookmarks and ratings are counted on the article"""
+        url = '/api/articles/counting/'
+        self.client.post(url + 'favorite/')
+        self.client.post(url + 'favorite/')
+        self.client.post(url + 'bookmark/')
+        self.client.post(url + 'rate/', {'rate': {'rating': 4}}, format='json')
+        self.client.post(url + 'rate/', {'rate': {'rating': 2}}, format='json')
+
+        article = self.refresh()
+        self.assertEqual(article.favorites_count, 1)
+        self.assertEqual(article.bookmarks_count, 1)
+        self.assertEqual(article.rating_count, 1)
+        self.assertEqual(article.rating_sum, 2)
+
+        self.client.delete(url + 'favorite/')
+        response = self.client.delete(url + 'bookmark/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.refresh().favorites_count, 0)
+        self.assertEqual(self.article.bookmarks_count, 0)
+
+    def test_a_bookmark_is_stored_once(self):
+        """Test concurrent bookmarks can't both insert and be counted"""
+        Bookmarks.objects.create(user=self.user.profile, article=self.article)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Bookmarks.objects.create(
+                user=self.user.profile, article=self.article)
+
+    def test_comments_and_replies_are_counted(self):
+        """Test comments count on the article and replies on their parent"""
+        root = Comment.objects.create(
+            body='root', article=self.article, author=self.user.profile)
+        Comment.objects.create(body='reply', article=self.article,
+                               author=self.user.profile, parent=root)
+        root.refresh_from_db()
+        self.assertEqual(self.refresh().comments_count, 2)
+        self.assertEqual(root.replies_count, 1)
+
+        root.delete()
+        self.assertEqual(self.refresh().comments_count, 0)
+
+    def test_comment_like_updates_counters(self):
+        """Test liking a comment is counted on the comment"""
+        comment = Comment.objects.create(
+            body='root', article=self.article, author=self.user.profile)
+        response = self.client.post(
+            '/api/articles/counting/comments/{}/like/'.format(comment.pk))
+        self.assertEqual(response.data['comment_likes'], 1)
+
+        response = self.client.post(
+            '/api/articles/counting/comments/{}/dislike/'.format(comment.pk))
+        self.assertEqual(response.data['comment_likes'], 0)
+        self.assertEqual(response.data['comment_dislikes'], 1)
+
+    def test_reconcile_counters_rebuilds_drifted_rows(self):
+        """Test the management command recomputes counters out of step"""
+        Reaction.objects.create(target_type=ARTICLE,
+                                target_id=self.article.pk, user=self.user,
+                                value=LIKE)
+        Article.objects.filter(pk=self.article.pk).update(favorites_count=5)
+
+        out = StringIO()
+        call_command('reconcile_counters', '--dry-run', stdout=out)
+        self.assertIn('Article: 1 row(s) out of step', out.getvalue())
+        self.assertEqual(self.refresh().likes_count, 0)
+
+        call_command('reconcile_counters', stdout=StringIO())
+        article = self.refresh()
+        self.assertEqual(article.likes_count, 1)
+        self.assertEqual(article.favorites_count, 0)
+
+    def test_rating_distribution(self):
+        """Test re-rating moves the rating between histogram buckets"""
+        rater = User.objects.create_user(
+            'rater', 'rater@authors.haven', 'Secret123456')
+        rater.is_verified = True
+        rater.save()
+        url = '/api/articles/counting/rate/'
+        self.client.post(url, {'rate': {'rating': 5}}, format='json')
+        self.client.post(url, {'rate': {'rating': 3}}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + rater.token)
+        response = self.client.post(
+            url, {'rate': {'rating': 4}}, format='json')
+        self.assertEqual(response.data['avg']['stars__avg'], 3.5)
+
+        response = self.client.get(url + 'distribution/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(response.data['average'], 3.5)
+        self.assertEqual(response.data['distribution'],
+                         {1: 0, 2: 0, 3: 1, 4: 1, 5: 0})
@@ -0,0 +1,98 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, Comment, Tag
+from authors.apps.authentication.models import User
+
+
+class ExportTestCase(TestCase):
+    """
+    This class defines the test suite for the NDJSON export of articles.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'exporter', 'exporter@authors.haven', 'Secret123456')
+        self.user.is_verified = True
+        self.user.save()
+        self.article = Article.objects.create(
+            title='Exported', body='body', description='description',
+            author=self.user.profile)
+        self.article.tags.add(Tag.objects.create(tag='django', slug='django'))
+        parent = Comment.objects.create(
+            body='first', article=self.article, author=self.user.profile)
+        Comment.objects.create(body='reply', article=self.article,
+                               author=self.user.profile, parent=parent)
+        self.older = Article.objects.create(
+            title='Older', body='body', description='description',
+            author=self.user.profile)
+        Article.objects.filter(pk=self.older.pk).update(
+            updated_at=timezone.now() - timedelta(days=2))
+
+    def export(self, query=''):
+        response = self.client.get(
+            '/api/articles/export/' + query,
+            HTTP_AUTHORIZATION='Token ' + self.user.token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        content = b''.join(response.streaming_content).decode('utf-8')
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_articles_are_streamed_oldest_update_first(self):
+        """Test each article is a line, in the order they were updated"""
+        articles = self.export()
+        self.assertEqual([article['slug'] for article in articles],
+                         [self.older.slug, self.article.slug])
+        self.assertEqual(articles[1]['author_username'], 'exporter')
+        self.assertNotIn('tags', articles[1])
+
+    def test_included_relations_are_exported(self):
+        """Test the tags and comments are exported when asked for"""
+        article = self.export('?include=tags,comments,unknown')[1]
+        self.assertEqual(article['tags'], ['django'])
+        self.assertEqual([comment['body'] for comment in article['comments']],
+                         ['first', 'reply'])
+        self.assertEqual(article['comments'][1]['parent_id'],
+                         article['comments'][0]['id'])
+        self.assertNotIn('ratings', article)
+
+    def test_articles_are_filtered_by_update(self):
+        """Test only the articles updated in the given range are exported"""
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        articles = self.export('?' + 'updated_since=' + since.replace(
+            '+', '%2B'))
+        self.assertEqual([article['slug'] for article in articles],
+                         [self.article.slug])
+        articles = self.export('?' + 'updated_before=' + since.replace(
+            '+', '%2B'))
+        self.assertEqual([article['slug'] for article in articles],
+                         [self.older.slug])
+
+    def test_invalid_timestamp_is_rejected(self):
+        """Test a malformed timestamp is a bad request"""
+        response = self.client.get(
+            '/api/articles/export/?updated_since=yesterday',
+            HTTP_AUTHORIZATION='Token ' + self.user.token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_anonymous_users_cannot_export(self):
+        """Test the export requires an authenticated user"""
+        response = self.client.get('/api/articles/export/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_command(self):
+        """Test the command writes the same lines"""
+        output = StringIO()
+        call_command('export_articles', '--include', 'tags', stdout=output)
+        articles = [json.loads(line)
+                    for line in output.getvalue().splitlines()]
+        self.assertEqual([article['tags'] for article in articles],
+                         [[], ['django']])
@@ -0,0 +1,95 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from notifications.models import Notification
+
+from authors.apps.articles.models import (Article, Comment,
+                                          NotificationFanout)
+from authors.apps.authentication.models import User
+from authors.apps.core.models import QueuedEmail
+
+
+class FanoutTestCase(TestCase):
+    """
+    This class defines the test suite for notifying the audience of new
+    articles and comments.
+    """
+
+    def setUp(self):
+        self.author = self.create_user('writer')
+        self.followers = [self.create_user('reader%d' % number)
+                          for number in range(5)]
+        for follower in self.followers:
+            follower.profile.follow(self.author.profile)
+        self.followers[0].get_notified = False
+        self.followers[0].save()
+
+    def create_user(self, username):
+        return User.objects.create_user(
+            username, '{}@authors.haven'.format(username), 'Secret123456')
+
+    def create_article(self, title='Fanned out'):
+        return Article.objects.create(
+            title=title, body='body', description='description',
+            author=self.author.profile)
+
+    def notified(self):
+        return set(Notification.objects.values_list(
+            'recipient__username', flat=True))
+
+    def test_followers_who_get_notified_are_notified(self):
+        """Test a new article notifies and emails the opted in followers"""
+        article = self.create_article()
+        expected = {'reader%d' % number for number in range(1, 5)}
+
+        self.assertEqual(self.notified(), expected)
+        self.assertEqual(QueuedEmail.objects.count(), 4)
+        notification = Notification.objects.first()
+        self.assertEqual(notification.verb, 'was posted')
+        self.assertEqual(notification.actor, article)
+        self.assertEqual(notification.data['slug'], article.slug)
+
+        article.body = 'edited'
+        article.save()
+        self.assertEqual(Notification.objects.count(), 4)
+
+    def test_query_count_does_not_grow_with_followers(self):
+        """Test posting costs the same queries for 5 or 30 followers"""
+        self.create_article('Warm up')
+        with CaptureQueriesContext(connection) as few:
+            self.create_article('Few followers')
+
+        for number in range(25):
+            self.create_user('more%d' % number).profile.follow(
+                self.author.profile)
+        with CaptureQueriesContext(connection) as many:
+            self.create_article('Many followers')
+        self.assertEqual(len(few), len(many))
+
+    def test_comment_notifies_favoriters(self):
+        """Test a comment notifies the users who favorited the article"""
+        article = self.create_article()
+        Notification.objects.all().delete()
+        self.followers[1].profile.favorite(article)
+
+        Comment.objects.create(body='comment', article=article,
+                               author=self.author.profile)
+        self.assertEqual(self.notified(), {'reader1'})
+
+    @override_settings(NOTIFICATION_FANOUT={
+        'BACKGROUND_THRESHOLD': 2, 'CHUNK_SIZE': 3})
+    def test_large_audience_is_notified_off_the_request(self):
+        """Test a large audience is queued and notified by the command"""
+        self.create_article()
+        self.assertEqual(Notification.objects.count(), 0)
+        self.assertEqual(NotificationFanout.objects.count(), 1)
+
+        out = StringIO()
+        call_command('fan_out_notifications', stdout=out)
+        self.assertIn('4 user(s) notified', out.getvalue())
+        self.assertEqual(Notification.objects.count(), 4)
+        self.assertEqual(QueuedEmail.objects.count(), 4)
+        self.assertFalse(NotificationFanout.objects.exists())
@@ -0,0 +1,115 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, TimelineEntry
+from authors.apps.authentication.models import User
+
+
+class FeedTestCase(TestCase):
+    """
+    This class defines the test suite for the feed of articles from
+    followed authors.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.reader = self.create_user('reader')
+        self.authors = [self.create_user('author%d' % i) for i in range(3)]
+        self.reader.profile.follow(self.authors[0].profile)
+        self.reader.profile.follow(self.authors[1].profile)
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token ' + self.reader.token)
+
+    def create_user(self, username):
+        """Creates a verified user"""
+        user = User.objects.create_user(
+            username, '{}@authors.haven'.format(username), 'Secret123456')
+        user.is_verified = True
+        user.save()
+        return user
+
+    def create_article(self, author, title):
+        return Article.objects.create(
+            title=title, body='body', description='description',
+            author=author.profile)
+
+    def feed_titles(self, url='/api/articles/feed/'):
+        titles = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            titles.extend(article['title']
+                          for article in response.data['results'])
+            url = response.data['next']
+        return titles
+
+    def test_feed_lists_followed_authors_newest_first(self):
+        """Test the feed has the followed authors' articles only"""
+        for number in range(3):
+            for author in self.authors:
+                self.create_article(
+                    author, '{} {}'.format(author.username, number))
+
+        titles = self.feed_titles('/api/articles/feed/?page_size=4')
+        self.assertEqual(titles, [
+            'author1 2', 'author0 2', 'author1 1', 'author0 1',
+            'author1 0', 'author0 0'])
+
+    def test_follow_and_unfollow_update_the_feed(self):
+        """Test following backfills the feed and unfollowing empties it"""
+        self.create_article(self.authors[2], 'Earlier')
+        self.reader.profile.follow(self.authors[2].profile)
+        self.assertEqual(self.feed_titles(), ['Earlier'])
+
+        self.reader.profile.unfollow(self.authors[2].profile)
+        self.assertEqual(self.feed_titles(), [])
+
+    @override_settings(TIMELINE={'FANOUT_ON_READ_THRESHOLD': 1})
+    def test_popular_authors_are_read_on_demand(self):
+        """Test popular authors skip timelines but still reach the feed"""
+        self.create_user('fan').profile.follow(self.authors[0].profile)
+        self.create_article(self.authors[0], 'Popular 0')
+        self.create_article(self.authors[1], 'Normal')
+        self.create_article(self.authors[0], 'Popular 1')
+
+        self.assertEqual(
+            list(TimelineEntry.objects.values_list(
+                'article__title', flat=True)), ['Normal'])
+        self.assertEqual(
+            self.feed_titles('/api/articles/feed/?page_size=1'),
+            ['Popular 1', 'Normal', 'Popular 0'])
+
+    @override_settings(TIMELINE={'MAX_LENGTH': 2})
+    def test_timelines_are_trimmed(self):
+        """Test new articles push the oldest ones out of a timeline"""
+        self.create_article(self.authors[1], 'Article 0')
+        for number in range(1, 4):
+            self.create_article(self.authors[0], 'Article {}'.format(number))
+
+        self.assertEqual(TimelineEntry.objects.count(), 2)
+        self.assertEqual(self.feed_titles(), ['Article 3', 'Article 2'])
+
+        self.reader.profile.unfollow(self.authors[0].profile)
+        self.reader.profile.follow(self.authors[0].profile)
+        self.assertEqual(self.feed_titles(), ['Article 3', 'Article 2'])
+
+    def test_trim_command(self):
+        """Test the trim command keeps the latest entries of a timeline"""
+        for number in range(4):
+            self.create_article(self.authors[0], 'Article {}'.format(number))
+
+        out = StringIO()
+        with self.settings(TIMELINE={'MAX_LENGTH': 2}):
+            call_command('trim_timelines', stdout=out)
+        self.assertIn('2 timeline entries deleted', out.getvalue())
+        self.assertEqual(self.feed_titles(), ['Article 3', 'Article 2'])
+
+    def test_feed_requires_authentication(self):
+        """Test an anonymous user has no feed"""
+        self.client.credentials()
+        response = self.client.get('/api/articles/feed/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
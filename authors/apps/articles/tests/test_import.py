@@ -0,0 +1,144 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from notifications.models import Notification
+
+from authors.apps.articles.importer import import_batch, read_csv
+from authors.apps.articles.models import Article, Tag, TimelineEntry
+from authors.apps.articles.slugs import unique_slugs
+from authors.apps.authentication.models import User
+
+
+class ImportTestCase(TestCase):
+    """
+    This class defines the test suite for the bulk import of articles.
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            'importer', 'importer@authors.haven', 'Secret123456')
+        self.follower = User.objects.create_user(
+            'follower', 'follower@authors.haven', 'Secret123456')
+        self.follower.profile.follow(self.author.profile)
+
+    def record(self, title, **fields):
+        record = {'title': title, 'description': 'description',
+                  'body': 'body', 'author': 'importer'}
+        record.update(fields)
+        return record
+
+    def import_file(self, suffix, content, *args):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w') as file:
+            file.write(content)
+        self.addCleanup(os.remove, path)
+        output = StringIO()
+        call_command('import_articles', path, *args, stdout=output)
+        return output.getvalue()
+
+    def test_slugs_skip_taken_ones(self):
+        """Test the slugs of a batch are unique among themselves and stored"""
+        Article.objects.create(title='Hello', body='body',
+                               description='description',
+                               author=self.author.profile)
+        Article.objects.create(title='Hello', slug='hello-4', body='body',
+                               description='description',
+                               author=self.author.profile)
+
+        slugs = unique_slugs(Article,
+                             ['Hello', 'Hello', 'Hello world', 'Hello 4'])
+        self.assertEqual(slugs, ['hello-1', 'hello-2', 'hello-world',
+                                 'hello-4-1'])
+
+    def test_batch_query_count_is_fixed(self):
+        """Test a batch costs the same queries whatever its size"""
+        records = [self.record('Article %d' % number, tags=['Python', 'go'])
+                   for number in range(20)]
+        records.append(self.record('Unknown author', author='nobody'))
+        records.append(self.record('Incomplete', body=''))
+
+        with self.assertNumQueries(12):
+            articles = import_batch(records, notify=False)
+
+        self.assertEqual(len(articles), 20)
+        self.assertEqual(Tag.objects.count(), 2)
+        article = Article.objects.get(slug='article-3')
+        self.assertEqual(sorted(article.tags.values_list('slug', flat=True)),
+                         ['go', 'python'])
+        self.assertTrue(Article.objects.filter(
+            search_vector='python').exists())
+        self.assertEqual(TimelineEntry.objects.filter(
+            owner=self.follower.profile).count(), 20)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_ndjson_import_notifies_followers(self):
+        """Test the command imports NDJSON and notifies by default"""
+        content = ''.join(json.dumps(self.record('Article %d' % number)) +
+                          '\n' for number in range(3))
+        output = self.import_file('.ndjson', content, '--batch-size', '2')
+
+        self.assertIn('3 article(s) imported, 0 skipped', output)
+        self.assertIn('articles/s', output)
+        self.assertEqual(Article.objects.count(), 3)
+        self.assertEqual(Notification.objects.filter(
+            recipient=self.follower).count(), 3)
+
+    def test_malformed_records_are_skipped(self):
+        """Test invalid tags, fields and lines skip their record only"""
+        content = ''.join(line + '\n' for line in [
+            json.dumps(self.record('Tags as a string', tags='django')),
+            json.dumps(self.record('Numeric tag', tags=[1])),
+            json.dumps(self.record('Null tag', tags=[None])),
+            json.dumps(self.record('Object tag', tags=[{'tag': 'go'}])),
+            json.dumps(self.record('Blank tag', tags=['  '])),
+            json.dumps(self.record('Long tag', tags=['a' * 51])),
+            json.dumps(self.record('Bad date', created_at='yesterday')),
+            json.dumps(self.record(['Not', 'a', 'title'])),
+            json.dumps(['not', 'a', 'record']),
+            '{"title": "cut',
+            json.dumps(self.record('Valid', tags=['django'])),
+        ])
+        output = self.import_file('.ndjson', content, '--no-notify')
+
+        self.assertIn('1 article(s) imported, 10 skipped', output)
+        self.assertEqual(list(Tag.objects.values_list('tag', flat=True)),
+                         ['django'])
+
+    def test_archived_creation_times_are_kept(self):
+        """Test imported articles keep the time they were created"""
+        import_batch([
+            self.record('Older', created_at='2018-09-20T14:12:00Z'),
+            self.record('Newer', created_at='2018-09-21T14:12:00+01:00'),
+            self.record('Undated'),
+        ], notify=False)
+
+        articles = Article.objects.order_by('created_at')
+        self.assertEqual([article.title for article in articles],
+                         ['Older', 'Newer', 'Undated'])
+        self.assertEqual(articles[0].created_at.isoformat(),
+                         '2018-09-20T14:12:00+00:00')
+        self.assertEqual(
+            list(TimelineEntry.objects.order_by('-created_at').values_list(
+                'article__title', flat=True)),
+            ['Undated', 'Newer', 'Older'])
+
+    def test_csv_import(self):
+        """Test the command imports CSV with comma separated tags"""
+        content = ('title,description,body,author,tags\n'
+                   'First,description,body,importer,"django, rest"\n'
+                   'Second,description,body,nobody,\n')
+        output = self.import_file('.csv', content, '--no-notify')
+
+        self.assertIn('1 article(s) imported, 1 skipped', output)
+        article = Article.objects.get()
+        self.assertEqual(sorted(article.tags.values_list('tag', flat=True)),
+                         ['django', 'rest'])
+        self.assertFalse(Notification.objects.exists())
+
+    def test_csv_rows_split_tags(self):
+        rows = list(read_csv(StringIO('title,tags\nFirst,\nSecond," a ,b"\n')))
+        self.assertEqual([row['tags'] for row in rows], [[], ['a', 'b']])
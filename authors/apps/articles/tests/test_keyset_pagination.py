@@ -0,0 +1,128 @@
+import json
+
+from django.test import TestCase
+from django.utils import timezone
+from notifications.signals import notify
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, Comment
+from authors.apps.authentication.models import User
+
+
+class KeysetPaginationTestCase(TestCase):
+    """
+    This class defines the test suite for paging the lists with
+    `?pagination=cursor`.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = self.create_user('pager')
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user.token)
+
+    def create_user(self, username):
+        """Creates a verified user"""
+        user = User.objects.create_user(
+            username, '{}@authors.haven'.format(username), 'Secret123456')
+        user.is_verified = True
+        user.save()
+        return user
+
+    def create_articles(self, number):
+        """Creates `number` articles, the last ones sharing a timestamp"""
+        articles = [
+            Article.objects.create(
+                title='Page {}'.format(count), body='body',
+                description='description', author=self.user.profile)
+            for count in range(number)
+        ]
+        Article.objects.filter(pk__in=[a.pk for a in articles[-3:]]).update(
+            created_at=timezone.now())
+        return articles
+
+    def walk(self, url, envelope):
+        """Follows the next links from `url`, returning every page"""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = json.loads(response.content.decode('utf-8'))[envelope]
+            self.assertNotIn('count', page)
+            pages.append(page['results'])
+            url = page['next']
+        return pages
+
+    def test_articles_are_paged_newest_first(self):
+        """Test following the cursors visits every article exactly once"""
+        articles = self.create_articles(7)
+        pages = self.walk(
+            '/api/articles/?pagination=cursor&page_size=2', 'articles')
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+        slugs = [article['slug'] for page in pages for article in page]
+        expected = Article.objects.order_by('-created_at', '-pk')
+        self.assertEqual(slugs, [article.slug for article in expected])
+        self.assertEqual(len(set(slugs)), len(articles))
+
+    def test_page_is_stable_when_articles_are_added(self):
+        """Test a new article doesn't shift the next page"""
+        self.create_articles(4)
+        response = self.client.get(
+            '/api/articles/?pagination=cursor&page_size=2')
+        next_url = response.data['next']
+        before = self.client.get(next_url).data['results']
+
+        self.create_articles(1)
+        after = self.client.get(next_url).data['results']
+        self.assertEqual([a['slug'] for a in before],
+                         [a['slug'] for a in after])
+
+    def test_invalid_cursor(self):
+        """Test a tampered cursor is rejected"""
+        response = self.client.get(
+            '/api/articles/?pagination=cursor&cursor=bm90LWEtY3Vyc29y')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_default_pagination_is_unchanged(self):
+        """Test lists keep their page numbers unless cursors are asked for"""
+        self.create_articles(3)
+        response = self.client.get('/api/articles/')
+        self.assertEqual(response.data['count'], 3)
+
+    def test_comments_are_paged(self):
+        """Test the root comments of an article can be paged by cursor"""
+        article = self.create_articles(1)[0]
+        for count in range(3):
+            Comment.objects.create(body='comment {}'.format(count),
+                                   article=article, author=self.user.profile)
+
+        pages = self.walk(
+            '/api/articles/{}/comments/?pagination=cursor&page_size=2'.format(
+                article.slug), 'articles')
+        bodies = [comment['body'] for page in pages for comment in page]
+        self.assertEqual(bodies, ['comment 2', 'comment 1', 'comment 0'])
+
+    def test_followers_are_paged(self):
+        """Test followers can be paged by cursor"""
+        for count in range(3):
+            self.create_user('follower%d' % count).profile.follow(
+                self.user.profile)
+
+        pages = self.walk(
+            '/api/followers/?pagination=cursor&page_size=2',
+            'followers')
+        self.assertEqual([len(page) for page in pages], [2, 1])
+
+    def test_notifications_are_paged(self):
+        """Test notifications can be paged by cursor"""
+        for count in range(3):
+            notify.send(self.user, recipient=self.user,
+                        verb='notification {}'.format(count))
+
+        pages = self.walk(
+            '/api/notifications/?pagination=cursor&page_size=2',
+            'notifications')
+        verbs = [item['verb'] for page in pages for item in page]
+        self.assertEqual(verbs, ['notification 2', 'notification 1',
+                                 'notification 0'])
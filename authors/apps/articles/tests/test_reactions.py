@@ -0,0 +1,197 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, Comment, Reaction
+from authors.apps.articles.reactions import (ARTICLE, COMMENT, DISLIKE, LIKE,
+                                             toggle_reaction)
+from authors.apps.authentication.models import User
+
+# article and comment lookup + two savepoint pairs, lock and toggle +
+# article version, once the token user is cached
+COMMENT_TOGGLE_QUERIES = 8
+
+
+class ReactionTestCase(TestCase):
+    """
+    This class defines the test suite for the like and dislike toggles of
+    articles and comments.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'reactor', 'reactor@authors.haven', 'Secret123456')
+        self.user.is_verified = True
+        self.user.save()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user.token)
+        self.article = Article.objects.create(
+            title='Reacting', body='body', description='description',
+            author=self.user.profile)
+
+    def test_toggle_responds_with_counters(self):
+        """Test a toggle responds with the counters, not the article"""
+        response = self.client.put('/api/articles/reacting/like/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'slug': 'reacting', 'likes_count': 1, 'dislikes_count': 0,
+            'liked': True, 'disliked': False})
+
+        response = self.client.put('/api/articles/reacting/dislike/')
+        self.assertEqual(response.data, {
+            'slug': 'reacting', 'likes_count': 0, 'dislikes_count': 1,
+            'liked': False, 'disliked': True})
+
+    def reactions(self, target_type=ARTICLE, target_id=None):
+        """Returns the values of the user's reactions to the target"""
+        return list(Reaction.objects.filter(
+            target_type=target_type,
+            target_id=target_id or self.article.pk,
+            user=self.user).values_list('value', flat=True))
+
+    def test_toggle_is_one_statement(self):
+        """Test a toggle costs the lock and one statement"""
+        with self.assertNumQueries(4):
+            toggle_reaction(ARTICLE, self.article.pk, self.user.pk, LIKE)
+        self.assertEqual(self.reactions(), [LIKE])
+
+        with self.assertNumQueries(4):
+            toggle_reaction(ARTICLE, self.article.pk, self.user.pk, LIKE)
+        self.assertEqual(self.reactions(), [])
+
+    def test_toggle_switches_the_reaction(self):
+        """Test switching reactions rewrites the user's one row"""
+        toggle_reaction(ARTICLE, self.article.pk, self.user.pk, LIKE)
+        reactions = toggle_reaction(
+            ARTICLE, self.article.pk, self.user.pk, DISLIKE)
+        self.assertEqual(reactions, {'likes_count': 0, 'dislikes_count': 1,
+                                     'liked': False, 'disliked': True})
+        self.assertEqual(self.reactions(), [DISLIKE])
+
+    def test_toggle_changes_the_article_version(self):
+        """Test a toggle makes cached copies of the article stale"""
+        version = self.article.version
+        toggle_reaction(ARTICLE, self.article.pk, self.user.pk, LIKE)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.version, version + 1)
+
+    def test_toggle_comment_reactions(self):
+        """Test comments are reacted to through the same table"""
+        comment = Comment.objects.create(
+            body='comment', article=self.article, author=self.user.profile)
+        reactions = toggle_reaction(
+            COMMENT, comment.pk, self.user.pk, DISLIKE)
+        self.assertEqual(reactions, {'likes_count': 0, 'dislikes_count': 1,
+                                     'liked': False, 'disliked': True})
+        self.assertEqual(self.reactions(COMMENT, comment.pk), [DISLIKE])
+        self.assertEqual(self.reactions(), [])
+
+    def test_deleting_the_target_deletes_its_reactions(self):
+        """Test reactions are deleted with the article and its comments"""
+        comment = Comment.objects.create(
+            body='comment', article=self.article, author=self.user.profile)
+        toggle_reaction(ARTICLE, self.article.pk, self.user.pk, LIKE)
+        toggle_reaction(COMMENT, comment.pk, self.user.pk, LIKE)
+
+        self.article.delete()
+        self.assertFalse(Reaction.objects.exists())
+
+    def test_toggle_on_a_deleted_target(self):
+        """Test reacting to a deleted article is not found and stores none"""
+        article_id = self.article.pk
+        self.article.delete()
+
+        with self.assertRaises(NotFound):
+            toggle_reaction(ARTICLE, article_id, self.user.pk, LIKE)
+        self.assertFalse(Reaction.objects.exists())
+
+    def test_article_lists_the_reactors(self):
+        """Test the article shows the ids of the users who reacted"""
+        toggle_reaction(ARTICLE, self.article.pk, self.user.pk, DISLIKE)
+        response = self.client.get('/api/articles/reacting/')
+        self.assertEqual(response.data['likes'], [])
+        self.assertEqual(response.data['dislikes'], [self.user.pk])
+
+
+class CommentReactionEndpointTestCase(TestCase):
+    """
+    This class defines the test suite for the like and dislike endpoints of
+    comments.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'commenter', 'commenter@authors.haven', 'Secret123456')
+        self.user.is_verified = True
+        self.user.save()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user.token)
+        self.article = Article.objects.create(
+            title='Threaded', body='body', description='description',
+            author=self.user.profile)
+        self.comment = Comment.objects.create(
+            body='comment', article=self.article, author=self.user.profile)
+        for _ in range(3):
+            Comment.objects.create(
+                body='reply', article=self.article, author=self.user.profile,
+                parent=self.comment)
+
+    def test_toggle_responds_with_counters(self):
+        """Test a toggle responds with the counters, not the thread"""
+        response = self.client.post(
+            '/api/articles/threaded/comments/{}/like/'.format(
+                self.comment.pk))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {
+            'id': self.comment.pk, 'comment_likes': 1, 'comment_dislikes': 0,
+            'liked': True, 'disliked': False})
+
+        response = self.client.post(
+            '/api/articles/threaded/comments/{}/dislike/'.format(
+                self.comment.pk))
+        self.assertEqual(response.data, {
+            'id': self.comment.pk, 'comment_likes': 0, 'comment_dislikes': 1,
+            'liked': False, 'disliked': True})
+
+    def test_toggle_query_count_does_not_grow_with_history(self):
+        """Test a toggle costs the same however many comments were liked"""
+        url = '/api/articles/threaded/comments/{}/like/'.format(
+            self.comment.pk)
+        self.client.post(url)
+        with self.assertNumQueries(COMMENT_TOGGLE_QUERIES):
+            self.client.post(url)
+
+        for reply in self.comment.reply_set.all():
+            toggle_reaction(COMMENT, reply.pk, self.user.pk, LIKE)
+        with self.assertNumQueries(COMMENT_TOGGLE_QUERIES):
+            self.client.post(url)
+
+    def test_toggle_and_article_version_change_together(self):
+        """Test a failed version change rolls the comment toggle back"""
+        url = '/api/articles/threaded/comments/{}/like/'.format(
+            self.comment.pk)
+        with mock.patch('authors.apps.articles.views.bump_version',
+                        side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.client.post(url)
+
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.likes_count, 0)
+        self.assertFalse(Reaction.objects.exists())
+
+    def test_comment_must_be_on_the_article(self):
+        """Test a comment can't be reacted to through another article"""
+        Article.objects.create(
+            title='Elsewhere', body='body', description='description',
+            author=self.user.profile)
+        response = self.client.post(
+            '/api/articles/elsewhere/comments/{}/like/'.format(
+                self.comment.pk))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['detail'],
+                         'A comment with this id does not exist')
+        self.assertFalse(Reaction.objects.exists())
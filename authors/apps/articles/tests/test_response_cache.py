@@ -0,0 +1,138 @@
+import threading
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+
+from authors.apps.articles.models import Article, Comment
+from authors.apps.articles.response_cache import cached_response, response_key
+from authors.apps.authentication.models import User
+
+
+@override_settings(ARTICLE_RESPONSE_CACHE={'TIMEOUT': 60, 'LOCK_TIMEOUT': 1})
+class ResponseCacheTestCase(TestCase):
+    """
+    This class defines the test suite for the cache of anonymous article
+    responses.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'author', 'author@authors.haven', 'Secret123456')
+        self.user.is_verified = True
+        self.user.save()
+        self.article = Article.objects.create(
+            title='Cached', body='body', description='description',
+            author=self.user.profile)
+        self.url = '/api/articles/{}/'.format(self.article.slug)
+
+    def test_anonymous_reads_are_cached(self):
+        """Test repeated anonymous reads skip the database"""
+        for url in ('/api/articles/', '/api/articles/?limit=5'):
+            first = self.client.get(url)
+            with self.assertNumQueries(0):
+                second = self.client.get(url)
+            self.assertEqual(second.status_code, status.HTTP_200_OK)
+            self.assertEqual(second.content, first.content)
+
+    def test_anonymous_article_reads_are_cached(self):
+        """Test repeated anonymous reads only read the article's validators"""
+        first = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_authenticated_reads_are_not_cached(self):
+        """Test a signed in user's responses are made for them"""
+        self.client.get(self.url)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user.token)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(queries), 0)
+
+    def test_changes_invalidate_cached_responses(self):
+        """Test comments, likes and edits are shown straight away"""
+        self.client.get(self.url)
+
+        Comment.objects.create(body='fresh', article=self.article,
+                               author=self.user.profile)
+        self.assertEqual(len(self.client.get(self.url).data['comments']), 1)
+
+        self.user.profile.favorite(self.article)
+        self.assertEqual(self.client.get(self.url).data['favoriteCount'], 1)
+
+        self.article.title = 'Edited'
+        self.article.save()
+        self.assertEqual(self.client.get(self.url).data['title'], 'Edited')
+
+    def test_changes_leave_other_articles_cached(self):
+        """Test a change to an article keeps the others' responses"""
+        other = Article.objects.create(
+            title='Other', body='body', description='description',
+            author=self.user.profile)
+        self.client.get(self.url)
+
+        Comment.objects.create(body='fresh', article=other,
+                               author=self.user.profile)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_changes_not_listed_leave_lists_cached(self):
+        """Test following an author keeps the cached article lists"""
+        follower = User.objects.create_user(
+            'follower', 'follower@authors.haven', 'Secret123456')
+        self.client.get('/api/articles/')
+
+        follower.profile.follow(self.user.profile)
+        with self.assertNumQueries(0):
+            self.client.get('/api/articles/')
+
+    def test_unsuccessful_responses_are_not_cached(self):
+        """Test a missing article can be found once created"""
+        url = '/api/articles/later/'
+        self.assertEqual(self.client.get(url).status_code,
+                         status.HTTP_404_NOT_FOUND)
+        Article.objects.create(title='Later', body='body', slug='later',
+                               description='description',
+                               author=self.user.profile)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    def request(self):
+        return Request(APIRequestFactory().get('/api/articles/'))
+
+    def test_only_one_request_rebuilds_a_response(self):
+        """Test requests wait for the response another one is building"""
+        request = self.request()
+        key = response_key(request, 1)
+        cache.add(key + ':lock', True)
+        threading.Timer(0.1, cache.set, [key, {
+            'data': {'built': 'elsewhere'}, 'headers': {}}]).start()
+
+        builds = []
+        response = cached_response(request, lambda: builds.append(1), 1)
+        self.assertEqual(builds, [])
+        self.assertEqual(response.data, {'built': 'elsewhere'})
+
+    def test_waiting_gives_up_after_the_lock_timeout(self):
+        """Test a response is built when its builder never finishes"""
+        request = self.request()
+        cache.add(response_key(request, 1) + ':lock', True)
+
+        response = cached_response(
+            request, lambda: Response({'built': 1}), 1)
+        self.assertEqual(response.data, {'built': 1})
+        self.assertIsNone(cache.get(response_key(request, 1)))
@@ -0,0 +1,73 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, Tag
+from authors.apps.authentication.models import User
+
+
+class SearchTestCase(TestCase):
+    """
+    This class defines the test suite for the full-text search of articles.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'searcher', 'searcher@authors.haven', 'Secret123456')
+
+    def create_article(self, title, body, description='description'):
+        return Article.objects.create(
+            title=title, body=body, description=description,
+            author=self.user.profile)
+
+    def search(self, query):
+        response = self.client.get('/api/articles?' + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['results']
+
+    def test_results_are_ranked(self):
+        """Test a title match ranks above a body match"""
+        self.create_article('Cooking rice', 'Some words about gardens')
+        self.create_article('Gardens', 'How to plant a garden')
+        self.create_article('Unrelated', 'Nothing to see')
+
+        results = self.search('q=garden')
+        self.assertEqual([article['title'] for article in results],
+                         ['Gardens', 'Cooking rice'])
+
+    def test_results_have_highlighted_snippets(self):
+        """Test each result shows where the body matched"""
+        self.create_article('Gardens', 'How to plant a garden in spring')
+
+        article = self.search('q=garden')[0]
+        self.assertIn('<mark>garden</mark>', article['snippet'])
+        self.assertNotIn('snippet', self.search('title=Gardens')[0])
+
+    def test_search_vector_follows_edits_and_tags(self):
+        """Test edited articles and their tags are searchable"""
+        article = self.create_article('Gardens', 'How to plant')
+        self.assertEqual(self.search('q=tomatoes'), [])
+
+        article.body = 'How to plant tomatoes'
+        article.save()
+        self.assertEqual(len(self.search('q=tomatoes')), 1)
+
+        tag = Tag.objects.create(tag='horticulture', slug='horticulture')
+        article.tags.add(tag)
+        self.assertEqual(len(self.search('q=horticulture')), 1)
+        tag.articles.clear()
+        self.assertEqual(self.search('q=horticulture'), [])
+
+    def test_fuzzy_filters_combine(self):
+        """Test the title and author filters both apply"""
+        self.create_article('Django tips', 'body')
+        other = User.objects.create_user(
+            'another', 'another@authors.haven', 'Secret123456')
+        Article.objects.create(title='Django tricks', body='body',
+                               description='description',
+                               author=other.profile)
+
+        results = self.search('title=Django tips&author=searcher')
+        self.assertEqual([article['title'] for article in results],
+                         ['Django tips'])
@@ -0,0 +1,103 @@
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, Tag
+from authors.apps.articles.slugs import unique_slug
+from authors.apps.articles.tag_relations import resolve_tags
+from authors.apps.authentication.models import User
+
+
+class SlugTestCase(TestCase):
+    """
+    This class defines the test suite for the allocation of unique slugs.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            'writer', 'writer@authors.haven', 'Secret123456')
+
+    def create_article(self, title, **fields):
+        return Article.objects.create(
+            title=title, body='body', description='description',
+            author=self.user.profile, **fields)
+
+    def test_shared_titles_are_numbered(self):
+        """Test articles sharing a title get numbered slugs"""
+        slugs = [self.create_article('Same title').slug for _ in range(3)]
+        self.assertEqual(slugs, ['same-title', 'same-title-1', 'same-title-2'])
+
+    def test_allocation_cost_is_constant(self):
+        """Test a slug costs one query however many articles share a title"""
+        self.create_article('Popular')
+        with self.assertNumQueries(1):
+            self.assertEqual(unique_slug(Article, 'Popular'),
+                             'popular-1')
+
+        # the slug allocated above stays reserved
+        for _ in range(20):
+            self.create_article('Popular')
+        with self.assertNumQueries(1):
+            self.assertEqual(unique_slug(Article, 'Popular'),
+                             'popular-22')
+
+    def test_numbered_titles_do_not_drive_the_numbering(self):
+        """Test a title ending in a number is not taken for a variant"""
+        self.create_article('My post 2018')
+        self.assertEqual(self.create_article('My post').slug, 'my-post')
+        self.assertEqual(self.create_article('My post').slug, 'my-post-1')
+
+    def test_huge_numbers_do_not_break_the_allocation(self):
+        """Test a title ending in a number out of range is harmless"""
+        self.create_article('x 99999999999999999999')
+        self.assertEqual(self.create_article('x').slug, 'x')
+        self.assertEqual(self.create_article('x').slug, 'x-1')
+
+    def test_explicit_slugs_are_skipped(self):
+        """Test a number taken by a slug given explicitly is skipped"""
+        self.create_article('Release', slug='release-1')
+        self.assertEqual(self.create_article('Release').slug, 'release')
+        self.assertEqual(self.create_article('Release').slug, 'release-2')
+
+    def fetch_article_titled(self, title):
+        """Creates an article through the API and fetches it by slug"""
+        self.user.is_verified = True
+        self.user.save()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + self.user.token)
+        response = client.post('/api/articles/', {'article': {
+            'title': title, 'body': 'body', 'description': 'description',
+        }}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return client.get('/api/articles/{}/'.format(response.data['slug']))
+
+    def test_feed_route_is_not_allocated(self):
+        """Test an article titled like the feed route can be fetched"""
+        response = self.fetch_article_titled('Feed')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Feed')
+        self.assertEqual(response.data['slug'], 'feed-1')
+
+    def test_export_route_is_not_allocated(self):
+        """Test an article titled like the export route can be fetched"""
+        response = self.fetch_article_titled('Export')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Export')
+
+    def test_taken_slug_is_reallocated(self):
+        """Test a save losing its slug to a concurrent one is retried"""
+        self.create_article('Racing')
+        with mock.patch('authors.apps.articles.models.unique_slug',
+                        side_effect=['racing', 'racing-1']):
+            article = self.create_article('Racing')
+
+        self.assertEqual(article.slug, 'racing-1')
+        self.assertEqual(Article.objects.filter(title='Racing').count(), 2)
+
+    def test_tags_are_found_by_slug(self):
+        """Test a tag given in another case resolves to the existing one"""
+        tag = Tag.objects.create(tag='Django', slug='django')
+        self.assertEqual(resolve_tags(['django']), {'django': tag})
+        self.assertEqual(Tag.objects.count(), 1)
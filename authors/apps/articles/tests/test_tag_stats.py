@@ -0,0 +1,119 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, Tag
+from authors.apps.articles.tag_stats import record_taggings, trending
+from authors.apps.authentication.models import User
+
+
+class TagStatsTestCase(TestCase):
+    """
+    This class defines the test suite for the popularity statistics of tags.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'tagger', 'tagger@authors.haven', 'Secret123456')
+        self.django = Tag.objects.create(tag='Django', slug='django')
+        self.docker = Tag.objects.create(tag='Docker', slug='docker')
+        self.rest = Tag.objects.create(tag='REST', slug='rest')
+
+    def create_article(self, *tags):
+        article = Article.objects.create(
+            title='Tagged', body='body', description='description',
+            author=self.user.profile)
+        article.tags.add(*tags)
+        return article
+
+    def counts(self):
+        return dict(Tag.objects.values_list('slug', 'articles_count'))
+
+    def test_counts_follow_tag_changes(self):
+        """Test the counts follow every way of tagging and untagging"""
+        first = self.create_article(self.django, self.rest)
+        second = self.create_article(self.django)
+        self.docker.articles.add(first, second)
+        self.assertEqual(self.counts(),
+                         {'django': 2, 'docker': 2, 'rest': 1})
+
+        first.tags.remove(self.rest, self.docker)
+        first.tags.remove(self.rest)
+        self.docker.articles.clear()
+        second.tags.set([self.rest])
+        self.assertEqual(self.counts(),
+                         {'django': 1, 'docker': 0, 'rest': 1})
+
+        first.delete()
+        self.assertEqual(self.counts(),
+                         {'django': 0, 'docker': 0, 'rest': 1})
+
+    def test_trending_score_decays(self):
+        """Test recent additions outweigh more numerous older ones"""
+        now = timezone.now()
+        record_taggings({self.django.pk: 3}, when=now - timedelta(days=21))
+        record_taggings({self.docker.pk: 1}, when=now)
+        record_taggings({self.docker.pk: 1}, when=now)
+
+        django = Tag.objects.get(pk=self.django.pk)
+        docker = Tag.objects.get(pk=self.docker.pk)
+        self.assertAlmostEqual(trending(django.trending_score, now), 3 / 8)
+        self.assertAlmostEqual(trending(docker.trending_score, now), 2)
+        self.assertGreater(docker.trending_score, django.trending_score)
+
+    def test_top_tags(self):
+        """Test the top tags are ordered by count or trending score"""
+        for _ in range(3):
+            self.create_article(self.django)
+        Tag.objects.filter(pk=self.django.pk).update(trending_score=0)
+        self.create_article(self.docker)
+
+        response = self.client.get('/api/tags/top/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([(tag['slug'], tag['articles_count'])
+                          for tag in response.data['tags']],
+                         [('django', 3), ('docker', 1)])
+
+        response = self.client.get('/api/tags/top/?order=trending&limit=1')
+        self.assertEqual([tag['slug'] for tag in response.data['tags']],
+                         ['docker'])
+        self.assertEqual(response.data['tags'][0]['trending'], 1)
+
+        for query in ('order=alphabetical', 'limit=many'):
+            response = self.client.get('/api/tags/top/?' + query)
+            self.assertEqual(response.status_code,
+                             status.HTTP_400_BAD_REQUEST)
+
+    def test_autocomplete(self):
+        """Test tags are completed from a prefix in any case"""
+        self.create_article(self.docker)
+        response = self.client.get('/api/tags/autocomplete/?q=DO')
+        self.assertEqual([tag['tag'] for tag in response.data['tags']],
+                         ['Docker'])
+        response = self.client.get('/api/tags/autocomplete/?q=')
+        self.assertEqual(response.data['tags'], [])
+
+    @override_settings(TAG_STATS={'CACHE_TIMEOUT': 60})
+    def test_lists_are_cached(self):
+        """Test a cached list is served without a query"""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.create_article(self.django)
+        first = self.client.get('/api/tags/top/').data
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/tags/top/').data, first)
+
+    def test_reconcile_counters_rebuilds_counts(self):
+        """Test drifted tag counts are rebuilt"""
+        self.create_article(self.django)
+        Tag.objects.update(articles_count=7)
+        call_command('reconcile_counters', stdout=StringIO())
+        self.assertEqual(self.counts(),
+                         {'django': 1, 'docker': 0, 'rest': 0})
@@ -1,5 +1,7 @@
 import json
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -7,7 +9,8 @@ from rest_framework.test import APIRequestFactory
 from rest_framework.test import force_authenticate
 
 from authors.apps.authentication.models import User
-from authors.apps.articles.models import Article
+from authors.apps.articles.models import Article, Tag
+from authors.apps.articles.tag_relations import insert_tags, resolve_tags
 from authors.apps.authentication.verification import SendEmail
 from authors.apps.authentication.views import Activate
 
@@ -141,3 +144,76 @@ class TestTags(TestCase):
         response = response = self.create_article(
             self.login_verified_user(self.user_data), self.tag_tuple)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TagResolutionTestCase(TestCase):
+    """
+    This class defines the test suite for resolving the tags of an article
+    as a set.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'tagger', 'tagger@authors.haven', 'Secret123456')
+        self.user.is_verified = True
+        self.user.save()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user.token)
+
+    def create_article(self, tags):
+        return self.client.post('/api/articles/', {'article': {
+            'title': 'Tagged', 'description': 'description', 'body': 'body',
+            'tagList': tags}}, format='json')
+
+    def test_tags_are_normalised(self):
+        """Test tags differing in case and spacing resolve to one tag"""
+        Tag.objects.create(tag='Machine learning', slug='machine learning')
+        response = self.create_article(
+            ['  machine   Learning ', 'Django', 'django', 'REST'])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(sorted(response.data['tagList']),
+                         ['Django', 'Machine learning', 'REST'])
+        self.assertEqual(Tag.objects.count(), 3)
+
+    def test_invalid_tags_are_rejected(self):
+        """Test blank, overlong and non-string tags are bad requests"""
+        for tags in (['  '], ['a' * 51], [{'tag': 'django'}]):
+            response = self.create_article(tags)
+            self.assertEqual(response.status_code,
+                             status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Tag.objects.exists())
+
+    def test_tag_count_does_not_change_query_count(self):
+        """Test resolving tags costs the same queries for 2 and 20 tags"""
+        for tags in (['old 1', 'old 2'],
+                     ['old %d' % number for number in range(20)]):
+            with CaptureQueriesContext(connection) as queries:
+                resolve_tags(tags + ['new %d' % len(tags)])
+            self.assertEqual(len(queries), 2)
+        with self.assertNumQueries(1):
+            resolve_tags(['old 1', 'Old 2'])
+
+    def test_inserted_tags_match_their_rows(self):
+        """Test new tags come back as they were saved"""
+        tag = insert_tags([('new', 'New')])['new']
+        saved = Tag.objects.get(slug='new')
+        for field in Tag._meta.concrete_fields:
+            self.assertEqual(getattr(tag, field.attname),
+                             getattr(saved, field.attname))
+        self.assertEqual((tag.tag, tag.articles_count, tag.trending_score),
+                         ('New', 0, 0))
+
+    def test_update_replaces_tags(self):
+        """Test updating an article sets its tags to the given ones"""
+        slug = self.create_article(['django', 'rest']).data['slug']
+        response = self.client.put(
+            '/api/articles/{}/'.format(slug),
+            {'article': {'title': 'Tagged', 'description': 'description',
+                         'body': 'body', 'tagList': ['rest', 'python']}},
+            format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        article = Article.objects.get(slug=slug)
+        self.assertEqual(sorted(article.tags.values_list('tag', flat=True)),
+                         ['python', 'rest'])
@@ -0,0 +1,200 @@
+"""
+Module contains helpers for serializing comment threads without a query
+per comment. Threads are loaded a bounded number of levels deep and a
+bounded number of replies wide; comments with more replies than were
+loaded carry a cursor to fetch the next slice of them.
+"""
+import base64
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import NotFound
+
+from authors.apps.core.pagination import KeysetPagination
+
+DEFAULT_SETTINGS = {
+    # Levels of replies loaded below a comment, None loading all of them.
+    # Clients may ask for fewer with `?depth=`.
+    'MAX_DEPTH': 5,
+    # Replies loaded per comment, either one limit for every level or a
+    # sequence of limits per level with the last one applying further down
+    'REPLY_LIMIT': 10,
+}
+DEPTH_QUERY_PARAM = 'depth'
+
+
+def get_setting(name):
+    options = dict(DEFAULT_SETTINGS)
+    options.update(getattr(settings, 'COMMENT_THREADS', {}))
+    return options[name]
+
+
+def attach_reply_sets(comments):
+    """
+    Fills the `reply_set` prefetch cache of every comment in `comments`
+    from the list itself. `comments` must hold whole threads, as the
+    `comments` of an article do, for the nested replies to be complete.
+    """
+    children = defaultdict(list)
+    for comment in comments:
+        children[comment.parent_id].append(comment)
+
+    for comment in comments:
+        set_replies(comment, children[comment.pk])
+
+    return comments
+
+
+def set_replies(comment, replies):
+    """Makes `replies` the `reply_set` of `comment` without a query"""
+    queryset = comment.reply_set.all()
+    queryset._result_cache = replies
+    queryset._prefetch_done = True
+    if not hasattr(comment, '_prefetched_objects_cache'):
+        comment._prefetched_objects_cache = {}
+    comment._prefetched_objects_cache['reply_set'] = queryset
+
+
+def requested_depth(request):
+    """
+    Returns the levels of replies to load for `request`, at most the
+    configured maximum
+    """
+    max_depth = get_setting('MAX_DEPTH')
+    try:
+        depth = max(int(request.query_params[DEPTH_QUERY_PARAM]), 0)
+    except (KeyError, ValueError):
+        return max_depth
+    return depth if max_depth is None else min(depth, max_depth)
+
+
+def encode_reply_cursor(pk):
+    """
+    Returns the cursor of the replies loaded after the reply with `pk`, 0
+    standing for the first reply
+    """
+    return base64.urlsafe_b64encode(str(pk).encode('ascii')).decode('ascii')
+
+
+def decode_reply_cursor(cursor):
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (TypeError, ValueError, UnicodeError):
+        raise NotFound(KeysetPagination.invalid_cursor_message)
+
+
+def thread_ids(Comment, comments, max_depth, reply_limit):
+    """
+    Returns an expression of the ids of the replies loaded below
+    `comments`. Only the first replies of a comment by id, which is their
+    thread order, within the limit of their depth are read and looked
+    below, so the replies left out are never read.
+    """
+    params = [[comment.pk for comment in comments]]
+    limit = ''
+    if reply_limit is not None:
+        # one limit per level, the last one applying further down
+        limits = [reply_limit] if isinstance(reply_limit, int) \
+            else list(reply_limit)
+        limit = 'LIMIT (%s::integer[])[least(thread.depth + 1, %s)]'
+        params.extend([limits, len(limits)])
+    depth = ''
+    if max_depth is not None:
+        depth = 'WHERE thread.depth < %s'
+        params.append(max_depth)
+
+    return RawSQL(
+        'WITH RECURSIVE thread (id, depth) AS ('
+        'SELECT id, 0 FROM {table} WHERE id = ANY(%s) '
+        'UNION ALL '
+        'SELECT reply.id, thread.depth + 1 FROM thread, LATERAL ('
+        'SELECT id FROM {table} WHERE parent_id = thread.id '
+        'ORDER BY id {limit}) AS reply {depth}) '
+        'SELECT id FROM thread WHERE depth > 0'.format(
+            table=Comment._meta.db_table, limit=limit, depth=depth),
+        params)
+
+
+def load_threads(comments, max_depth=None, reply_limit=None):
+    """
+    Loads the replies of every comment in `comments` with one query and
+    fills the `reply_set` prefetch caches from it.
+
+    Replies more than `max_depth` levels below a comment are left out, and
+    so are the replies beyond `reply_limit` of each comment (see
+    `REPLY_LIMIT`), with the replies below them. The denormalized
+    `replies_count` still tells how many replies a comment has.
+    """
+    comments = list(comments)
+    if not comments:
+        return comments
+    if max_depth is None:
+        max_depth = get_setting('MAX_DEPTH')
+    if reply_limit is None:
+        reply_limit = get_setting('REPLY_LIMIT')
+
+    Comment = comments[0].__class__
+    descendants = Comment.objects.filter(
+        pk__in=thread_ids(Comment, comments, max_depth, reply_limit)
+    ).select_related('author', 'author__user').order_by('tree_id', 'lft')
+
+    children = defaultdict(list)
+    for reply in descendants:
+        children[reply.parent_id].append(reply)
+
+    for comment in comments:
+        attach_loaded(comment, children)
+    return comments
+
+
+def attach_loaded(comment, children):
+    """
+    Fills the `reply_set` caches of `comment` and its loaded replies, and
+    sets the `next_replies_cursor` of those with replies left to load
+    """
+    stack = [comment]
+    while stack:
+        node = stack.pop()
+        replies = children.get(node.pk, [])
+        set_replies(node, replies)
+        node.next_replies_cursor = None
+        if node.replies_count > len(replies):
+            node.next_replies_cursor = encode_reply_cursor(
+                replies[-1].pk if replies else 0)
+        stack.extend(replies)
+
+
+def author_ids(comments):
+    """Returns the ids of the authors of `comments` and their loaded replies"""
+    ids = set()
+    stack = list(comments)
+    while stack:
+        comment = stack.pop()
+        ids.add(comment.author_id)
+        stack.extend(comment.reply_set.all())
+    return ids
+
+
+class ReplyPagination(KeysetPagination):
+    """
+    Pages through the replies to a comment in thread order. Replies are
+    always appended to their parent, so the thread order is the order of
+    their ids, which stays stable as replies are added below them.
+    """
+    key_field = 'pk'
+
+    def seek(self, queryset, position, key_field=None, pk_field='pk'):
+        queryset = queryset.order_by('tree_id', 'lft')
+        if position is None:
+            return queryset
+        return queryset.filter(pk__gt=position)
+
+    def encode_cursor(self, key, pk):
+        return encode_reply_cursor(pk)
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        return decode_reply_cursor(cursor)
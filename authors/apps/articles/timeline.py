@@ -0,0 +1,154 @@
+"""
+Module contains the materialized feeds. A new article is written to the
+timeline of each follower of its author, unless the author has so many
+followers that their articles are read from the articles table when a feed
+is read instead.
+"""
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+
+from authors.apps.core.pagination import KeysetPagination
+from authors.apps.profiles.models import Profile
+
+DEFAULT_SETTINGS = {
+    # Number of articles kept in each timeline
+    'MAX_LENGTH': 500,
+    # Authors with more followers than this are not written to timelines
+    'FANOUT_ON_READ_THRESHOLD': 1000,
+}
+
+
+def get_setting(name):
+    options = dict(DEFAULT_SETTINGS)
+    options.update(getattr(settings, 'TIMELINE', {}))
+    return options[name]
+
+
+def is_read_on_demand(author):
+    """Returns True when the articles of `author` skip the timelines"""
+    return author.followers_count > get_setting('FANOUT_ON_READ_THRESHOLD')
+
+
+def tables():
+    TimelineEntry = apps.get_model('articles.TimelineEntry')
+    Article = apps.get_model('articles.Article')
+    return {
+        'timeline': TimelineEntry._meta.db_table,
+        'articles': Article._meta.db_table,
+        'follows': Profile.follows.through._meta.db_table,
+    }
+
+
+def push_article(article):
+    """Writes a new article to the timelines of its author's followers"""
+    push_articles([article])
+
+
+def push_articles(articles):
+    """
+    Writes new articles to the timelines of their authors' followers in one
+    statement, then trims the timelines written to
+    """
+    article_ids = [article.pk for article in articles
+                   if not is_read_on_demand(article.author)]
+    if not article_ids:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO {timeline} (owner_id, article_id, created_at) '
+            'SELECT follows.from_profile_id, articles.id, articles.created_at '
+            'FROM {articles} AS articles JOIN {follows} AS follows '
+            'ON follows.to_profile_id = articles.author_id '
+            'WHERE articles.id = ANY(%s) '
+            'ON CONFLICT DO NOTHING RETURNING owner_id'.format(**tables()),
+            [article_ids])
+        owner_ids = {owner_id for owner_id, in cursor.fetchall()}
+    trim(owner_ids)
+
+
+def add_author(owner_id, author):
+    """
+    Writes the latest articles of a newly followed author to the timeline
+    of the profile with `owner_id`
+    """
+    if is_read_on_demand(author):
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO {timeline} (owner_id, article_id, created_at) '
+            'SELECT %s, id, created_at FROM {articles} '
+            'WHERE author_id = %s '
+            'ORDER BY created_at DESC, id DESC LIMIT %s '
+            'ON CONFLICT DO NOTHING'.format(**tables()),
+            [owner_id, author.pk, get_setting('MAX_LENGTH')])
+    trim([owner_id])
+
+
+def remove_author(owner_id, author_id):
+    """
+    Removes the articles of an unfollowed author from the timeline of the
+    profile with `owner_id`
+    """
+    TimelineEntry = apps.get_model('articles.TimelineEntry')
+    TimelineEntry.objects.filter(
+        owner_id=owner_id, article__author_id=author_id).delete()
+
+
+def trim(owner_ids):
+    """
+    Deletes the entries beyond the maximum length from the timelines of the
+    profiles with `owner_ids`. Returns the number of entries deleted.
+
+    The first entry past the maximum length of each timeline is found on
+    the timelines' index, and the entries from it on are deleted, so a
+    timeline within its length costs a single index lookup.
+    """
+    if not owner_ids:
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM {timeline} AS timeline USING ('
+            'SELECT owners.id AS owner_id, first.created_at, first.article_id '
+            'FROM unnest(%s::integer[]) AS owners (id), LATERAL ('
+            'SELECT created_at, article_id FROM {timeline} '
+            'WHERE owner_id = owners.id '
+            'ORDER BY created_at DESC, article_id DESC OFFSET %s LIMIT 1'
+            ') AS first) AS trimmed '
+            'WHERE timeline.owner_id = trimmed.owner_id '
+            'AND (timeline.created_at, timeline.article_id) '
+            '<= (trimmed.created_at, trimmed.article_id)'.format(**tables()),
+            [list(owner_ids), get_setting('MAX_LENGTH')])
+        return cursor.rowcount
+
+
+class FeedPagination(KeysetPagination):
+    """
+    Pages through a profile's feed newest first: their timeline merged with
+    the articles of the followed authors that are read on demand
+    """
+
+    def paginate_feed(self, profile, request):
+        """Returns the ids of the articles on the requested page"""
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        timeline = self.seek(profile.timeline.all(), position,
+                             pk_field='article_id')
+        rows = set(timeline.values_list(
+            'created_at', 'article_id')[:page_size + 1])
+
+        popular = apps.get_model('articles.Article').objects.filter(
+            author__in=profile.follows.filter(
+                followers_count__gt=get_setting('FANOUT_ON_READ_THRESHOLD')))
+        rows.update(self.seek(popular, position).values_list(
+            'created_at', 'id')[:page_size + 1])
+
+        rows = sorted(rows, reverse=True)
+        self.page = rows[:page_size]
+        self.next_position = self.page[-1] if len(rows) > page_size else None
+        return [article_id for _, article_id in self.page]
@@ -1,11 +1,14 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 from .views import (ArticleViewSet, CommentEditHistoryAPIView,
-                    CommentsDestroyGetCreateAPIView, CommentsListCreateAPIView,
+                    CommentRepliesAPIView, CommentsDestroyGetCreateAPIView,
+                    CommentsListCreateAPIView,
                     DislikeCommentLikesAPIView, DislikesAPIView,
                     FavoriteAPIView, FilterAPIView, LikeCommentLikesAPIView,
                     LikesAPIView, NotificationViewset, RateAPIView,
-                    ReadAllNotificationViewset, TagListAPIView, BookmarkAPIView)
+                    RatingDistributionAPIView,
+                    ReadAllNotificationViewset, TagAutocompleteAPIView,
+                    TagListAPIView, TopTagsAPIView, BookmarkAPIView)
 
 app_name = "articles"
 
@@ -15,13 +18,19 @@ router.register('articles', ArticleViewSet, base_name='articles')
 urlpatterns = [
     path('', include(router.urls)),
     path('articles/<slug>/rate/', RateAPIView.as_view()),
+    path('articles/<slug>/rate/distribution/',
+         RatingDistributionAPIView.as_view()),
     path('articles/<article_slug>/comments/',
          CommentsListCreateAPIView.as_view()),
     path('articles/<article_slug>/comments/<comment_pk>/',
          CommentsDestroyGetCreateAPIView.as_view(), name="comment"),
+    path('articles/<article_slug>/comments/<comment_pk>/replies/',
+         CommentRepliesAPIView.as_view(), name="comment_replies"),
     path('articles/<slug>/like/', LikesAPIView.as_view()),
     path('articles/<slug>/dislike/', DislikesAPIView.as_view()),
     path('tags/', TagListAPIView.as_view()),
+    path('tags/top/', TopTagsAPIView.as_view()),
+    path('tags/autocomplete/', TagAutocompleteAPIView.as_view()),
     path('articles/<slug>/favorite/', FavoriteAPIView.as_view()),
     path('notifications/', NotificationViewset.as_view({'get': 'list'})),
     path('notifications/<id>/read/',
@@ -1,9 +1,14 @@
-from django.conf import settings
-from django.contrib.postgres.search import TrigramSimilarity
-from django.db.models import Avg, Count
+from django.contrib.postgres.search import SearchRank, TrigramSimilarity
+from django.db import transaction
+from django.db.models import (Count, DateTimeField, F, FloatField,
+                              IntegerField, Max, OuterRef, Subquery, Sum)
+from django.db.models.functions import Greatest
+from django.http import StreamingHttpResponse
 from notifications.models import Notification
 from rest_framework import generics, mixins, status, viewsets
-from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.decorators import action
+from rest_framework.exceptions import (NotFound, PermissionDenied,
+                                       ValidationError)
 from rest_framework.generics import (CreateAPIView, ListAPIView,
                                      RetrieveUpdateDestroyAPIView)
 from rest_framework.pagination import PageNumberPagination
@@ -11,15 +16,33 @@ from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from authors.apps.core.conditional import (make_etag, not_modified,
+                                           set_validators, viewer_version)
+from authors.apps.core.counters import bump_version, link, unlink
+from authors.apps.core.pagination import (KeysetPagination,
+                                          KeysetPaginationMixin,
+                                          uses_keyset_pagination)
+from authors.apps.core.renderers import NDJSONRenderer
+from .export import (RELATIONS, articles_to_export, export_articles,
+                     export_lines, parse_timestamp)
 from .models import Article, Comment, CommentEditHistory, Ratings, Tag, Bookmarks
 from .renderers import (ArticleJSONRenderer, CommentEditHistoryJSONRenderer,
                         CommentJSONRenderer, CommentLikeJSONRenderer,
                         FavoriteJSONRenderer, NotificationJSONRenderer,
                         RatingJSONRenderer, BookmarkJSONRenderer)
-from .serializers import (ArticleSerializer, CommentEditHistorySerializer,
+from .serializers import (ArticleSerializer, ArticleSummarySerializer,
+                          CommentEditHistorySerializer,
                           CommentSerializer, NotificationSerializer,
                           RatingSerializer, TagSerializer,
                           UpdateCommentSerializer)
+from .reactions import ARTICLE, COMMENT, DISLIKE, LIKE, toggle_reaction
+from .response_cache import cached_response, is_cacheable, list_generation
+from .search import headline, search_query
+from .tag_relations import tag_slug
+from .tag_stats import ORDERINGS, complete_tag, top_limit, top_tags
+from .threads import (ReplyPagination, attach_reply_sets, author_ids,
+                      load_threads, requested_depth)
+from .timeline import FeedPagination
 
 
 class LargeResultsSetPagination(PageNumberPagination):
@@ -31,7 +54,78 @@ class LargeResultsSetPagination(PageNumberPagination):
     max_page_size = 10
 
 
-class ArticleViewSet(mixins.CreateModelMixin,
+class NotificationKeysetPagination(KeysetPagination):
+    """
+    Pages through notifications newest first on their timestamp
+    """
+    key_field = 'timestamp'
+
+
+def wants_summary(request):
+    """
+    Returns True when the client asked for the compact article
+    representation with `?view=summary`
+    """
+    return request.query_params.get('view') == 'summary'
+
+
+def commenter_validators():
+    """
+    Returns the annotations of an article with what changes along with the
+    profiles of its commenters, which the article embeds: the sum of their
+    versions, which only grow, and their latest update
+    """
+    comments = Comment.objects.filter(
+        article=OuterRef('pk')).order_by().values('article')
+    return {
+        'commenters_version': Subquery(
+            comments.annotate(total=Sum('author__version')).values('total'),
+            output_field=IntegerField()),
+        'commenters_updated_at': Subquery(
+            comments.annotate(latest=Greatest(
+                Max('author__updated_at'), Max('author__user__updated_at'))
+            ).values('latest'), output_field=DateTimeField()),
+    }
+
+
+def get_listing_context(request, articles):
+    """
+    Returns the serializer context for a list of articles loaded through
+    `Article.objects.with_engagement`, wiring up the comment threads and
+    loading which of the authors on the list the user follows in one query
+    """
+    context = {'request': request}
+    authors = set()
+    for article in articles:
+        attach_reply_sets(article.comments.all())
+        authors.add(article.author_id)
+        authors.update(comment.author_id for comment in article.comments.all())
+
+    if request.user.is_authenticated:
+        context['following'] = set(
+            request.user.profile.follows.filter(
+                pk__in=authors).values_list('pk', flat=True)
+        )
+    return context
+
+
+def get_thread_context(request, comments):
+    """
+    Returns the serializer context for comment threads loaded through
+    `load_threads`, loading which of their authors the user follows in one
+    query
+    """
+    context = {'request': request}
+    if request.user.is_authenticated:
+        context['following'] = set(
+            request.user.profile.follows.filter(
+                pk__in=author_ids(comments)).values_list('pk', flat=True)
+        )
+    return context
+
+
+class ArticleViewSet(KeysetPaginationMixin,
+                     mixins.CreateModelMixin,
                      mixins.ListModelMixin,
                      mixins.RetrieveModelMixin,
                      viewsets.GenericViewSet):
@@ -42,9 +136,7 @@ class ArticleViewSet(mixins.CreateModelMixin,
     `.serializer_class` attributes.
     """
     lookup_field = 'slug'
-    queryset = Article.objects.annotate(
-        average_rating=Avg("rating__stars")
-    )
+    queryset = Article.objects.select_related('author__user')
     permission_classes = (IsAuthenticatedOrReadOnly, )
     renderer_classes = (ArticleJSONRenderer, )
     serializer_class = ArticleSerializer
@@ -63,36 +155,140 @@ class ArticleViewSet(mixins.CreateModelMixin,
 
     def list(self, request):
         """
-        Overrides the list method to get all articles
+        Overrides the list method to get all articles.
+
+        A page costs the same number of queries whatever its size: a count
+        and a select for the page, one per prefetch of
+        `Article.objects.with_engagement` and, for an authenticated user,
+        one for their profile and one for the authors they follow.
+
+        With `?view=summary` the articles are serialized without their body,
+        comments and like lists, which costs a count, a select for the page
+        and one query for the tags.
+
+        With `?pagination=cursor` the articles are paged newest first on
+        their creation time, which saves the count.
+
+        Pages served to anonymous users are cached, see `response_cache`.
+        """
+        if is_cacheable(request):
+            return cached_response(request, lambda: self.build_list(request),
+                                   list_generation())
+        return self.build_list(request)
+
+    def build_list(self, request):
+        page = self.paginate_queryset(self.get_listing_queryset(request))
+        serializer = self.get_listing_serializer(request, page)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, permission_classes=(IsAuthenticated, ))
+    def feed(self, request):
         """
-        queryset = Article.objects.all()
-        serializer_context = {'request': request}
-        page = self.paginate_queryset(queryset)
-        serializer = self.serializer_class(
-            page,
-            context=serializer_context,
-            many=True
-        )
-        output = self.get_paginated_response(serializer.data)
-        return output
+        Lists the articles of the authors the user follows, newest first and
+        paged by cursor.
+
+        The page is read from the user's timeline plus the articles of the
+        followed authors too popular to be written to timelines, then
+        loaded like a page of the article list.
+        """
+        paginator = FeedPagination()
+        article_ids = paginator.paginate_feed(request.user.profile, request)
+        articles = self.get_listing_queryset(request).in_bulk(article_ids)
+        page = [articles[pk] for pk in article_ids if pk in articles]
+        serializer = self.get_listing_serializer(request, page)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=False, permission_classes=(IsAuthenticated, ),
+            renderer_classes=(NDJSONRenderer, ))
+    def export(self, request):
+        """
+        Streams every article as a line of JSON, with `?include=` any of
+        tags, ratings and comments, for a full dump. `?updated_since=` and
+        `?updated_before=` limit the dump to the articles updated in that
+        time for incremental syncs.
+        """
+        try:
+            articles = articles_to_export(
+                parse_timestamp(request.query_params.get('updated_since'),
+                                'updated_since'),
+                parse_timestamp(request.query_params.get('updated_before'),
+                                'updated_before'))
+        except ValueError as error:
+            raise ValidationError(str(error))
+        include = [relation for relation in
+                   request.query_params.get('include', '').split(',')
+                   if relation in RELATIONS]
+
+        return StreamingHttpResponse(
+            export_lines(export_articles(articles, include)),
+            content_type=NDJSONRenderer.media_type)
+
+    def get_listing_queryset(self, request):
+        """
+        Returns the articles with what their listing serializer needs
+        """
+        if wants_summary(request):
+            return Article.objects.with_counts(request.user)
+        return Article.objects.with_engagement(request.user)
+
+    def get_listing_serializer(self, request, page):
+        """
+        Returns the serializer of a page of articles, compact with
+        `?view=summary`
+        """
+        if wants_summary(request):
+            return ArticleSummarySerializer(
+                page, context={'request': request}, many=True)
+        return self.serializer_class(
+            page, context=get_listing_context(request, page), many=True)
 
     def retrieve(self, request, slug):
         """
         Override the retrieve method to get a article
+
+        Articles served to anonymous users are cached under their ETag, see
+        `response_cache`.
         """
-        serializer_context = {'request': request}
+        # The validators are read from the article and the profiles it
+        # embeds alone, so an unchanged article is answered before it is
+        # loaded in full
+        validators = Article.objects.filter(slug=slug).annotate(
+            viewer_version=viewer_version(request), **commenter_validators()
+        ).values_list('pk', 'version', 'updated_at', 'author__version',
+                      'author__updated_at', 'author__user__updated_at',
+                      'viewer_version', 'commenters_version',
+                      'commenters_updated_at').first()
+        if validators is None:
+            raise NotFound("An article with this slug doesn't exist")
+        etag = make_etag('article', request.user.pk, *validators)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        if is_cacheable(request):
+            return cached_response(
+                request, lambda: self.build_article(request, slug, etag,
+                                                    validators),
+                etag.strip('"'))
+        return self.build_article(request, slug, etag, validators)
+
+    def build_article(self, request, slug, etag, validators):
         try:
-            serializer_instance = self.queryset.get(slug=slug)
+            serializer_instance = Article.objects.with_engagement(
+                request.user).get(slug=slug)
         except Article.DoesNotExist:
             raise NotFound("An article with this slug doesn't exist")
 
         serializer = self.serializer_class(
             serializer_instance,
-            context=serializer_context
-
+            context=get_listing_context(request, [serializer_instance])
         )
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        modified = [validators[2], validators[4], validators[5],
+                    validators[8]]
+        return set_validators(
+            Response(serializer.data, status=status.HTTP_200_OK), etag,
+            last_modified=max(when for when in modified if when is not None))
 
     def update(self, request, slug):
         """
@@ -118,6 +314,7 @@ class ArticleViewSet(mixins.CreateModelMixin,
         )
 
         serializer.is_valid(raise_exception=True)
+        serializer.save()
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -169,27 +366,55 @@ class RateAPIView(APIView):
         ratings = Ratings.objects.filter(rater=request.user.profile,
                                          article=article).first()
         if not ratings:
-            ratings = Ratings(
-                article=article,
-                rater=request.user.profile,
-                stars=rating)
-            ratings.save()
-            avg = Ratings.objects.filter(
-                article=article).aggregate(Avg('stars'))
-            return Response({
-                "avg": avg
-            }, status=status.HTTP_201_CREATED)
+            with transaction.atomic():
+                ratings = Ratings(
+                    article=article,
+                    rater=request.user.profile,
+                    stars=rating)
+                ratings.save()
+            return self.average_response(article)
 
         if ratings.counter >= 5:
             raise PermissionDenied(
                 "You are not allowed to rate this article more than 5 times."
             )
 
-        ratings.counter += 1
-        ratings.stars = rating
-        ratings.save()
-        avg = Ratings.objects.filter(article=article).aggregate(Avg('stars'))
-        return Response({"avg": avg}, status=status.HTTP_201_CREATED)
+        with transaction.atomic():
+            ratings.counter += 1
+            ratings.stars = rating
+            ratings.save()
+        return self.average_response(article)
+
+    def average_response(self, article):
+        """
+        Returns the article's average rating, read from the aggregate the
+        rating has just been applied to
+        """
+        article.refresh_from_db(fields=['rating_sum', 'rating_count'])
+        return Response({
+            "avg": {"stars__avg": article.average_rating}
+        }, status=status.HTTP_201_CREATED)
+
+
+class RatingDistributionAPIView(APIView):
+    permission_classes = (AllowAny,)
+    renderer_classes = (RatingJSONRenderer,)
+
+    def get(self, request, slug):
+        """
+        Method that returns how many ratings an article got with each
+        number of stars
+        """
+        try:
+            article = Article.objects.get(slug=slug)
+        except Article.DoesNotExist:
+            raise NotFound("An article with this slug does not exist")
+
+        return Response({
+            "average": article.average_rating,
+            "count": article.rating_count,
+            "distribution": article.rating_distribution
+        }, status=status.HTTP_200_OK)
 
 
 class FavoriteAPIView(APIView):
@@ -237,7 +462,8 @@ class FavoriteAPIView(APIView):
         return Response(serializer.data,  status=status.HTTP_200_OK)
 
 
-class CommentsListCreateAPIView(generics.ListCreateAPIView):
+class CommentsListCreateAPIView(KeysetPaginationMixin,
+                                generics.ListCreateAPIView):
     lookup_field = 'article__slug'
     lookup_url_kwarg = 'article_slug'
     permission_classes = (IsAuthenticatedOrReadOnly,)
@@ -256,6 +482,18 @@ class CommentsListCreateAPIView(generics.ListCreateAPIView):
 
         return queryset.filter(**filters)
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        comments = load_threads(queryset if page is None else page,
+                                max_depth=requested_depth(request))
+        serializer = self.serializer_class(
+            comments, many=True, context=get_thread_context(request, comments))
+
+        if page is None:
+            return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
+
     def create(self, request, article_slug=None):
         data = request.data.get('comment', {})
         context = {'author': request.user.profile}
@@ -278,9 +516,16 @@ class CommentsDestroyGetCreateAPIView(
 ):
     lookup_url_kwarg = 'comment_pk'
     permission_classes = (IsAuthenticatedOrReadOnly,)
-    queryset = Comment.objects.all()
+    queryset = Comment.objects.select_related('author', 'author__user')
     serializer_class = CommentSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        comments = load_threads([self.get_object()],
+                                max_depth=requested_depth(request))
+        serializer = self.serializer_class(
+            comments[0], context=get_thread_context(request, comments))
+        return Response(serializer.data)
+
     def destroy(self, request, article_slug=None, comment_pk=None):
         try:
             comment = Comment.objects.get(pk=comment_pk,)
@@ -340,6 +585,37 @@ class CommentsDestroyGetCreateAPIView(
         )
 
 
+class CommentRepliesAPIView(generics.ListAPIView):
+    """
+    Lists the next slice of replies to a comment, each with its own thread
+    of replies, starting after the `next_replies_cursor` of the comment
+    """
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = ReplyPagination
+    renderer_classes = (CommentJSONRenderer,)
+    serializer_class = CommentSerializer
+
+    def get_queryset(self):
+        try:
+            parent = Comment.objects.get(
+                pk=self.kwargs['comment_pk'],
+                article__slug=self.kwargs['article_slug'])
+        except (Comment.DoesNotExist, ValueError):
+            raise NotFound('A comment with this id does not exists')
+        return parent.get_children().select_related('author', 'author__user')
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        # The depth counts from the comment, one level above the replies
+        max_depth = requested_depth(request)
+        if max_depth is not None:
+            max_depth = max(max_depth - 1, 0)
+        comments = load_threads(page, max_depth=max_depth)
+        serializer = self.serializer_class(
+            comments, many=True, context=get_thread_context(request, comments))
+        return self.get_paginated_response(serializer.data)
+
+
 class CommentEditHistoryAPIView(ListAPIView):
     permission_classes = [IsAuthenticatedOrReadOnly, ]
     renderer_classes = [CommentEditHistoryJSONRenderer, ]
@@ -358,62 +634,30 @@ class CommentEditHistoryAPIView(ListAPIView):
 
 
 class LikesAPIView(APIView):
+    """
+    Toggles the user's like of an article, responding with the article's
+    counters and the user's reactions rather than the whole article
+    """
     permission_classes = (IsAuthenticatedOrReadOnly, )
     renderer_classes = (ArticleJSONRenderer, )
-    serializer_class = ArticleSerializer
-
-    def put(self, request, slug):
-        serializer_context = {'request': request}
-
-        try:
-            serializer_instance = Article.objects.get(slug=slug)
-        except Article.DoesNotExist:
-            raise NotFound("An article with this slug does not exist")
-
-        if serializer_instance in Article.objects.filter(
-                dislikes=request.user):
-            serializer_instance.dislikes.remove(request.user)
-
-        if serializer_instance in Article.objects.filter(
-                likes=request.user):
-            serializer_instance.likes.remove(request.user)
-        else:
-            serializer_instance.likes.add(request.user)
-
-        serializer = self.serializer_class(serializer_instance,
-                                           context=serializer_context,
-                                           partial=True)
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
-
-
-class DislikesAPIView(APIView):
-    permission_classes = (IsAuthenticatedOrReadOnly, )
-    renderer_classes = (ArticleJSONRenderer, )
-    serializer_class = ArticleSerializer
+    reaction = LIKE
 
     def put(self, request, slug):
-        serializer_context = {'request': request}
-
-        try:
-            serializer_instance = Article.objects.get(slug=slug)
-        except Article.DoesNotExist:
+        article_id = Article.objects.filter(slug=slug).values_list(
+            'pk', flat=True).first()
+        if article_id is None:
             raise NotFound("An article with this slug does not exist")
 
-        if serializer_instance in Article.objects.filter(likes=request.user):
-            serializer_instance.likes.remove(request.user)
+        reactions = toggle_reaction(ARTICLE, article_id, request.user.pk,
+                                    self.reaction)
+        reactions['slug'] = slug
 
-        if serializer_instance in Article.objects.filter(
-                dislikes=request.user):
-            serializer_instance.dislikes.remove(request.user)
-        else:
-            serializer_instance.dislikes.add(request.user)
+        return Response(reactions, status=status.HTTP_200_OK)
 
-        serializer = self.serializer_class(serializer_instance,
-                                           context=serializer_context,
-                                           partial=True)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+class DislikesAPIView(LikesAPIView):
+    """Toggles the user's dislike of an article"""
+    reaction = DISLIKE
 
 
 class TagListAPIView(generics.ListAPIView):
@@ -422,23 +666,72 @@ class TagListAPIView(generics.ListAPIView):
     serializer_class = TagSerializer
 
     def list(self, request):
+        validators = self.get_queryset().aggregate(
+            count=Count('pk'), last_modified=Max('updated_at'))
+        etag = make_etag('tags', validators['count'],
+                         validators['last_modified'])
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
         serializer_data = self.get_queryset()
         serializer = self.serializer_class(serializer_data, many=True)
 
-        return Response({
+        return set_validators(Response({
             'tags': serializer.data
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_200_OK), etag,
+            last_modified=validators['last_modified'], personalized=False)
+
+
+class TopTagsAPIView(APIView):
+    """
+    Lists the tags on the most articles, or the trending ones with
+    `?order=trending`, up to `?limit=` of them. The list is cached for a
+    short while, so it can lag behind the latest articles.
+    """
+    permission_classes = (AllowAny,)
+
+    def get(self, request):
+        order = request.query_params.get('order', 'count')
+        if order not in ORDERINGS:
+            raise ValidationError('order must be one of {}.'.format(
+                ', '.join(sorted(ORDERINGS))))
+        try:
+            limit = top_limit(request.query_params.get('limit'))
+        except ValueError:
+            raise ValidationError('limit must be a number.')
+
+        return Response({'tags': top_tags(order, limit)},
+                        status=status.HTTP_200_OK)
+
+
+class TagAutocompleteAPIView(APIView):
+    """
+    Lists the most used tags starting with `?q=` in any case, for the tag
+    picker of the editor
+    """
+    permission_classes = (AllowAny,)
 
+    def get(self, request):
+        prefix = tag_slug(request.query_params.get('q', ''))
+        tags = complete_tag(prefix) if prefix else []
+        return Response({'tags': tags}, status=status.HTTP_200_OK)
 
-class NotificationViewset(mixins.ListModelMixin,
+
+class NotificationViewset(KeysetPaginationMixin,
+                          mixins.ListModelMixin,
                           mixins.UpdateModelMixin,
                           mixins.DestroyModelMixin,
                           viewsets.GenericViewSet):
     permission_classes = (IsAuthenticated, )
     serializer_class = NotificationSerializer
     renderer_classes = (NotificationJSONRenderer, )
+    keyset_pagination_class = NotificationKeysetPagination
 
     def list(self, request):
+        if uses_keyset_pagination(request):
+            return self.list_page(request)
+
         unread_count = request.user.notifications.unread().count()
         read_count = request.user.notifications.read().count()
         unread_serializer = self.serializer_class(
@@ -452,6 +745,16 @@ class NotificationViewset(mixins.ListModelMixin,
                          'unread_list': unread_serializer.data, 'read_list': read_serializer.data},
                         status=status.HTTP_200_OK)
 
+    def list_page(self, request):
+        """
+        Lists a page of the user's notifications, read and unread, newest
+        first instead of all of them at once
+        """
+        page = self.paginate_queryset(request.user.notifications.all())
+        serializer = self.serializer_class(page, many=True)
+        request.user.notifications.mark_as_sent()
+        return self.get_paginated_response(serializer.data)
+
     def update(self, request, id):
         try:
             instance_data = Notification.objects.get(pk=id)
@@ -488,7 +791,7 @@ class ReadAllNotificationViewset(mixins.ListModelMixin, viewsets.GenericViewSet)
                         status=status.HTTP_200_OK)
 
 
-class FilterAPIView(generics.ListAPIView):
+class FilterAPIView(KeysetPaginationMixin, generics.ListAPIView):
 
     model = Article
     queryset = Article.objects.all()
@@ -496,110 +799,118 @@ class FilterAPIView(generics.ListAPIView):
     serializer_class = ArticleSerializer
     context_object_name = 'articles'
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.config_kwargs = {}
-        search_settings = getattr(settings, 'ARTICLE_SEARCH_SETTINGS', {})
-        if 'config' in search_settings:
-            self.config_kwargs['config'] = search_settings['config']
+    def get_serializer_class(self):
+        if wants_summary(self.request):
+            return ArticleSummarySerializer
+        return self.serializer_class
 
     def get_queryset(self):
-        queryset = self.queryset
+        """
+        Filters the articles matching the words of `q` through the search
+        index, and the titles, author names and tags close to `title`,
+        `author` and `tag` through the trigram indexes.
 
+        Matches are ordered by relevance: the search rank plus the
+        similarity of each fuzzy filter.
+        """
+        queryset = self.queryset
+        if wants_summary(self.request):
+            queryset = Article.objects.with_counts(self.request.user)
+
+        relevance = []
+        text = self.request.query_params.get('q', None)
+        if text:
+            query = search_query(text)
+            queryset = queryset.filter(search_vector=query).annotate(
+                search_rank=SearchRank(F('search_vector'), query),
+                search_snippet=headline('body', query),
+            )
+            relevance.append(F('search_rank'))
         title = self.request.query_params.get('title', None)
         if title is not None:
-            queryset = queryset.annotate(
-                similarity=TrigramSimilarity('title', title),
-            ).filter(similarity__gt=0.3).order_by('-similarity')
+            queryset = queryset.filter(title__trigram_similar=title).annotate(
+                title_similarity=TrigramSimilarity('title', title))
+            relevance.append(F('title_similarity'))
         author = self.request.query_params.get('author', None)
         if author is not None:
-            queryset = queryset.annotate(
-                similarity=TrigramSimilarity(
-                    'author__user__username', author),
-            ).filter(similarity__gt=0.3).order_by('-similarity')
+            queryset = queryset.filter(
+                author__user__username__trigram_similar=author
+            ).annotate(author_similarity=TrigramSimilarity(
+                'author__user__username', author))
+            relevance.append(F('author_similarity'))
         tag = self.request.query_params.get('tag', None)
         if tag is not None:
-            queryset = queryset.annotate(
-                similarity=TrigramSimilarity(
-                    'tags__tag', tag),
-            ).filter(similarity__gt=0.3).order_by('-similarity')
-        return queryset.order_by('created_at')
+            # the closest of the article's tags, without a row per tag
+            tags = Tag.objects.filter(
+                articles=OuterRef('pk'), tag__trigram_similar=tag
+            ).annotate(
+                similarity=TrigramSimilarity('tag', tag)
+            ).order_by('-similarity').values('similarity')[:1]
+            queryset = queryset.annotate(tag_similarity=Subquery(
+                tags, output_field=FloatField())
+            ).filter(tag_similarity__isnull=False)
+            relevance.append(F('tag_similarity'))
+
+        if not relevance:
+            return queryset.order_by('created_at')
+        return queryset.annotate(
+            relevance=sum(relevance[1:], relevance[0])
+        ).order_by('-relevance', '-created_at')
 
 
 class LikeCommentLikesAPIView(APIView):
+    """
+    Toggles the user's like of a comment, responding with the comment's
+    counters and the user's reactions rather than the whole thread
+    """
     permission_classes = (IsAuthenticatedOrReadOnly, )
     renderer_classes = (CommentLikeJSONRenderer, )
-    serializer_class = CommentSerializer
-
-    def post(self, request,  article_slug=None, comment_pk=None):
-        serializer_context = {'request': request}
-        context = {'author': request.user.profile}
-
-        try:
-            context['article'] = Article.objects.get(slug=article_slug)
-        except Article.DoesNotExist:
-            raise NotFound('An article with this slug does not exist.')
+    reaction = LIKE
 
+    def get_comment_id(self, article_slug, comment_pk):
+        """
+        Returns the id of the comment with `comment_pk` on the article with
+        `article_slug`, telling a missing article from a missing comment in
+        one query
+        """
+        comments = Comment.objects.filter(article=OuterRef('pk')).order_by()
         try:
-            serializer_instance = Comment.objects.get(pk=comment_pk)
-        except Comment.DoesNotExist:
-            raise NotFound('A comment with this id does not exist')
-
-        if serializer_instance in Comment.objects.filter(
-                comment_likes=request.user):
-            serializer_instance.comment_likes.remove(request.user)
-        else:
-            serializer_instance.comment_likes.add(request.user)
-
-        if serializer_instance in Comment.objects.filter(
-                comment_dislikes=request.user):
-            serializer_instance.comment_dislikes.remove(request.user)
-            serializer_instance.comment_likes.add(request.user)
-
-        serializer = self.serializer_class(serializer_instance,
-                                           context=serializer_context,
-                                           partial=True)
-
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-
-
-class DislikeCommentLikesAPIView(APIView):
-    permission_classes = (IsAuthenticatedOrReadOnly, )
-    renderer_classes = (CommentLikeJSONRenderer, )
-    serializer_class = CommentSerializer
-
-    def post(self, request,  article_slug=None, comment_pk=None):
-        serializer_context = {'request': request}
-        context = {'author': request.user.profile}
+            comments = comments.filter(pk=int(comment_pk))
+        except ValueError:
+            comments = comments.none()
+        found = Article.objects.filter(slug=article_slug).annotate(
+            comment_id=Subquery(comments.values('pk'))
+        ).values_list('pk', 'comment_id').order_by().first()
 
-        try:
-            context['article'] = Article.objects.get(slug=article_slug)
-        except Article.DoesNotExist:
+        if found is None:
             raise NotFound('An article with this slug does not exist.')
+        article_id, comment_id = found
+        if comment_id is None:
+            raise NotFound('A comment with this id does not exist')
+        return article_id, comment_id
 
-        try:
-            serializer_instance = Comment.objects.get(pk=comment_pk)
-        except Comment.DoesNotExist:
-            raise NotFound('A comment with this id does not exists')
+    def post(self, request, article_slug=None, comment_pk=None):
+        article_id, comment_id = self.get_comment_id(article_slug, comment_pk)
 
-        if serializer_instance in Comment.objects.filter(
-                comment_dislikes=request.user):
-            serializer_instance.comment_dislikes.remove(request.user)
-        else:
-            serializer_instance.comment_dislikes.add(request.user)
+        # the article embeds its comments' counters, so its version changes
+        # in the same transaction as them
+        with transaction.atomic():
+            reactions = toggle_reaction(COMMENT, comment_id, request.user.pk,
+                                        self.reaction)
+            bump_version(Article, article_id)
 
-        if serializer_instance in Comment.objects.filter(
-                comment_likes=request.user):
-            serializer_instance.comment_likes.remove(request.user)
-            serializer_instance.comment_dislikes.add(request.user)
+        return Response({
+            'id': comment_id,
+            'comment_likes': reactions['likes_count'],
+            'comment_dislikes': reactions['dislikes_count'],
+            'liked': reactions['liked'],
+            'disliked': reactions['disliked'],
+        }, status=status.HTTP_201_CREATED)
 
-        serializer = self.serializer_class(
-            serializer_instance,
-            context=serializer_context,
-            partial=True
-        )
 
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+class DislikeCommentLikesAPIView(LikeCommentLikesAPIView):
+    """Toggles the user's dislike of a comment"""
+    reaction = DISLIKE
 
 
 class BookmarkAPIView(APIView):
@@ -617,11 +928,8 @@ class BookmarkAPIView(APIView):
             article = Article.objects.get(slug=slug)
         except Article.DoesNotExist:
             raise NotFound("An article with this slug does not exist")
-        bookmark = Bookmarks.objects.filter(
-            user=request.user.profile, article=article).first()
-        if not bookmark:
-            bookmarks = Bookmarks(article=article, user=request.user.profile)
-            bookmarks.save()
+        if link(Bookmarks, article, 'bookmarks_count',
+                user=request.user.profile, article=article):
             serializer = self.serializer_class(
                 article,
                 context=serializer_context
@@ -635,19 +943,15 @@ class BookmarkAPIView(APIView):
         """
         Method that removes article from the bookmarked ones
         """
-        serializer_context = {'request': request}
         try:
-            article = Article.objects.get(slug=slug).id
+            article = Article.objects.get(slug=slug)
         except Article.DoesNotExist:
             raise NotFound("An article with this slug does not exist")
 
-        try:
-            bookmarked_article = Bookmarks.objects.get(article=article)
-        except Bookmarks.DoesNotExist:
+        if not unlink(Bookmarks, article, 'bookmarks_count',
+                      user=request.user.profile, article=article):
             raise NotFound("This article has not been bookmarked")
 
-        bookmarked_article.delete()
-
         return Response({
             "msg": "Article with the slug '{}' has been removed from bookmarks".format(slug)
         }, status=status.HTTP_200_OK)
@@ -2,6 +2,7 @@ import jwt
 from django.conf import settings
 from rest_framework import authentication, exceptions
 
+from .cache import authentication_cache
 from .models import User
 
 
@@ -31,11 +32,7 @@ class JWTAuthentication(authentication.BaseAuthentication):
             msg = 'Invalid authentication. Could not decode token.'
             raise exceptions.AuthenticationFailed(msg)
 
-        try:
-            user = User.objects.get(pk=payload['id'])
-        except User.DoesNotExist:
-            msg = 'No user matching this token was found.'
-            raise exceptions.AuthenticationFailed(msg)
+        user = self._get_user(payload['id'])
 
         if not user.is_active:
             msg = 'This user has been deactivated.'
@@ -46,3 +43,21 @@ class JWTAuthentication(authentication.BaseAuthentication):
             raise exceptions.AuthenticationFailed(msg)
 
         return (user, token)
+
+    def _get_user(self, user_id):
+        """
+        Returns the user with `user_id` and their profile, from the
+        authentication cache when they were loaded recently
+        """
+        user = authentication_cache.get(user_id)
+        if user is not None:
+            return user
+
+        try:
+            user = User.objects.select_related('profile').get(pk=user_id)
+        except User.DoesNotExist:
+            msg = 'No user matching this token was found.'
+            raise exceptions.AuthenticationFailed(msg)
+
+        authentication_cache.set(user)
+        return user
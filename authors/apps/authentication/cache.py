@@ -0,0 +1,109 @@
+"""
+Module contains the cache of authenticated users, which lets
+`JWTAuthentication` skip loading the user and their profile on every request
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULT_SETTINGS = {
+    # Number of users kept in each process, least recently used first out
+    'MAX_SIZE': 1024,
+    # Seconds a cached user is trusted for. Other processes may keep serving
+    # a user this long after they were deactivated or unverified, so it is
+    # the staleness bound of `is_active` and `is_verified`. 0 disables the
+    # cache.
+    'TIMEOUT': 30,
+    # Alias of a Django cache shared between processes, looked up when a
+    # user is missing from the process cache
+    'CACHE_ALIAS': None,
+}
+
+
+class AuthenticationCache(object):
+    """
+    A bounded least recently used cache of users, with their profile,
+    expiring after a timeout.
+
+    Users are stored pickled so each request gets its own instances, which
+    it can change without affecting other requests.
+    """
+    key_prefix = 'authentication:user:'
+
+    def __init__(self, max_size, timeout, cache_alias=None):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        options = dict(DEFAULT_SETTINGS)
+        options.update(getattr(settings, 'AUTHENTICATION_CACHE', {}))
+        return cls(options['MAX_SIZE'], options['TIMEOUT'],
+                   options['CACHE_ALIAS'])
+
+    @property
+    def enabled(self):
+        return self.timeout > 0 and self.max_size > 0
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias] if self.cache_alias else None
+
+    def get(self, user_id):
+        """Returns the cached user with `user_id`, None when missing"""
+        if not self.enabled:
+            return None
+
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is not None:
+                expires, data = entry
+                if expires > time.monotonic():
+                    self.entries.move_to_end(user_id)
+                    return pickle.loads(data)
+                del self.entries[user_id]
+
+        if self.shared is not None:
+            data = self.shared.get(self.key_prefix + str(user_id))
+            if data is not None:
+                self.store(user_id, data)
+                return pickle.loads(data)
+        return None
+
+    def set(self, user):
+        """Caches `user` together with their loaded profile"""
+        if not self.enabled:
+            return
+
+        data = pickle.dumps(user, pickle.HIGHEST_PROTOCOL)
+        self.store(user.pk, data)
+        if self.shared is not None:
+            self.shared.set(self.key_prefix + str(user.pk), data, self.timeout)
+
+    def store(self, user_id, data):
+        with self.lock:
+            self.entries[user_id] = (time.monotonic() + self.timeout, data)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Drops the user with `user_id` from the cache"""
+        with self.lock:
+            self.entries.pop(user_id, None)
+        if self.shared is not None:
+            self.shared.delete(self.key_prefix + str(user_id))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+authentication_cache = AuthenticationCache.from_settings()
@@ -1,10 +1,10 @@
-import json
-
 from rest_framework.renderers import JSONRenderer
 
+from authors.apps.core.renderers import EnvelopeJSONRenderer
+
 
-class UserJSONRenderer(JSONRenderer):
-    charset = 'utf-8'
+class UserJSONRenderer(EnvelopeJSONRenderer):
+    envelope = 'user'
 
     def render(self, data, media_type=None, renderer_context=None):
         # If we receive a `token` key as part of the response, it will be a
@@ -21,9 +21,7 @@ class UserJSONRenderer(JSONRenderer):
         if errors is not None:
             # As mentioned about, we will let the default JSONRenderer handle
             # rendering errors.
-            return super(UserJSONRenderer, self).render(data)
+            return JSONRenderer.render(self, data)
 
         # Finally, we can render our data under the "user" namespace.
-        return json.dumps({
-            'user': data
-        })
+        return super(UserJSONRenderer, self).render(data)
@@ -242,6 +242,11 @@ class UserSerializer(serializers.ModelSerializer):
         password = validated_data.pop('password', None)
 
         profile_data = validated_data.pop('profile', {})
+        # `instance` and its profile may come from the authentication cache,
+        # so only the fields set here are saved, keeping the counters and
+        # version other requests changed since
+        user_fields = list(validated_data) + ['updated_at']
+        profile_fields = list(profile_data) + ['updated_at']
 
         for (key, value) in validated_data.items():
             # For the keys remaining in `validated_data`, we will set them on
@@ -252,17 +257,18 @@ class UserSerializer(serializers.ModelSerializer):
             # `.set_password()` is the method mentioned above. It handles all
             # of the security stuff that we shouldn't be concerned with.
             instance.set_password(password)
+            user_fields.append('password')
 
         # Finally, after everything has been updated, we must explicitly save
         # the model. It's worth pointing out that `.set_password()` does not
         # save the model.
-        instance.save()
+        instance.save(update_fields=user_fields)
 
         for (key, value) in profile_data.items():
 
             setattr(instance.profile, key, value)
 
-        instance.profile.save()
+        instance.profile.save(update_fields=profile_fields)
 
         return instance
 
@@ -1,8 +1,11 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 #my local imports
+from authors.apps.core.signals import counters_adjusted
 from authors.apps.profiles.models import Profile
+from .cache import authentication_cache
 from .models import User
 
 
@@ -15,3 +18,34 @@ def create_related_profile(sender, instance, created, *args, **kwargs):
 
     if instance and created:
         instance.profile = Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_authentication_cache(sender, instance, *args, **kwargs):
+    """
+    This is the signal to drop a user from the authentication cache
+    every time they or their profile change, including deactivation.
+    It is repeated on commit so a request can't cache the old row
+    while the transaction is still open.
+    """
+    user_id = instance.pk if sender is User else instance.user_id
+    authentication_cache.invalidate(user_id)
+    transaction.on_commit(lambda: authentication_cache.invalidate(user_id))
+
+
+@receiver(counters_adjusted, sender=Profile)
+def invalidate_adjusted_profile(sender, pk, **kwargs):
+    """
+    This is the signal to drop a user from the authentication cache when
+    the counters or version of their profile are adjusted, which sends no
+    post_save
+    """
+    user_id = Profile.objects.filter(pk=pk).values_list(
+        'user_id', flat=True).first()
+    if user_id is not None:
+        authentication_cache.invalidate(user_id)
+        transaction.on_commit(
+            lambda: authentication_cache.invalidate(user_id))
@@ -1,5 +1,5 @@
-from django.core.mail import send_mail, EmailMessage
 from authors import settings
+from authors.apps.core.mail import queue_email
 from .models import User
 from django.template.loader import render_to_string
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
@@ -38,13 +38,8 @@ class SendEmail():
             'token': token
         })
 
-        # set mail to email content with subject, body ,sender and recepient
-        # with html content type
-        mail = EmailMessage(subject, body, "janetnim401@gmail.com", to=[email])
-        mail.content_subtype = 'html'
-
-        # send email
-        mail.send()
+        # queue the html mail for the `send_queued_mail` command to send
+        queue_email(subject, body, "janetnim401@gmail.com", [email])
 
         return (token, urlsafe_base64_encode(force_bytes(user.pk)).decode('utf-8'))
 
@@ -64,12 +59,7 @@ class SendEmail():
             'token': token
         })
 
-        # set mail to email content with subject, body ,sender and recepient
-        # with html content type
-        mail = EmailMessage(subject, body, "janetnim401@gmail.com", to=[email])
-        mail.content_subtype = 'html'
-
-        # send email
-        mail.send()
+        # queue the html mail for the `send_queued_mail` command to send
+        queue_email(subject, body, "janetnim401@gmail.com", [email])
 
         return (token, urlsafe_base64_encode(force_bytes(user.pk)).decode('utf-8'))
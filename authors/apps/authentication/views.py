@@ -294,7 +294,9 @@ class NotificationToggleViewSet(mixins.UpdateModelMixin, viewsets.GenericViewSet
             request.user.get_notified = False
         else:
             request.user.get_notified = True
-        request.user.save()
+        # the user may come from the authentication cache, so only the
+        # toggled field is saved
+        request.user.save(update_fields=['get_notified', 'updated_at'])
         serializer = self.serializer_class(request.user, partial=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,62 @@
+"""
+Module contains conditional GET support. A view computes the validators of
+a representation from a few indexed columns, answers `304 Not Modified`
+when the client's copy is still current and only loads and serializes the
+representation otherwise.
+"""
+import hashlib
+
+from django.apps import apps
+from django.db.models import IntegerField, Subquery, Value
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """
+    Returns a strong ETag of `parts`, which together must change whenever
+    the representation does
+    """
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8'))
+    return '"{}"'.format(digest.hexdigest())
+
+
+def viewer_version(request):
+    """
+    Returns an expression of the version of the requesting user's profile,
+    None for anonymous users. The version changes with whom the user follows,
+    so it belongs in the ETag of representations personalized for them.
+    """
+    if not request.user.is_authenticated:
+        return Value(None, output_field=IntegerField())
+    profiles = apps.get_model('profiles.Profile').objects.filter(
+        user_id=request.user.pk).values('version')
+    return Subquery(profiles[:1], output_field=IntegerField())
+
+
+def not_modified(request, etag):
+    """
+    Returns a `304 Not Modified` response when the client's copy carries
+    `etag`, None when the representation has to be sent.
+
+    Only `If-None-Match` is evaluated: `updated_at` doesn't record changes to
+    counters and relations, so `If-Modified-Since` alone could wrongly find
+    a representation unchanged.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        set_validators(response, etag)
+    return response
+
+
+def set_validators(response, etag, last_modified=None, personalized=True):
+    """
+    Sets the validators of a representation on `response`. Personalized
+    representations vary with the token of the user they were made for.
+    """
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    if personalized:
+        patch_vary_headers(response, ('Authorization',))
+    return response
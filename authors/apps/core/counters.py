@@ -0,0 +1,88 @@
+"""
+Module contains helpers for keeping denormalized counter columns in step
+with the rows they count
+"""
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .signals import counters_adjusted
+
+
+def aggregate_subquery(queryset, field, aggregate):
+    """
+    Returns an expression computing `aggregate` over the rows of `queryset`
+    whose `field` points at the outer row, evaluating to 0 rather than NULL
+    """
+    values = queryset.filter(**{field: OuterRef('pk')}).order_by().values(
+        field).annotate(total=aggregate).values('total')
+    return Coalesce(Subquery(values, output_field=models.IntegerField()), 0)
+
+
+def count_subquery(queryset, field):
+    """
+    Returns an expression counting the rows of `queryset` whose `field`
+    points at the outer row
+    """
+    return aggregate_subquery(queryset, field, Count('*'))
+
+
+# Column counting the changes to a row, for models whose representations
+# are cached by clients. See `authors.apps.core.conditional`.
+VERSION_FIELD = 'version'
+
+
+def is_versioned(model):
+    return any(field.name == VERSION_FIELD for field in model._meta.fields)
+
+
+def adjust_counters(model, pk, **deltas):
+    """
+    Adds each delta to its counter column on the `model` row with `pk` in a
+    single UPDATE, so concurrent writers can't overwrite each other. The
+    version of a versioned model is incremented along with its counters.
+    """
+    changes = {
+        field: F(field) + delta for field, delta in deltas.items() if delta
+    }
+    if changes:
+        if is_versioned(model):
+            changes.setdefault(VERSION_FIELD, F(VERSION_FIELD) + 1)
+        model._default_manager.filter(pk=pk).update(**changes)
+        counters_adjusted.send(sender=model, pk=pk)
+
+
+def bump_version(model, pk):
+    """
+    Increments the version of the `model` row with `pk` after a change to
+    its representation that none of its own columns record
+    """
+    adjust_counters(model, pk, **{VERSION_FIELD: 1})
+
+
+def link(through, counted, counter, **row):
+    """
+    Inserts the `through` row holding the `row` values unless it exists and,
+    when it was inserted, increments `counter` on the `counted` instance.
+    Returns whether a row was inserted.
+    """
+    with transaction.atomic():
+        _, created = through._default_manager.get_or_create(**row)
+        if created:
+            adjust_counters(type(counted), counted.pk, **{counter: 1})
+    counted.refresh_from_db(fields=[counter])
+    return created
+
+
+def unlink(through, counted, counter, **row):
+    """
+    Deletes the `through` rows holding the `row` values and decrements
+    `counter` on the `counted` instance by the number deleted.
+    Returns whether any row was deleted.
+    """
+    with transaction.atomic():
+        deleted, _ = through._default_manager.filter(**row).delete()
+        if deleted:
+            adjust_counters(type(counted), counted.pk, **{counter: -deleted})
+    counted.refresh_from_db(fields=[counter])
+    return bool(deleted)
@@ -0,0 +1,133 @@
+"""
+Module contains the outbound mail queue. Emails are queued in the database
+with the request that causes them and sent by the `send_queued_mail`
+management command, so requests never wait on the mail server.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import QueuedEmail
+
+# How long a worker may take to send the emails it claimed before another
+# worker picks them up again
+CLAIM_TIMEOUT = timedelta(minutes=5)
+# Delay before the first retry of a failed email, doubled on each attempt
+RETRY_BACKOFF = timedelta(minutes=1)
+
+
+def build_email(subject, body, from_email, to, content_subtype='html'):
+    """Returns an unsaved queued email for `queue_emails`"""
+    return QueuedEmail(subject=subject, body=body, from_email=from_email,
+                       to=list(to), content_subtype=content_subtype)
+
+
+def queue_email(subject, body, from_email, to, content_subtype='html'):
+    """Queues one email, returning it"""
+    email = build_email(subject, body, from_email, to, content_subtype)
+    email.save()
+    return email
+
+
+def queue_emails(emails, batch_size=500):
+    """Queues the emails built with `build_email` in bulk"""
+    return QueuedEmail.objects.bulk_create(emails, batch_size=batch_size)
+
+
+def claim_emails(limit):
+    """
+    Claims up to `limit` due emails for this worker, pushing back their next
+    attempt so other workers skip them while they are being sent
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(QueuedEmail.objects.select_for_update(
+            skip_locked=True
+        ).filter(
+            status=QueuedEmail.QUEUED, next_attempt_at__lte=now
+        )[:limit])
+        QueuedEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            attempts=F('attempts') + 1, next_attempt_at=now + CLAIM_TIMEOUT)
+    for email in emails:
+        email.attempts += 1
+    return emails
+
+
+def send_batch(emails):
+    """
+    Sends `emails` over a single connection to the mail server.
+    Returns the error of each email, None for the ones sent.
+    """
+    errors = {}
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        return {email.pk: error for email in emails}
+
+    try:
+        for email in emails:
+            try:
+                connection.send_messages([email.message(connection)])
+                errors[email.pk] = None
+            except Exception as error:
+                errors[email.pk] = error
+    finally:
+        connection.close()
+    return errors
+
+
+def record_results(emails, errors, max_attempts):
+    """
+    Marks the sent emails as such and reschedules the failed ones with an
+    exponential backoff, giving up after `max_attempts`.
+    Returns the numbers of emails sent, retried and given up on.
+    """
+    now = timezone.now()
+    sent = [email.pk for email in emails if errors[email.pk] is None]
+    QueuedEmail.objects.filter(pk__in=sent).update(
+        status=QueuedEmail.SENT, sent_at=now, last_error='')
+
+    retried = failed = 0
+    for email in emails:
+        error = errors[email.pk]
+        if error is None:
+            continue
+        if email.attempts >= max_attempts:
+            changes = {'status': QueuedEmail.FAILED}
+            failed += 1
+        else:
+            delay = RETRY_BACKOFF * 2 ** (email.attempts - 1)
+            changes = {'next_attempt_at': now + delay}
+            retried += 1
+        QueuedEmail.objects.filter(pk=email.pk).update(
+            last_error=repr(error), **changes)
+    return len(sent), retried, failed
+
+
+def drain_queue(batch_size=100, workers=4, max_attempts=5):
+    """
+    Sends every due email, `workers` batches of `batch_size` at a time, each
+    batch over its own connection. Only the calling thread uses the
+    database. Returns the numbers of emails sent, retried and given up on.
+    """
+    totals = [0, 0, 0]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            emails = claim_emails(batch_size * workers)
+            if not emails:
+                return tuple(totals)
+
+            batches = [emails[start:start + batch_size]
+                       for start in range(0, len(emails), batch_size)]
+            errors = {}
+            for batch_errors in executor.map(send_batch, batches):
+                errors.update(batch_errors)
+
+            results = record_results(emails, errors, max_attempts)
+            totals = [total + result
+                      for total, result in zip(totals, results)]
@@ -0,0 +1,95 @@
+import json
+import timeit
+from collections import OrderedDict
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from authors.apps.articles.renderers import ArticleJSONRenderer
+
+
+def sample_page(size, comments):
+    """
+    Returns a page of `size` articles shaped like the serialized article
+    list, each with `comments` comments
+    """
+    author = OrderedDict([
+        ('username', 'zoë'), ('bio', 'Écrit sur les dragons 🐉'),
+        ('image', 'https://example.com/zoe.png'), ('interests', 'fantasy'),
+        ('following', False),
+    ])
+    comment = OrderedDict([
+        ('id', 1), ('author', author), ('comment_likes', 3),
+        ('comment_dislikes', 0), ('body', 'Très bien écrit ' * 5),
+        ('reply_set', []), ('replies_count', 0),
+        ('next_replies_cursor', None),
+        ('created_at', '2018-09-20T14:12:00.000000Z'),
+        ('updated_at', '2018-09-20T14:12:00.000000Z'),
+    ])
+    article = OrderedDict([
+        ('id', 1), ('title', 'How to train your dragon'),
+        ('slug', 'how-to-train-your-dragon'),
+        ('body', 'Dragons are very large lizards. ' * 60),
+        ('comments', [comment] * comments),
+        ('description', 'Ever wonder how?'), ('author', author),
+        ('created_at', '2018-09-20T14:12:00.000000Z'),
+        ('updated_at', '2018-09-20T14:12:00.000000Z'),
+        ('average_rating', 4.5), ('image_url', None),
+        ('likes', list(range(20))), ('dislikes', [1, 2]),
+        ('dislikes_count', 2), ('likes_count', 20),
+        ('tagList', ['dragons', 'training']), ('favorited', False),
+        ('favoriteCount', 7), ('bookmarked', False),
+    ])
+    return OrderedDict([
+        ('count', size), ('next', None), ('previous', None),
+        ('results', [article] * size),
+    ])
+
+
+def render_with_json_dumps(data):
+    """Renders `data` the way the renderers did with `json.dumps`"""
+    return json.dumps({'articles': data}).encode('utf-8')
+
+
+class Command(BaseCommand):
+    help = ('Compares the throughput of the JSON renderers with '
+            'json.dumps on a large page of articles')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--articles', type=int, default=100,
+            help='Number of articles on the rendered page')
+        parser.add_argument(
+            '--comments', type=int, default=10,
+            help='Number of comments of each article')
+        parser.add_argument(
+            '--repeat', type=int, default=50,
+            help='Number of times the page is rendered')
+        parser.add_argument(
+            '--encoder', action='append', default=[],
+            help='Dotted path of another encoder to compare, a candidate '
+                 'for the JSON_ENCODER setting')
+
+    def handle(self, *args, **options):
+        data = sample_page(options['articles'], options['comments'])
+        renderer = ArticleJSONRenderer()
+        candidates = [
+            ('json.dumps', render_with_json_dumps),
+            ('renderer', renderer.render),
+        ]
+        for path in options['encoder']:
+            encoder = import_string(path)
+            candidates.append((path.rsplit('.', 1)[-1],
+                               lambda data, encoder=encoder:
+                               encoder(renderer.wrap(data))))
+
+        for name, render in candidates:
+            size = len(render(data))
+            # The fastest of a few runs is the least disturbed by the rest
+            # of the machine
+            seconds = min(timeit.repeat(
+                lambda: render(data), number=options['repeat'], repeat=5))
+            self.stdout.write(
+                '{:<24} {:>8.1f} pages/s {:>8.1f} MB/s {:>10} bytes'.format(
+                    name, options['repeat'] / seconds,
+                    options['repeat'] * size / seconds / 2 ** 20, size))
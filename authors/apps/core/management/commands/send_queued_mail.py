@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authors.apps.core.mail import drain_queue
+
+
+class Command(BaseCommand):
+    help = 'Sends the emails waiting in the outbound mail queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Number of emails sent over one connection')
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Number of batches sent at the same time')
+        parser.add_argument(
+            '--max-attempts', type=int, default=5,
+            help='Number of attempts before an email is given up on')
+        parser.add_argument(
+            '--poll', type=int, default=0,
+            help='Keep draining the queue every POLL seconds instead of '
+                 'exiting once it is empty')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, retried, failed = drain_queue(
+                options['batch_size'], options['workers'],
+                options['max_attempts'])
+            if sent or retried or failed or not options['poll']:
+                self.stdout.write(
+                    '{} sent, {} to retry, {} failed'.format(
+                        sent, retried, failed))
+            if not options['poll']:
+                return
+            time.sleep(options['poll'])
@@ -1,4 +1,7 @@
+from django.contrib.postgres.fields import ArrayField
+from django.core.mail import EmailMessage
 from django.db import models
+from django.utils import timezone
 
 
 class TimestampModel(models.Model):
@@ -18,3 +21,46 @@ class TimestampModel(models.Model):
         # per-model basis as needed, but reverse-chronological is a good
         # default ordering for most models.
         ordering = ['-created_at', '-updated_at']
+
+
+class QueuedEmail(TimestampModel):
+    """
+    An outbound email waiting in the mail queue, which the
+    `send_queued_mail` management command drains
+    """
+    QUEUED = 'queued'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = ArrayField(models.CharField(max_length=254))
+    content_subtype = models.CharField(max_length=20, default='html')
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.IntegerField(default=0)
+    # a queued email is not sent before this time, which is pushed back while
+    # a worker is sending it and after each failed attempt
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+
+    def __str__(self):
+        return '{} to {}'.format(self.subject, ', '.join(self.to))
+
+    def message(self, connection=None):
+        """Returns the email message to send"""
+        mail = EmailMessage(self.subject, self.body, self.from_email,
+                            to=self.to, connection=connection)
+        mail.content_subtype = self.content_subtype
+        return mail
@@ -0,0 +1,128 @@
+"""
+Module contains keyset pagination, which pages through a queryset on a
+(timestamp, id) key instead of an offset
+"""
+import base64
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+PAGINATION_QUERY_PARAM = 'pagination'
+KEYSET_PAGINATION = 'cursor'
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pages through the newest rows first on the (`key_field`, id) key.
+
+    Each page is one indexed range scan starting right after the last row of
+    the previous page, so deep pages cost the same as the first and rows
+    inserted meanwhile don't shift the pages. The cursor is opaque to
+    clients and no total count is returned.
+    """
+    key_field = 'created_at'
+    page_size = 10
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = self.seek(queryset, self.decode_cursor(request))
+
+        # Fetching one extra row tells whether there is a next page
+        rows = list(queryset[:page_size + 1])
+        self.page = rows[:page_size]
+        self.next_position = None
+        if len(rows) > page_size:
+            last = self.page[-1]
+            self.next_position = (getattr(last, self.key_field), last.pk)
+        return self.page
+
+    def seek(self, queryset, position, key_field=None, pk_field='pk'):
+        """
+        Orders `queryset` newest first on (`key_field`, `pk_field`) and keeps
+        the rows after the `position` of a decoded cursor
+        """
+        key_field = key_field or self.key_field
+        queryset = queryset.order_by('-' + key_field, '-' + pk_field)
+        if position is None:
+            return queryset
+
+        key, pk = position
+        return queryset.filter(
+            Q(**{key_field + '__lt': key}) |
+            Q(**{key_field: key, pk_field + '__lt': pk})
+        )
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        cursor = self.encode_cursor(*self.next_position)
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, key, pk):
+        position = '{}|{}'.format(key.isoformat(), pk)
+        return base64.urlsafe_b64encode(position.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+
+        try:
+            position = base64.urlsafe_b64decode(cursor.encode('ascii'))
+            key, pk = position.decode('utf-8').rsplit('|', 1)
+            key = parse_datetime(key)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if key is None:
+            raise NotFound(self.invalid_cursor_message)
+        return key, pk
+
+
+def uses_keyset_pagination(request):
+    """
+    Returns True when the client opted in to keyset pagination with
+    `?pagination=cursor`
+    """
+    return request.query_params.get(
+        PAGINATION_QUERY_PARAM) == KEYSET_PAGINATION
+
+
+class KeysetPaginationMixin(object):
+    """
+    Lets clients of a generic view opt in to keyset pagination with
+    `?pagination=cursor` instead of the view's own pagination class
+    """
+    keyset_pagination_class = KeysetPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and \
+                uses_keyset_pagination(self.request):
+            self._paginator = self.keyset_pagination_class()
+        return super().paginator
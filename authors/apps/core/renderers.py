@@ -0,0 +1,89 @@
+"""
+Module contains the base of the JSON renderers of the API, which wrap the
+response data in an envelope key and encode it to UTF-8 bytes in one pass
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Encodes the response data unless the `JSON_ENCODER` setting names another
+# callable taking the data and returning UTF-8 JSON bytes, such as
+# `encode_json_unescaped` or a wrapper of a C extension encoder
+DEFAULT_ENCODER = 'authors.apps.core.renderers.encode_json'
+
+# DRF's encoder handles dates, decimals, UUIDs and lazy strings. Leaving out
+# the spaces after separators makes the output smaller and faster to write.
+_encoder = JSONEncoder(separators=(',', ':'))
+_unescaped_encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def encode_json(data):
+    """
+    Returns `data` encoded as JSON bytes, non-ASCII characters escaped.
+    Escaping lets the stdlib encoder take its fastest path, which outweighs
+    the larger output. See the `benchmark_json` management command.
+    """
+    return _encoder.encode(data).encode('utf-8')
+
+
+def encode_json_unescaped(data):
+    """
+    Returns `data` encoded as UTF-8 JSON bytes, non-ASCII characters written
+    as they are, which is smaller but slower to encode than `encode_json`
+    """
+    return _unescaped_encoder.encode(data).encode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def get_encoder():
+    """Returns the configured encoder, imported once"""
+    return import_string(getattr(settings, 'JSON_ENCODER', DEFAULT_ENCODER))
+
+
+def reset_encoder(setting, **kwargs):
+    if setting == 'JSON_ENCODER':
+        get_encoder.cache_clear()
+
+
+setting_changed.connect(reset_encoder)
+
+
+class EnvelopeJSONRenderer(JSONRenderer):
+    """
+    Renders the response data under the `envelope` key, or under the
+    `plural_envelope` key when the data has more than one key, such as a
+    page of results.
+    """
+    charset = 'utf-8'
+    envelope = None
+    plural_envelope = None
+    # Rendered instead of the envelope when there is no data
+    empty = None
+
+    def render(self, data, media_type=None, renderer_context=None):
+        return get_encoder()(self.wrap(data))
+
+    def wrap(self, data):
+        if data is None and self.empty is not None:
+            return self.empty
+        if self.plural_envelope is not None and data is not None and \
+                len(data) > 1:
+            return {self.plural_envelope: data}
+        return {self.envelope: data}
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders newline-delimited JSON. Streamed responses write their own
+    lines, so this renders the other responses, such as errors, as a line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, media_type=None, renderer_context=None):
+        return get_encoder()(data) + b'\n'
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent by `adjust_counters` after it updated the counters of the `sender`
+# model row with `pk`. The updates bypass `save`, so no other signal tells
+# that the row changed.
+counters_adjusted = Signal(providing_args=['pk'])
@@ -0,0 +1,72 @@
+"""
+Module contains the listing of a profile's followers and following. A page
+is one range scan of the follows, newest first, joined to the listed
+profiles and their users. Whether the viewer follows each listed profile,
+and whether it follows them back, is loaded for the whole page in two
+queries.
+"""
+import base64
+
+from rest_framework.exceptions import NotFound
+
+from authors.apps.core.pagination import KeysetPagination
+from .models import Profile
+
+
+class FollowPagination(KeysetPagination):
+    """
+    Pages through follows newest first on their id, which increases with
+    the time they were made
+    """
+    key_field = 'pk'
+    page_size = 20
+
+    def seek(self, queryset, position, key_field=None, pk_field='pk'):
+        queryset = queryset.order_by('-pk')
+        if position is None:
+            return queryset
+        return queryset.filter(pk__lt=position)
+
+    def encode_cursor(self, key, pk):
+        return base64.urlsafe_b64encode(
+            str(pk).encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            return int(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+def followers_of(profile):
+    """Returns the follows of `profile`, with their followers loaded"""
+    return Profile.follows.through.objects.filter(
+        to_profile=profile).select_related('from_profile__user')
+
+
+def following_of(profile):
+    """Returns the follows by `profile`, with the followed loaded"""
+    return Profile.follows.through.objects.filter(
+        from_profile=profile).select_related('to_profile__user')
+
+
+def follow_flags(user, profiles):
+    """
+    Returns the serializer context flagging which of `profiles` the `user`
+    follows and which follow them, in two queries
+    """
+    if not user.is_authenticated:
+        return {'following': set(), 'followed_by': set()}
+    ids = [profile.pk for profile in profiles]
+    follows = Profile.follows.through.objects.all()
+    return {
+        'following': set(follows.filter(
+            from_profile=user.profile, to_profile__in=ids
+        ).values_list('to_profile_id', flat=True)),
+        'followed_by': set(follows.filter(
+            to_profile=user.profile, from_profile__in=ids
+        ).values_list('from_profile_id', flat=True)),
+    }
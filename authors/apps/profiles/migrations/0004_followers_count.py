@@ -0,0 +1,31 @@
+# Generated by Django 2.0.6 on 2026-10-17 18:08
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_followers_count(apps, schema_editor):
+    Profile = apps.get_model('profiles', 'Profile')
+    follows = Profile.follows.through.objects.filter(
+        to_profile=OuterRef('pk')
+    ).order_by().values('to_profile').annotate(
+        total=Count('*')).values('total')
+    Profile.objects.update(followers_count=Coalesce(
+        Subquery(follows, output_field=models.IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_followers_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.0.6 on 2026-10-17 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_followers_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='version',
+            field=models.IntegerField(default=0),
+        ),
+    ]
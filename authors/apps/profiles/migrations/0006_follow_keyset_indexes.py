@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0005_version'),
+    ]
+
+    operations = [
+        # The follows are an automatic through table, so the indexes for
+        # the keyset pagination of a profile's followers and following,
+        # newest follow first, are created here
+        migrations.RunSQL(
+            'CREATE INDEX profiles_follows_followers_keyset_idx ON '
+            'profiles_profile_follows (to_profile_id, id DESC)',
+            'DROP INDEX profiles_follows_followers_keyset_idx',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX profiles_follows_following_keyset_idx ON '
+            'profiles_profile_follows (from_profile_id, id DESC)',
+            'DROP INDEX profiles_follows_following_keyset_idx',
+        ),
+    ]
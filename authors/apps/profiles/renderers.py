@@ -1,40 +1,20 @@
-import json
-from rest_framework.renderers import JSONRenderer
+from authors.apps.core.renderers import EnvelopeJSONRenderer
 
 
-class ProfileJSONRenderer(JSONRenderer):
+class ProfileJSONRenderer(EnvelopeJSONRenderer):
     """This class contains json renderer for Profile"""
 
-    charset = 'utf-8'
+    envelope = 'profile'
+    plural_envelope = 'profiles'
 
-    def render(self, data, media_type=None, renderer_context=None):
-        if data is not None:
-            if len(data) <= 1:
-                return json.dumps({
-                    'profile': data
-                })
-            return json.dumps({
-                'profiles': data
-            })
 
-
-class FollowersJSONRenderer(JSONRenderer):
+class FollowersJSONRenderer(EnvelopeJSONRenderer):
     """This class contains json renderer for Profile"""
 
-    charset = 'utf-8'
-
-    def render(self, data, media_type=None, renderer_context=None):
-        return json.dumps({
-            'followers': data
-        })
+    envelope = 'followers'
 
 
-class FollowingJSONRenderer(JSONRenderer):
+class FollowingJSONRenderer(EnvelopeJSONRenderer):
     """This class contains json renderer for Profile"""
 
-    charset = 'utf-8'
-
-    def render(self, data, media_type=None, renderer_context=None):
-        return json.dumps({
-            'following': data
-        })
+    envelope = 'following'
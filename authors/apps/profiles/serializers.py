@@ -27,7 +27,59 @@ class ProfileSerializer(serializers.ModelSerializer):
         if not request.user.is_authenticated:
             return False
 
+        # Views serializing many profiles at once may load the ids of the
+        # profiles the user follows up front instead of a query per profile
+        following = self.context.get('following')
+        if following is not None:
+            return instance.pk in following
+
+        # Annotated on profiles loaded through `with_stats`
+        if hasattr(instance, 'viewer_following'):
+            return instance.viewer_following
+
         follower = request.user.profile
         followed = instance
 
         return follower.is_following(followed)
+
+
+class ProfileDetailSerializer(ProfileSerializer):
+    """
+    This class extends the profile serializer with the profile's statistics,
+    read from profiles loaded through `Profile.objects.with_stats`
+    """
+
+    followers_count = serializers.IntegerField(read_only=True)
+    following_count = serializers.IntegerField(read_only=True)
+    articles_count = serializers.IntegerField(read_only=True)
+
+    class Meta(ProfileSerializer.Meta):
+        fields = ProfileSerializer.Meta.fields + (
+            'followers_count', 'following_count', 'articles_count')
+
+
+class FollowSerializer(ProfileSerializer):
+    """
+    This class extends the profile serializer with whether the profile
+    follows the requesting user, read from the `followed_by` ids of the
+    context
+    """
+
+    follows_you = serializers.SerializerMethodField()
+
+    class Meta(ProfileSerializer.Meta):
+        fields = ProfileSerializer.Meta.fields + ('follows_you',)
+
+    def get_follows_you(self, instance):
+        return instance.pk in self.context.get('followed_by', ())
+
+
+class ProfileSummarySerializer(serializers.ModelSerializer):
+    """This class contains a compact read-only serializer for the Profile model"""
+
+    username = serializers.CharField(source='user.username', read_only=True)
+
+    class Meta:
+        model = Profile
+        fields = ('username', 'image')
+        read_only_fields = ('image',)
@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+# Sent by `Profile.follow` and `Profile.unfollow` when a follow is created or
+# removed. Django sends no save or delete signals for the rows of the
+# auto-created `Profile.follows` table.
+followed = Signal(providing_args=['follower', 'followed'])
+unfollowed = Signal(providing_args=['follower', 'followed'])
@@ -0,0 +1,87 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.authentication.models import User
+
+# profile with its counts + page of follows + the viewer's two follow sets
+FOLLOW_LIST_QUERIES = 4
+
+
+class FollowListTestCase(TestCase):
+    """
+    This class defines the test suite for the lists of any profile's
+    followers and following.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.viewer = self.create_user('viewer')
+        self.star = self.create_user('star')
+        self.fans = [self.create_user('fan%d' % i) for i in range(5)]
+        for fan in self.fans:
+            fan.profile.follow(self.star.profile)
+        # the viewer follows the first fan, and the second fan follows them
+        self.viewer.profile.follow(self.fans[0].profile)
+        self.fans[1].profile.follow(self.viewer.profile)
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token ' + self.viewer.token)
+
+    def create_user(self, username):
+        """Creates a verified user"""
+        user = User.objects.create_user(
+            username, '{}@authors.haven'.format(username), 'Secret123456')
+        user.is_verified = True
+        user.save()
+        return user
+
+    def test_followers_are_paged_newest_first(self):
+        """Test the followers are paged by cursor, newest follow first"""
+        response = self.client.get(
+            '/api/profiles/star/followers/?page_size=3')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual([profile['username'] for profile in
+                          response.data['results']], ['fan4', 'fan3', 'fan2'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([profile['username'] for profile in
+                          response.data['results']], ['fan1', 'fan0'])
+        self.assertIsNone(response.data['next'])
+
+    def test_followers_are_flagged_for_the_viewer(self):
+        """Test each follower says whether the viewer and they follow"""
+        response = self.client.get('/api/profiles/star/followers/')
+        flags = {profile['username']: (profile['following'],
+                                       profile['follows_you'])
+                 for profile in response.data['results']}
+        self.assertEqual(flags['fan0'], (True, False))
+        self.assertEqual(flags['fan1'], (False, True))
+        self.assertEqual(flags['fan2'], (False, False))
+
+    def test_following_lists_the_followed(self):
+        """Test the following list shows the profiles a profile follows"""
+        response = self.client.get('/api/profiles/fan0/following/')
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['username'], 'star')
+
+    def test_anonymous_users_can_list_followers(self):
+        """Test the lists are public, with no flags set"""
+        self.client.credentials()
+        response = self.client.get('/api/profiles/star/followers/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any(profile['following'] or profile['follows_you']
+                             for profile in response.data['results']))
+
+    def test_unknown_profile(self):
+        """Test listing the followers of an unknown profile fails"""
+        response = self.client.get('/api/profiles/nobody/followers/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        """Test a page of many followers costs as many queries as one"""
+        self.client.get('/api/profiles/star/followers/')
+        with self.assertNumQueries(FOLLOW_LIST_QUERIES):
+            self.client.get('/api/profiles/star/followers/?page_size=1')
+        with self.assertNumQueries(FOLLOW_LIST_QUERIES):
+            self.client.get('/api/profiles/star/followers/?page_size=5')
@@ -0,0 +1,88 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article
+from authors.apps.authentication.models import User
+
+# count + page of profiles with their statistics and the viewer's follows
+FOLLOWING_LIST_QUERIES = 2
+
+
+class ProfileStatsTestCase(TestCase):
+    """
+    This class defines the test suite for the statistics of profiles and
+    the number of queries serializing them costs.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.viewer = self.create_user('viewer')
+        self.writer = self.create_user('writer')
+        Article.objects.create(
+            title='Counted', body='body', description='description',
+            author=self.writer.profile)
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token ' + self.viewer.token)
+
+    def create_user(self, username):
+        """Creates a verified user"""
+        user = User.objects.create_user(
+            username, '{}@authors.haven'.format(username), 'Secret123456')
+        user.is_verified = True
+        user.save()
+        return user
+
+    def test_profile_shows_its_statistics(self):
+        """Test a profile shows its counts and whether the viewer follows"""
+        self.viewer.profile.follow(self.writer.profile)
+        self.writer.profile.follow(self.viewer.profile)
+
+        response = self.client.get('/api/profiles/writer/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['following'])
+        self.assertEqual(response.data['followers_count'], 1)
+        self.assertEqual(response.data['following_count'], 1)
+        self.assertEqual(response.data['articles_count'], 1)
+
+    def test_new_article_changes_the_profile_etag(self):
+        """Test the article count is part of the profile's validators"""
+        response = self.client.get('/api/profiles/writer/')
+        Article.objects.create(
+            title='Another', body='body', description='description',
+            author=self.writer.profile)
+
+        response = self.client.get(
+            '/api/profiles/writer/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['articles_count'], 2)
+
+    def test_follow_responds_with_statistics(self):
+        """Test following responds with the updated profile"""
+        response = self.client.post('/api/profiles/writer/follow/')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(response.data['following'])
+        self.assertEqual(response.data['followers_count'], 1)
+
+        response = self.client.delete('/api/profiles/writer/follow/')
+        self.assertFalse(response.data['following'])
+        self.assertEqual(response.data['followers_count'], 0)
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        """Test a page of many profiles costs as many queries as one"""
+        self.viewer.profile.follow(self.writer.profile)
+        self.client.get('/api/following/')
+        with self.assertNumQueries(FOLLOWING_LIST_QUERIES):
+            response = self.client.get('/api/following/')
+        self.assertEqual(len(response.data['results']), 1)
+
+        for number in range(5):
+            self.viewer.profile.follow(
+                self.create_user('author%d' % number).profile)
+        # following dropped the viewer from the authentication cache
+        self.client.get('/api/following/')
+        with self.assertNumQueries(FOLLOWING_LIST_QUERIES):
+            response = self.client.get('/api/following/')
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertTrue(all(
+            profile['following'] for profile in response.data['results']))
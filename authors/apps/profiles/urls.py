@@ -2,7 +2,8 @@ from django.urls import path
 
 #my local imports
 from .views import ProfileRetrieveAPIView, UserFollowAPIView, \
-    FollowersRetrieve, FollowingRetrieve
+    FollowersRetrieve, FollowingRetrieve, ProfileFollowersAPIView, \
+    ProfileFollowingAPIView
 
 
 app_name = 'profiles'
@@ -11,6 +12,10 @@ urlpatterns = [
     path('profiles/<username>/',
         ProfileRetrieveAPIView.as_view(), name='profile'),
     path('profiles/<username>/follow/', UserFollowAPIView.as_view()),
+    path('profiles/<username>/followers/',
+        ProfileFollowersAPIView.as_view()),
+    path('profiles/<username>/following/',
+        ProfileFollowingAPIView.as_view()),
     path('followers/', FollowersRetrieve.as_view()),
     path('following/', FollowingRetrieve.as_view()),
 ]
@@ -1,4 +1,6 @@
 import json
+from collections import OrderedDict
+
 from django.core.serializers.json import DjangoJSONEncoder
 from rest_framework import serializers, status
 from rest_framework.exceptions import NotFound
@@ -8,10 +10,14 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 #my local imports
+from authors.apps.core.conditional import (make_etag, not_modified,
+                                           set_validators, viewer_version)
+from authors.apps.core.pagination import KeysetPaginationMixin
 from .exceptions import ProfileDoesNotExist
+from .follows import FollowPagination, follow_flags, followers_of, following_of
 from .models import Profile
 from .renderers import ProfileJSONRenderer, FollowersJSONRenderer, FollowingJSONRenderer
-from .serializers import ProfileSerializer
+from .serializers import FollowSerializer, ProfileDetailSerializer
 
 
 class ProfileRetrieveAPIView(RetrieveAPIView):
@@ -22,38 +28,55 @@ class ProfileRetrieveAPIView(RetrieveAPIView):
 
     permission_classes = (AllowAny,)
     renderer_classes = (ProfileJSONRenderer,)
-    serializer_class = ProfileSerializer
-    queryset = Profile.objects.select_related('user')
+    serializer_class = ProfileDetailSerializer
 
     def retrieve(self, request, username, *args, **kwargs):
-        try:
-            profile = self.queryset.get(user__username=username)
-        except Profile.DoesNotExist:
+        profile = Profile.objects.with_stats(request.user).annotate(
+            viewer_version=viewer_version(request)
+        ).filter(user__username=username).first()
+        if profile is None:
             raise ProfileDoesNotExist(
                 'A profile for user {} does not exist.'.format(username))
+        # the number of articles is the only statistic that doesn't change
+        # the profile's version
+        etag = make_etag('profile', request.user.pk, profile.pk,
+                         profile.version, profile.updated_at,
+                         profile.user.updated_at, profile.articles_count,
+                         profile.viewer_version)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        serializer = self.serializer_class(profile, context={
+            'request': request
+        })
 
-        serializer = self.serializer_class(profile,)
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return set_validators(
+            Response(serializer.data, status=status.HTTP_200_OK), etag,
+            last_modified=max(profile.updated_at, profile.user.updated_at))
 
 
 class UserFollowAPIView(APIView):
     permission_classes = (IsAuthenticated,)
     renderer_classes = (ProfileJSONRenderer,)
-    serializer_class = ProfileSerializer
-
-    def delete(self, request, username=None):
-        follower = self.request.user.profile
+    serializer_class = ProfileDetailSerializer
 
+    def get_followed(self, username):
         try:
-            followed = Profile.objects.get(user__username=username)
+            return Profile.objects.with_stats(self.request.user).get(
+                user__username=username)
         except Profile.DoesNotExist:
             raise NotFound('A profile for user {} does not exist.'.format(username))
 
-        if follower.pk is followed.pk:
+    def delete(self, request, username=None):
+        follower = self.request.user.profile
+        followed = self.get_followed(username)
+
+        if follower.pk == followed.pk:
             raise serializers.ValidationError('You can not unfollow yourself.')
 
         follower.unfollow(followed)
+        followed.viewer_following = False
 
         serializer = self.serializer_class(followed, context={
             'request': request
@@ -63,16 +86,13 @@ class UserFollowAPIView(APIView):
 
     def post(self, request, username=None):
         follower = self.request.user.profile
+        followed = self.get_followed(username)
 
-        try:
-            followed = Profile.objects.get(user__username=username)
-        except Profile.DoesNotExist:
-            raise NotFound('A profile for user {} does not exist.'.format(username))
-
-        if follower.pk is followed.pk:
+        if follower.pk == followed.pk:
             raise serializers.ValidationError('You can not follow yourself.')
 
         follower.follow(followed)
+        followed.viewer_following = True
 
         serializer = self.serializer_class(followed, context={
             'request': request
@@ -81,19 +101,62 @@ class UserFollowAPIView(APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class FollowingRetrieve(ListAPIView):
+class FollowingRetrieve(KeysetPaginationMixin, ListAPIView):
     permission_classes = (IsAuthenticated,)
     renderer_classes = (FollowingJSONRenderer,)
-    serializer_class = ProfileSerializer
+    serializer_class = ProfileDetailSerializer
 
     def get_queryset(self):
-        return self.request.user.profile.follows.all()
+        return self.request.user.profile.follows.with_stats(self.request.user)
 
 
-class FollowersRetrieve(ListAPIView):
+class FollowersRetrieve(KeysetPaginationMixin, ListAPIView):
     permission_classes = (IsAuthenticated,)
     renderer_classes = (FollowersJSONRenderer,)
-    serializer_class = ProfileSerializer
+    serializer_class = ProfileDetailSerializer
 
     def get_queryset(self):
-        return self.request.user.profile.follower.all()
+        return self.request.user.profile.follower.with_stats(
+            self.request.user)
+
+
+class ProfileFollowersAPIView(APIView):
+    """
+    Lists the followers of any profile, newest follower first, flagging
+    which of them the user follows and which follow the user
+    """
+    permission_classes = (AllowAny,)
+    renderer_classes = (FollowersJSONRenderer,)
+    serializer_class = FollowSerializer
+    pagination_class = FollowPagination
+    # the follows of a profile, and the profile each of them lists
+    follows = staticmethod(followers_of)
+    listed = 'from_profile'
+    count_field = 'followers_count'
+
+    def get(self, request, username=None):
+        owner = Profile.objects.with_stats().filter(
+            user__username=username).first()
+        if owner is None:
+            raise NotFound('A profile for user {} does not exist.'.format(username))
+
+        paginator = self.pagination_class()
+        profiles = [getattr(follow, self.listed) for follow in
+                    paginator.paginate_queryset(self.follows(owner), request)]
+        context = follow_flags(request.user, profiles)
+        context['request'] = request
+        serializer = self.serializer_class(profiles, many=True, context=context)
+
+        return Response(OrderedDict([
+            ('count', getattr(owner, self.count_field)),
+            ('next', paginator.get_next_link()),
+            ('results', serializer.data),
+        ]))
+
+
+class ProfileFollowingAPIView(ProfileFollowersAPIView):
+    """Lists the profiles any profile follows, newest follow first"""
+    renderer_classes = (FollowingJSONRenderer,)
+    follows = staticmethod(following_of)
+    listed = 'to_profile'
+    count_field = 'following_count'
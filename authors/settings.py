@@ -226,3 +226,29 @@ DATABASES['default'].update(db_from_env)
 DJANGO_NOTIFICATIONS_CONFIG = {'USE_JSONFIELD': True}
 
 TEST_RUNNER = 'authors.testrunner.TestRunner'
+
+# Users authenticated by JWTAuthentication are cached for TIMEOUT seconds,
+# which bounds how long a deactivated or unverified user can stay signed in
+# on other processes. Set CACHE_ALIAS to share the cache between processes.
+AUTHENTICATION_CACHE = {
+    'MAX_SIZE': 1024,
+    'TIMEOUT': 30,
+    'CACHE_ALIAS': None,
+}
+
+# Article responses served to anonymous users are cached for TIMEOUT seconds
+# in the CACHE_ALIAS cache, which must be shared between processes (such as
+# memcached or redis) for changes on one to invalidate the others.
+ARTICLE_RESPONSE_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 300,
+}
+
+# The top tags and tag completions are cached for CACHE_TIMEOUT seconds, and
+# a tag's addition to an article counts half as much towards its trending
+# score after HALF_LIFE seconds.
+TAG_STATS = {
+    'CACHE_ALIAS': 'default',
+    'CACHE_TIMEOUT': 60,
+    'HALF_LIFE': 7 * 24 * 3600,
+}
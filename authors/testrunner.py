@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.test import runner
 
 
@@ -34,3 +35,16 @@ class TestRunner(runner.DiscoverRunner):
         )
 
         return super(TestRunner, self).setup_databases(**kwargs)
+
+    def setup_test_environment(self, **kwargs):
+        """
+        Turn the article response and tag list caches off unless a test
+        turns them on. The rollback ending a test sends no signals to
+        invalidate them, so the next test could be served responses with
+        rows that are gone.
+        """
+        super(TestRunner, self).setup_test_environment(**kwargs)
+        settings.ARTICLE_RESPONSE_CACHE = dict(
+            getattr(settings, 'ARTICLE_RESPONSE_CACHE', {}), TIMEOUT=0)
+        settings.TAG_STATS = dict(
+            getattr(settings, 'TAG_STATS', {}), CACHE_TIMEOUT=0)
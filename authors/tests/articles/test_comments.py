@@ -206,8 +206,9 @@ class ViewTestCase(TestCase):
     def test_can_create_thread_from_existing_comment(self):
         token = self.login_verified_user(self.test_user)
         self.create_article(token, self.article)
-        self.create_comment(token, 'tests', self.comment)
-        response = self.create_thread(token, 'tests', self.comment3, '2')
+        response = self.create_comment(token, 'tests', self.comment)
+        response = self.create_thread(
+            token, 'tests', self.comment3, str(response.data['id']))
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
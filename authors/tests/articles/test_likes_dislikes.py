@@ -1,10 +1,8 @@
 import json
 
-import jwt
 from authors.apps.authentication.models import User
 from authors.apps.authentication.verification import SendEmail
 from authors.apps.authentication.views import Activate
-from django.conf import settings
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
@@ -138,9 +136,8 @@ class ViewTestCase(TestCase):
         response = self.like_article(token, 'how-to-train-your-dragon')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        # Assert that user id in likes field after liking article
-        self.assertEqual(jwt.decode(token, settings.SECRET_KEY, algorithm='HS256')['id'],
-                         json.loads(response.content).get('articles').get('likes')[0])
+        # Assert that the user likes the article after liking it
+        self.assertTrue(json.loads(response.content).get('articles').get('liked'))
         # Assert that likes count is one
         self.assertEqual(json.loads(response.content).get('articles').get('likes_count'), 1)
         # Assert that dislikes count is zero
@@ -156,9 +153,8 @@ class ViewTestCase(TestCase):
         response = self.dislike_article(token, 'how-to-train-your-dragon')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        # Assert that user id in dislikes field after disliking article
-        self.assertEqual(jwt.decode(token, settings.SECRET_KEY, algorithm='HS256')['id'],
-                         json.loads(response.content).get('articles').get('dislikes')[0])
+        # Assert that the user dislikes the article after disliking it
+        self.assertTrue(json.loads(response.content).get('articles').get('disliked'))
         # Assert that dislikes count is one
         self.assertEqual(json.loads(response.content).get('articles').get('dislikes_count'), 1)
         # Assert that likes count is zero
@@ -215,8 +211,8 @@ class ViewTestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.like_article(token, 'how-to-train-your-dragon')
         response = self.dislike_article(token, 'how-to-train-your-dragon')
-        self.assertNotEqual(json.loads(response.content).get('articles').get('likes'),
-                            json.loads(response.content).get('articles').get('dislikes'))
+        self.assertFalse(json.loads(response.content).get('articles').get('liked'))
+        self.assertTrue(json.loads(response.content).get('articles').get('disliked'))
 
     def test_verified_user_cannot_like_unexisting_article(self):
         """
@@ -0,0 +1,115 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..apps.authentication.cache import (AuthenticationCache,
+                                         authentication_cache)
+from ..apps.authentication.models import User
+
+
+class AuthenticationCacheTestCase(TestCase):
+    """Test suite for the cache of authenticated users."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'cached', 'cached@authors.haven', 'Secret123456')
+        self.user.is_verified = True
+        self.user.save()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.user.token)
+
+    def test_user_and_profile_are_loaded_once(self):
+        """Test a second request skips loading the user and their profile"""
+        with self.assertNumQueries(1):
+            self.client.get('/api/user/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/user/')
+            self.assertEqual(response.data['username'], 'cached')
+
+    def test_deactivated_user_is_rejected(self):
+        """Test saving a deactivated user drops them from the cache"""
+        self.client.get('/api/user/')
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get('/api/user/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_profile_change_is_seen(self):
+        """Test saving a profile drops its user from the cache"""
+        self.client.get('/api/user/')
+        self.user.profile.bio = 'Changed'
+        self.user.profile.save()
+
+        response = self.client.get('/api/user/')
+        self.assertEqual(response.data['bio'], 'Changed')
+
+    def create_follower(self):
+        follower = User.objects.create_user(
+            'follower', 'follower@authors.haven', 'Secret123456')
+        follower.is_verified = True
+        follower.save()
+        return follower
+
+    def test_follows_drop_the_profiles_from_the_cache(self):
+        """Test adjusted counters aren't served from the cache"""
+        follower = self.create_follower()
+        authentication_cache.set(self.user)
+        authentication_cache.set(follower)
+
+        follower.profile.follow(self.user.profile)
+        self.assertIsNone(authentication_cache.get(self.user.pk))
+        self.assertIsNone(authentication_cache.get(follower.pk))
+
+    def test_updates_keep_the_counters_of_a_stale_user(self):
+        """Test saving a cached user keeps what changed since"""
+        follower = self.create_follower()
+        stale = User.objects.select_related('profile').get(pk=self.user.pk)
+        stale_follower = User.objects.select_related('profile').get(
+            pk=follower.pk)
+        follower.profile.follow(self.user.profile)
+        # as another process could still have cached them
+        authentication_cache.set(stale)
+        authentication_cache.set(stale_follower)
+
+        response = self.client.put('/api/user/', {'user': {'bio': 'New'}},
+                                   format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token ' + follower.token)
+        response = self.client.put('/api/notifications/toggle/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.put('/api/user/', {'user': {'bio': 'Follows'}},
+                        format='json')
+
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.bio, 'New')
+        self.assertEqual(self.user.profile.followers_count, 1)
+        follower.refresh_from_db()
+        follower.profile.refresh_from_db()
+        self.assertFalse(follower.get_notified)
+        self.assertEqual(follower.profile.version, 1)
+
+    def test_cached_users_are_copies(self):
+        """Test each lookup gets its own instance"""
+        authentication_cache.set(self.user)
+        first = authentication_cache.get(self.user.pk)
+        first.username = 'changed'
+        self.assertEqual(
+            authentication_cache.get(self.user.pk).username, 'cached')
+
+    def test_least_recently_used_user_is_evicted(self):
+        """Test the cache keeps at most its size of users"""
+        cache = AuthenticationCache(max_size=1, timeout=30)
+        other = User.objects.create_user(
+            'other', 'other@authors.haven', 'Secret123456')
+        cache.set(self.user)
+        cache.set(other)
+        self.assertIsNone(cache.get(self.user.pk))
+        self.assertEqual(cache.get(other.pk).pk, other.pk)
+
+    def test_users_expire(self):
+        """Test a user is not served after the timeout"""
+        cache = AuthenticationCache(max_size=10, timeout=-1)
+        cache.set(self.user)
+        self.assertIsNone(cache.get(self.user.pk))
@@ -0,0 +1,99 @@
+from io import StringIO
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..apps.articles.models import Article
+from ..apps.authentication.models import User
+from ..apps.core.mail import queue_email
+from ..apps.core.models import QueuedEmail
+
+
+class CountingBackend(EmailBackend):
+    """Counts the connections opened to the mail server"""
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(EmailBackend):
+    """A mail server refusing every email"""
+
+    def send_messages(self, messages):
+        raise ConnectionError('Mail server unavailable')
+
+
+class MailQueueTestCase(TestCase):
+    """Test suite for the outbound mail queue."""
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            'writer', 'writer@authors.haven', 'Secret123456')
+        self.followers = [
+            User.objects.create_user(
+                'reader%d' % number, 'reader%d@authors.haven' % number,
+                'Secret123456')
+            for number in range(5)
+        ]
+        for follower in self.followers:
+            follower.profile.follow(self.author.profile)
+
+    def drain(self, *args):
+        out = StringIO()
+        call_command('send_queued_mail', *args, stdout=out)
+        return out.getvalue()
+
+    def test_new_article_queues_follower_emails(self):
+        """Test posting an article queues the emails instead of sending"""
+        Article.objects.create(title='Queued', body='body',
+                               description='description',
+                               author=self.author.profile)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(QueuedEmail.objects.count(), 5)
+
+        self.assertIn('5 sent, 0 to retry, 0 failed', self.drain())
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            sorted(follower.email for follower in self.followers))
+        self.assertFalse(
+            QueuedEmail.objects.exclude(status=QueuedEmail.SENT).exists())
+
+    @override_settings(
+        EMAIL_BACKEND='authors.tests.test_mail_queue.CountingBackend')
+    def test_batch_is_sent_over_one_connection(self):
+        """Test a batch of emails reuses one connection"""
+        CountingBackend.opened = 0
+        for number in range(6):
+            queue_email('Subject', 'Body', 'from@authors.haven',
+                        ['to%d@authors.haven' % number])
+
+        self.drain('--batch-size', '3', '--workers', '2')
+        self.assertEqual(CountingBackend.opened, 2)
+        self.assertEqual(len(mail.outbox), 6)
+
+    @override_settings(
+        EMAIL_BACKEND='authors.tests.test_mail_queue.FailingBackend')
+    def test_failed_email_is_retried_later(self):
+        """Test a failed email backs off and is given up after its attempts"""
+        email = queue_email('Subject', 'Body', 'from@authors.haven',
+                            ['to@authors.haven'])
+
+        self.assertIn('0 sent, 1 to retry, 0 failed', self.drain())
+        email.refresh_from_db()
+        self.assertEqual(email.status, QueuedEmail.QUEUED)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertIn('Mail server unavailable', email.last_error)
+
+        # the retry is not due yet
+        self.assertIn('0 sent, 0 to retry, 0 failed', self.drain())
+
+        QueuedEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertIn('0 sent, 0 to retry, 1 failed',
+                      self.drain('--max-attempts', '2'))
+        email.refresh_from_db()
+        self.assertEqual(email.status, QueuedEmail.FAILED)
@@ -0,0 +1,73 @@
+import datetime
+import json
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from ..apps.articles.renderers import (ArticleJSONRenderer,
+                                       NotificationJSONRenderer)
+from ..apps.authentication.renderers import UserJSONRenderer
+from ..apps.profiles.renderers import ProfileJSONRenderer
+
+
+def encode_marker(data):
+    return b'marker'
+
+
+class RenderersTestCase(SimpleTestCase):
+    """
+    This class defines the test suite for the JSON renderers.
+    """
+
+    def render(self, renderer, data):
+        content = renderer.render(data)
+        self.assertIsInstance(content, bytes)
+        return json.loads(content.decode('utf-8'))
+
+    def test_envelopes_are_kept(self):
+        """Test the data is wrapped in the renderer's envelope key"""
+        self.assertEqual(self.render(ArticleJSONRenderer(), {'slug': 'a'}),
+                         {'article': {'slug': 'a'}})
+        self.assertEqual(
+            self.render(ArticleJSONRenderer(), {'count': 0, 'results': []}),
+            {'articles': {'count': 0, 'results': []}})
+        self.assertEqual(self.render(ArticleJSONRenderer(), None),
+                         {'article': 'No article found.'})
+        self.assertEqual(self.render(NotificationJSONRenderer(), None),
+                         {'notifications': 'No notifications found.'})
+        self.assertEqual(self.render(ProfileJSONRenderer(), {'bio': ''}),
+                         {'profile': {'bio': ''}})
+        self.assertEqual(
+            self.render(UserJSONRenderer(), {'token': b'abc'}),
+            {'user': {'token': 'abc'}})
+        self.assertEqual(
+            self.render(UserJSONRenderer(), {'errors': {'email': ['bad']}}),
+            {'errors': {'email': ['bad']}})
+
+    def test_dates_and_decimals_are_encoded(self):
+        """Test values json.dumps can't encode are rendered"""
+        data = {'values': [datetime.date(2018, 9, 20), Decimal('4.5'), 'Zoë']}
+        self.assertEqual(self.render(ArticleJSONRenderer(), data),
+                         {'article': {'values': ['2018-09-20', 4.5, 'Zoë']}})
+
+    @override_settings(
+        JSON_ENCODER='authors.apps.core.renderers.encode_json_unescaped')
+    def test_unescaped_encoder(self):
+        """Test non-ASCII characters can be written unescaped"""
+        content = ArticleJSONRenderer().render({'title': 'Zoë'})
+        self.assertEqual(content, '{"article":{"title":"Zoë"}}'.encode())
+
+    @override_settings(JSON_ENCODER='authors.tests.test_renderers.encode_marker')
+    def test_encoder_is_pluggable(self):
+        """Test the configured encoder renders the responses"""
+        self.assertEqual(ArticleJSONRenderer().render({}), b'marker')
+
+    def test_benchmark(self):
+        """Test the benchmark reports each candidate"""
+        out = StringIO()
+        call_command('benchmark_json', articles=2, comments=1, repeat=1,
+                     stdout=out)
+        self.assertIn('json.dumps', out.getvalue())
+        self.assertIn('renderer', out.getvalue())